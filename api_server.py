@@ -2,20 +2,115 @@
 """
 Center Deep API Server
 A clean API interface for SearXNG with additional features
+
+Two serving modes share the same routes and JSON output:
+
+- ``python api_server.py`` runs the (threaded) Flask app
+- ``python api_server.py --asgi`` serves :data:`asgi_app` by granian, an
+  in-flight request to SearXNG costs a coroutine instead of a worker thread
+  (same as ``granian --interface asgi api_server:asgi_app``)
 """
 
 from flask import Flask, request, jsonify, send_from_directory
 from flask_cors import CORS
+from werkzeug.security import safe_join
+import asyncio
+import httpx
+import json
+import mimetypes
 import requests
 import os
+import sys
 from datetime import datetime
+from urllib.parse import parse_qs
+
+from center_deep.backend import SearXNGClient, AsyncSearXNGClient
+from center_deep.cache import ResultCache, key_from_params
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for React frontend
 
 # Configuration
 SEARXNG_URL = os.environ.get('SEARXNG_URL', 'http://127.0.0.1:8080')
-SEARXNG_TIMEOUT = 10
+STATIC_FOLDER = os.path.join(app.root_path, 'static')
+
+# Shared keep-alive connection pool to SearXNG
+searxng = SearXNGClient.from_env(SEARXNG_URL)
+
+# Cache of SearXNG responses (None if disabled), shared by both serving modes
+result_cache = ResultCache.from_env()
+
+FALLBACK_ENGINES = {
+    'engines': ['google', 'bing', 'duckduckgo', 'brave', 'qwant'],
+    'categories': ['general', 'images', 'news', 'map', 'music', 'it', 'science', 'files', 'social media']
+}
+
+API_INFO = {
+    'name': 'Center Deep API',
+    'version': '2.0.0',
+    'endpoints': {
+        '/api/search': 'Search endpoint (GET/POST)',
+        '/api/engines': 'List available search engines',
+        '/api/suggestions': 'Get search suggestions',
+        '/api/health': 'Health check',
+        '/api/metrics/backend': 'SearXNG connection pool and latency metrics',
+        '/api/metrics/cache': 'Result cache hit/miss counters'
+    },
+    'description': 'Beautiful search API powered by SearXNG with 250+ search engines',
+    'documentation': 'https://github.com/Unicorn-Commander/Center-Deep'
+}
+
+def search_options(args):
+    """Search options from the query string of a GET request"""
+    return {
+        'page': args.get('page', 1),
+        'categories': args.get('categories', ''),
+        'time_range': args.get('time_range', ''),
+        'language': args.get('language', 'en'),
+        'safesearch': args.get('safesearch', '0')
+    }
+
+def search_params(query, options):
+    """Build the SearXNG request parameters"""
+    params = {
+        'q': query,
+        'format': 'json',
+        'pageno': options.get('page', 1),
+        'safesearch': options.get('safesearch', '0'),
+        'language': options.get('language', 'en')
+    }
+
+    if options.get('categories'):
+        params['categories'] = options['categories']
+    if options.get('time_range'):
+        params['time_range'] = options['time_range']
+    return params
+
+def enhance_results(query, data):
+    """Add Center Deep enhancements to the SearXNG response"""
+    return {
+        'query': query,
+        'results': data.get('results', []),
+        'suggestions': data.get('suggestions', []),
+        'answers': data.get('answers', []),
+        'infoboxes': data.get('infoboxes', []),
+        'number_of_results': len(data.get('results', [])),
+        'response_time': data.get('response_time', 0),
+        'timestamp': datetime.utcnow().isoformat(),
+        'center_deep_version': '2.0.0',
+        'powered_by': 'Center Deep + SearXNG'
+    }
+
+def cache_metrics():
+    return result_cache.metrics() if result_cache is not None else {'enabled': False}
+
+def health_status(searxng_healthy):
+    return {
+        'status': 'healthy' if searxng_healthy else 'degraded',
+        'center_deep': True,
+        'searxng': searxng_healthy,
+        'timestamp': datetime.utcnow().isoformat()
+    }
 
 @app.route('/api/search', methods=['GET', 'POST'])
 def search():
@@ -26,56 +121,31 @@ def search():
         options = data.get('options', {})
     else:
         query = request.args.get('q', '')
-        options = {
-            'page': request.args.get('page', 1),
-            'categories': request.args.get('categories', ''),
-            'time_range': request.args.get('time_range', ''),
-            'language': request.args.get('language', 'en'),
-            'safesearch': request.args.get('safesearch', '0')
-        }
-    
+        options = search_options(request.args)
+
     if not query:
         return jsonify({'error': 'No query provided'}), 400
-    
+
     # Build SearXNG request
-    params = {
-        'q': query,
-        'format': 'json',
-        'pageno': options.get('page', 1),
-        'safesearch': options.get('safesearch', '0'),
-        'language': options.get('language', 'en')
-    }
-    
-    if options.get('categories'):
-        params['categories'] = options['categories']
-    if options.get('time_range'):
-        params['time_range'] = options['time_range']
-    
+    params = search_params(query, options)
+    key = key_from_params(params)
+
     try:
+        data = result_cache.get(key) if result_cache is not None else None
+        if data is not None:
+            return jsonify(enhance_results(query, data))
+
         # Call SearXNG
-        response = requests.get(f'{SEARXNG_URL}/search', params=params, timeout=SEARXNG_TIMEOUT)
-        
+        response = searxng.search(params)
+
         if response.status_code == 200:
             data = response.json()
-            
-            # Add Center Deep enhancements
-            enhanced_results = {
-                'query': query,
-                'results': data.get('results', []),
-                'suggestions': data.get('suggestions', []),
-                'answers': data.get('answers', []),
-                'infoboxes': data.get('infoboxes', []),
-                'number_of_results': len(data.get('results', [])),
-                'response_time': data.get('response_time', 0),
-                'timestamp': datetime.utcnow().isoformat(),
-                'center_deep_version': '2.0.0',
-                'powered_by': 'Center Deep + SearXNG'
-            }
-            
-            return jsonify(enhanced_results)
+            if result_cache is not None:
+                result_cache.set(key, data)
+            return jsonify(enhance_results(query, data))
         else:
             return jsonify({'error': 'Search backend error'}), 500
-            
+
     except requests.exceptions.Timeout:
         return jsonify({'error': 'Search timeout'}), 504
     except Exception as e:
@@ -85,7 +155,7 @@ def search():
 def get_engines():
     """Get list of available search engines"""
     try:
-        response = requests.get(f'{SEARXNG_URL}/config', timeout=5)
+        response = searxng.get('config')
         if response.status_code == 200:
             data = response.json()
             return jsonify({
@@ -94,12 +164,9 @@ def get_engines():
             })
     except:
         pass
-    
+
     # Fallback response
-    return jsonify({
-        'engines': ['google', 'bing', 'duckduckgo', 'brave', 'qwant'],
-        'categories': ['general', 'images', 'news', 'map', 'music', 'it', 'science', 'files', 'social media']
-    })
+    return jsonify(FALLBACK_ENGINES)
 
 @app.route('/api/suggestions', methods=['GET'])
 def get_suggestions():
@@ -107,16 +174,14 @@ def get_suggestions():
     query = request.args.get('q', '')
     if not query:
         return jsonify([])
-    
+
     try:
-        response = requests.get(f'{SEARXNG_URL}/autocompleter', 
-                              params={'q': query}, 
-                              timeout=3)
+        response = searxng.get('autocompleter', params={'q': query})
         if response.status_code == 200:
             return jsonify(response.json())
     except:
         pass
-    
+
     return jsonify([])
 
 @app.route('/api/health', methods=['GET'])
@@ -124,17 +189,22 @@ def health():
     """Health check endpoint"""
     searxng_healthy = False
     try:
-        response = requests.get(f'{SEARXNG_URL}/healthz', timeout=2)
+        response = searxng.get('healthz')
         searxng_healthy = response.status_code == 200
     except:
         pass
-    
-    return jsonify({
-        'status': 'healthy' if searxng_healthy else 'degraded',
-        'center_deep': True,
-        'searxng': searxng_healthy,
-        'timestamp': datetime.utcnow().isoformat()
-    })
+
+    return jsonify(health_status(searxng_healthy))
+
+@app.route('/api/metrics/backend', methods=['GET'])
+def backend_metrics():
+    """Connection pool and latency metrics of the SearXNG client"""
+    return jsonify(searxng.metrics())
+
+@app.route('/api/metrics/cache', methods=['GET'])
+def result_cache_metrics():
+    """Hit/miss counters of the result cache"""
+    return jsonify(cache_metrics())
 
 @app.route('/', methods=['GET'])
 def index():
@@ -149,18 +219,190 @@ def serve_static(path):
 @app.route('/api', methods=['GET'])
 def api_info():
     """API documentation"""
-    return jsonify({
-        'name': 'Center Deep API',
-        'version': '2.0.0',
-        'endpoints': {
-            '/api/search': 'Search endpoint (GET/POST)',
-            '/api/engines': 'List available search engines',
-            '/api/suggestions': 'Get search suggestions',
-            '/api/health': 'Health check'
-        },
-        'description': 'Beautiful search API powered by SearXNG with 250+ search engines',
-        'documentation': 'https://github.com/Unicorn-Commander/Center-Deep'
-    })
+    return jsonify(API_INFO)
+
+
+# ASGI serving mode
+
+def json_body(obj):
+    """Serialize like Flask's ``jsonify`` (sorted keys, compact, trailing
+    newline) so both serving modes return the same bytes"""
+    return (json.dumps(obj, sort_keys=True, separators=(',', ':')) + '\n').encode('utf-8')
+
+class AsgiApp:
+    """ASGI implementation of the API routes.  Requests to SearXNG are sent
+    by the :class:`AsyncSearXNGClient`, thousands of concurrent waits on the
+    backend cost coroutines, not threads."""
+
+    def __init__(self, searxng_client):
+        self.searxng = searxng_client
+        self.routes = {
+            '/api/search': self.search,
+            '/api/engines': self.get_engines,
+            '/api/suggestions': self.get_suggestions,
+            '/api/health': self.health,
+            '/api/metrics/backend': self.backend_metrics,
+            '/api/metrics/cache': self.cache_metrics,
+            '/api': self.api_info,
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+
+        path = scope['path']
+        method = scope['method']
+        if method == 'OPTIONS':
+            await self.send_response(send, 200, b'', 'text/plain', cors_preflight=True)
+            return
+
+        handler = self.routes.get(path.rstrip('/') or path)
+        if handler is None:
+            if method not in ('GET', 'HEAD'):
+                await self.send_json(send, {'error': 'Method not allowed'}, 405)
+                return
+            await self.serve_static(send, 'index.html' if path == '/' else path.lstrip('/'))
+            return
+        allowed = ('GET', 'POST') if handler == self.search else ('GET',)
+        if method not in allowed:
+            await self.send_json(send, {'error': 'Method not allowed'}, 405)
+            return
+
+        args = {k: v[0] for k, v in parse_qs(scope.get('query_string', b'').decode('latin-1')).items()}
+        status, data = await handler(method, args, receive)
+        await self.send_json(send, data, status)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.searxng.aclose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def read_body(self, receive):
+        body = b''
+        while True:
+            message = await receive()
+            body += message.get('body', b'')
+            if not message.get('more_body'):
+                return body
+
+    async def search(self, method, args, receive):
+        if method == 'POST':
+            try:
+                data = json.loads(await self.read_body(receive))
+            except ValueError:
+                return 400, {'error': 'Invalid JSON body'}
+            query = data.get('q', '')
+            options = data.get('options', {})
+        else:
+            query = args.get('q', '')
+            options = search_options(args)
+
+        if not query:
+            return 400, {'error': 'No query provided'}
+
+        params = search_params(query, options)
+        key = key_from_params(params)
+        try:
+            data = await result_cache.aget(key) if result_cache is not None else None
+            if data is not None:
+                return 200, enhance_results(query, data)
+
+            response = await self.searxng.search(params)
+            if response.status_code == 200:
+                data = response.json()
+                if result_cache is not None:
+                    await result_cache.aset(key, data)
+                return 200, enhance_results(query, data)
+            return 500, {'error': 'Search backend error'}
+        except httpx.TimeoutException:
+            return 504, {'error': 'Search timeout'}
+        except Exception as e:
+            return 500, {'error': str(e)}
+
+    async def get_engines(self, method, args, receive):
+        try:
+            response = await self.searxng.get('config')
+            if response.status_code == 200:
+                data = response.json()
+                return 200, {
+                    'engines': data.get('engines', []),
+                    'categories': data.get('categories', [])
+                }
+        except Exception:
+            pass
+        return 200, FALLBACK_ENGINES
+
+    async def get_suggestions(self, method, args, receive):
+        query = args.get('q', '')
+        if not query:
+            return 200, []
+        try:
+            response = await self.searxng.get('autocompleter', params={'q': query})
+            if response.status_code == 200:
+                return 200, response.json()
+        except Exception:
+            pass
+        return 200, []
+
+    async def health(self, method, args, receive):
+        searxng_healthy = False
+        try:
+            response = await self.searxng.get('healthz')
+            searxng_healthy = response.status_code == 200
+        except Exception:
+            pass
+        return 200, health_status(searxng_healthy)
+
+    async def backend_metrics(self, method, args, receive):
+        return 200, self.searxng.metrics()
+
+    async def cache_metrics(self, method, args, receive):
+        return 200, cache_metrics()
+
+    async def api_info(self, method, args, receive):
+        return 200, API_INFO
+
+    async def serve_static(self, send, path):
+        filename = safe_join(STATIC_FOLDER, path)
+        if filename is None or not os.path.isfile(filename):
+            await self.send_response(send, 404, b'Not Found', 'text/plain')
+            return
+        with open(filename, 'rb') as f:
+            body = await asyncio.to_thread(f.read)
+        content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        await self.send_response(send, 200, body, content_type)
+
+    async def send_json(self, send, data, status=200):
+        await self.send_response(send, status, json_body(data), 'application/json')
+
+    async def send_response(self, send, status, body, content_type, cors_preflight=False):
+        headers = [
+            (b'content-type', content_type.encode('latin-1')),
+            (b'content-length', str(len(body)).encode('latin-1')),
+            # same as CORS(app) in the Flask mode
+            (b'access-control-allow-origin', b'*'),
+        ]
+        if cors_preflight:
+            headers.append((b'access-control-allow-methods', b'GET, POST, OPTIONS'))
+            headers.append((b'access-control-allow-headers', b'*'))
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': body})
+
+asgi_app = AsgiApp(AsyncSearXNGClient.from_env(SEARXNG_URL))
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=8888, debug=False)
\ No newline at end of file
+    if '--asgi' in sys.argv[1:]:
+        from granian import Granian
+        from granian.constants import Interfaces
+
+        Granian('api_server:asgi_app', address='0.0.0.0', port=8888, interface=Interfaces.ASGI).serve()
+    else:
+        app.run(host='0.0.0.0', port=8888, debug=False)
@@ -10,10 +10,14 @@ from flask_login import LoginManager, UserMixin, login_user, logout_user, login_
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime, timedelta
 import os
-import requests
 import json
 from functools import wraps
 
+from center_deep.backend import SearXNGClient
+from center_deep.cache import ResultCache, key_from_params
+from center_deep.analytics import SearchRollups, search_log_indexes
+from center_deep.searchlog import SearchLogWriter
+
 app = Flask(__name__, 
            template_folder='templates',
            static_folder='static')
@@ -26,7 +30,12 @@ app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(days=7)
 
 # SearXNG backend configuration
 SEARXNG_URL = os.environ.get('SEARXNG_URL', 'http://searxng:8080')
-SEARXNG_TIMEOUT = 10
+
+# Shared keep-alive connection pool to SearXNG
+searxng = SearXNGClient.from_env(SEARXNG_URL)
+
+# Cache of SearXNG responses (None if disabled)
+result_cache = ResultCache.from_env()
 
 # Initialize extensions
 db = SQLAlchemy(app)
@@ -52,6 +61,7 @@ class User(UserMixin, db.Model):
         return check_password_hash(self.password_hash, password)
 
 class SearchLog(db.Model):
+    __table_args__ = search_log_indexes(db)
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
     query = db.Column(db.String(500), nullable=False)
@@ -60,9 +70,13 @@ class SearchLog(db.Model):
     results_count = db.Column(db.Integer)
     ip_address = db.Column(db.String(45))
 
+# Pre-aggregated search statistics, updated by the search log writer
+rollups = SearchRollups(db, SearchLog)
+
 # Create tables
 with app.app_context():
     db.create_all()
+    rollups.init()
     # Create default admin user if not exists
     admin = User.query.filter_by(username='admin').first()
     if not admin:
@@ -71,6 +85,9 @@ with app.app_context():
         db.session.add(admin)
         db.session.commit()
 
+# Background writer of the search log
+search_log_writer = SearchLogWriter.from_env(app, db, SearchLog, rollups=rollups)
+
 @login_manager.user_loader
 def load_user(user_id):
     return User.query.get(int(user_id))
@@ -83,6 +100,24 @@ def admin_required(f):
         return f(*args, **kwargs)
     return decorated_function
 
+def search_searxng(params):
+    """Return the SearXNG JSON response, from the result cache if possible.
+    Returns None if the backend answers with an error status."""
+    key = key_from_params(params)
+    if result_cache is not None:
+        data = result_cache.get(key)
+        if data is not None:
+            return data
+
+    response = searxng.search(params)
+    if response.status_code != 200:
+        return None
+
+    data = response.json()
+    if result_cache is not None:
+        result_cache.set(key, data)
+    return data
+
 # Routes
 @app.route('/')
 def index():
@@ -91,15 +126,10 @@ def index():
     if current_user.is_authenticated:
         # Today's searches
         today = datetime.utcnow().date()
-        searches_today = db.session.query(SearchLog).filter(
-            SearchLog.user_id == current_user.id,
-            db.func.date(SearchLog.timestamp) == today
-        ).count()
+        searches_today = rollups.user_searches(current_user.id, today)
         
         # Total searches
-        total_searches = db.session.query(SearchLog).filter(
-            SearchLog.user_id == current_user.id
-        ).count()
+        total_searches = rollups.user_searches(current_user.id)
         
         user_stats = {
             'searches_today': searches_today,
@@ -144,12 +174,9 @@ def search():
             params['time_range'] = time_range
         
         # Call SearXNG API
-        response = requests.get(f'{SEARXNG_URL}/search', 
-                              params=params, 
-                              timeout=SEARXNG_TIMEOUT)
+        data = search_searxng(params)
         
-        if response.status_code == 200:
-            data = response.json()
+        if data is not None:
             results = data.get('results', [])
             suggestions = data.get('suggestions', [])
             answers = data.get('answers', [])
@@ -172,15 +199,13 @@ def search():
     
     # Log search if user is authenticated
     if current_user.is_authenticated:
-        search_log = SearchLog(
+        search_log_writer.log(
             user_id=current_user.id,
             query=query,
             response_time=response_time,
             results_count=len(results),
             ip_address=request.remote_addr
         )
-        db.session.add(search_log)
-        db.session.commit()
     
     return render_template('search.html', 
                          query=query,
@@ -209,9 +234,9 @@ def api_search():
     }
     
     try:
-        response = requests.get(f'{SEARXNG_URL}/search', params=params, timeout=SEARXNG_TIMEOUT)
-        if response.status_code == 200:
-            return jsonify(response.json())
+        data = search_searxng(params)
+        if data is not None:
+            return jsonify(data)
         else:
             return jsonify({'error': 'Search backend error'}), 500
     except Exception as e:
@@ -251,14 +276,12 @@ def logout():
 def admin():
     """Admin dashboard"""
     total_users = User.query.count()
-    total_searches = SearchLog.query.count()
+    total_searches = rollups.total_searches()
     recent_searches = SearchLog.query.order_by(SearchLog.timestamp.desc()).limit(20).all()
     
     # Get search statistics
     today = datetime.utcnow().date()
-    searches_today = db.session.query(SearchLog).filter(
-        db.func.date(SearchLog.timestamp) == today
-    ).count()
+    searches_today = rollups.searches_on(today)
     
     return render_template('admin.html',
                          total_users=total_users,
@@ -266,6 +289,27 @@ def admin():
                          searches_today=searches_today,
                          recent_searches=recent_searches)
 
+@app.route('/admin/backend-stats')
+@login_required
+@admin_required
+def backend_stats():
+    """Connection pool and latency metrics of the SearXNG client"""
+    return jsonify(searxng.metrics())
+
+@app.route('/admin/cache-stats')
+@login_required
+@admin_required
+def cache_stats():
+    """Hit/miss counters of the result cache"""
+    return jsonify(result_cache.metrics() if result_cache is not None else {'enabled': False})
+
+@app.route('/admin/searchlog-stats')
+@login_required
+@admin_required
+def searchlog_stats():
+    """Queue and write counters of the search log writer"""
+    return jsonify(search_log_writer.metrics())
+
 @app.route('/preferences')
 def preferences():
     """User preferences"""
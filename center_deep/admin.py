@@ -1,6 +1,6 @@
 from flask import Blueprint, render_template, redirect, url_for, request, jsonify, flash
 from flask_login import login_required, current_user
-from .models import db, User, SearchLog, ProxyLog
+from .models import db, User, SearchLog, ProxyLog, rollups
 from .auth import admin_required
 from datetime import datetime, timedelta
 import json
@@ -14,15 +14,12 @@ def dashboard():
     """Admin dashboard"""
     # Get statistics
     total_users = User.query.count()
-    total_searches = SearchLog.query.count()
+    total_searches = rollups.total_searches()
     recent_searches = SearchLog.query.order_by(SearchLog.timestamp.desc()).limit(10).all()
     
-    # Get search statistics for last 7 days
+    # Get search statistics for last 7 days (from the per-day rollup)
     seven_days_ago = datetime.utcnow() - timedelta(days=7)
-    daily_searches = db.session.query(
-        db.func.date(SearchLog.timestamp).label('date'),
-        db.func.count(SearchLog.id).label('count')
-    ).filter(SearchLog.timestamp >= seven_days_ago).group_by('date').all()
+    daily_searches = rollups.daily_searches(seven_days_ago)
     
     stats = {
         'total_users': total_users,
@@ -69,6 +66,7 @@ def delete_user(user_id):
         return jsonify({'error': 'Cannot delete your own account'}), 400
     
     db.session.delete(user)
+    rollups.delete_user(db.session, user.id)
     db.session.commit()
     
     flash(f'User {user.username} has been deleted', 'success')
@@ -107,21 +105,11 @@ def analytics():
     # Get search trends
     thirty_days_ago = datetime.utcnow() - timedelta(days=30)
     
-    # Most searched queries
-    popular_queries = db.session.query(
-        SearchLog.query,
-        db.func.count(SearchLog.id).label('count')
-    ).filter(SearchLog.timestamp >= thirty_days_ago)\
-     .group_by(SearchLog.query)\
-     .order_by(db.func.count(SearchLog.id).desc())\
-     .limit(20).all()
+    # Most searched queries (from the per-query rollup)
+    popular_queries = rollups.popular_queries(thirty_days_ago, limit=20)
     
-    # Search volume by hour
-    hourly_searches = db.session.query(
-        db.func.strftime('%H', SearchLog.timestamp).label('hour'),
-        db.func.count(SearchLog.id).label('count')
-    ).filter(SearchLog.timestamp >= thirty_days_ago)\
-     .group_by('hour').all()
+    # Search volume by hour (from the per-hour rollup)
+    hourly_searches = rollups.hourly_searches(thirty_days_ago)
     
     analytics_data = {
         'popular_queries': popular_queries,
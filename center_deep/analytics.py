@@ -0,0 +1,200 @@
+"""
+Indexed and pre-aggregated SearchLog analytics
+
+The admin dashboards used to run ``COUNT(*)`` and ``GROUP BY`` over the whole
+``SearchLog`` table on every page view.  :class:`SearchRollups` maintains
+rollup tables which are updated incrementally by the
+:class:`center_deep.searchlog.SearchLogWriter` (in the same transaction as the
+INSERT of the log rows):
+
+- ``search_rollup_day``: searches per day
+- ``search_rollup_hour``: searches per day and hour
+- ``search_rollup_user``: searches per user and day
+- ``search_rollup_query``: searches per query and day
+
+The dashboards read O(days) rows from these tables instead of O(searches) rows
+from ``SearchLog``.  Days and hours are stored as strings (``YYYY-MM-DD`` /
+``HH``), the same values SQLite's ``date()`` and ``strftime('%H', ..)`` return.
+"""
+
+from collections import Counter
+from datetime import datetime
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+
+def search_log_indexes(db):
+    """Indexes of the ``SearchLog`` model, use it as ``__table_args__``"""
+    return (
+        db.Index('ix_search_log_timestamp', 'timestamp'),
+        db.Index('ix_search_log_user_id_timestamp', 'user_id', 'timestamp'),
+        db.Index('ix_search_log_query', 'query'),
+    )
+
+
+def day_of(timestamp):
+    return timestamp.strftime('%Y-%m-%d')
+
+
+class SearchRollups:
+    """Rollup tables of a ``SearchLog`` model"""
+
+    def __init__(self, db, model):
+        self.db = db
+        self.model = model
+        metadata = db.metadata
+        self.day = sa.Table(
+            'search_rollup_day',
+            metadata,
+            sa.Column('day', sa.String(10), primary_key=True),
+            sa.Column('count', sa.Integer, nullable=False, default=0),
+        )
+        self.hour = sa.Table(
+            'search_rollup_hour',
+            metadata,
+            sa.Column('day', sa.String(10), primary_key=True),
+            sa.Column('hour', sa.String(2), primary_key=True),
+            sa.Column('count', sa.Integer, nullable=False, default=0),
+        )
+        self.user = sa.Table(
+            'search_rollup_user',
+            metadata,
+            sa.Column('user_id', sa.Integer, primary_key=True),
+            sa.Column('day', sa.String(10), primary_key=True),
+            sa.Column('count', sa.Integer, nullable=False, default=0),
+        )
+        self.query = sa.Table(
+            'search_rollup_query',
+            metadata,
+            sa.Column('day', sa.String(10), primary_key=True),
+            sa.Column('query', sa.String(500), primary_key=True),
+            sa.Column('count', sa.Integer, nullable=False, default=0),
+        )
+
+    @property
+    def tables(self):
+        return (self.day, self.hour, self.user, self.query)
+
+    def init(self):
+        """Create missing indexes and rollup tables (``db.create_all()`` does not
+        add indexes to an existing table) and backfill the rollups of an
+        existing search log.  Call it in an application context."""
+        engine = self.db.engine
+        for index in self.model.__table__.indexes:
+            index.create(engine, checkfirst=True)
+        for table in self.tables:
+            table.create(engine, checkfirst=True)
+
+        session = self.db.session
+        if session.execute(sa.select(sa.func.count()).select_from(self.day)).scalar():
+            return
+        if session.execute(sa.select(self.model.id).limit(1)).first() is None:
+            return
+        self.rebuild()
+
+    def rebuild(self):
+        """Recompute all rollups from the ``SearchLog`` table"""
+        log = self.model.__table__
+        day = sa.func.date(log.c.timestamp)
+        hour = sa.func.strftime('%H', log.c.timestamp)
+        count = sa.func.count()
+        session = self.db.session
+        for table in self.tables:
+            session.execute(table.delete())
+        session.execute(
+            self.day.insert().from_select(['day', 'count'], sa.select(day, count).group_by(day))
+        )
+        session.execute(
+            self.hour.insert().from_select(
+                ['day', 'hour', 'count'], sa.select(day, hour, count).group_by(day, hour)
+            )
+        )
+        session.execute(
+            self.user.insert().from_select(
+                ['user_id', 'day', 'count'],
+                sa.select(log.c.user_id, day, count).where(log.c.user_id.is_not(None)).group_by(log.c.user_id, day),
+            )
+        )
+        session.execute(
+            self.query.insert().from_select(
+                ['day', 'query', 'count'], sa.select(day, log.c.query, count).group_by(day, log.c.query)
+            )
+        )
+        session.commit()
+
+    def _upsert(self, session, table, keys, counter):
+        if not counter:
+            return
+        stmt = sqlite_insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=keys, set_={'count': table.c.count + stmt.excluded.count}
+        )
+        session.execute(stmt, [dict(zip(keys, key), count=count) for key, count in counter.items()])
+
+    def update(self, session, rows):
+        """Add the log ``rows`` (dicts of column values) to the rollups, the
+        caller commits the session"""
+        days, hours, users, queries = Counter(), Counter(), Counter(), Counter()
+        for row in rows:
+            timestamp = row.get('timestamp') or datetime.utcnow()
+            day = day_of(timestamp)
+            days[(day,)] += 1
+            hours[(day, timestamp.strftime('%H'))] += 1
+            if row.get('user_id') is not None:
+                users[(row['user_id'], day)] += 1
+            queries[(day, row['query'])] += 1
+        self._upsert(session, self.day, ['day'], days)
+        self._upsert(session, self.hour, ['day', 'hour'], hours)
+        self._upsert(session, self.user, ['user_id', 'day'], users)
+        self._upsert(session, self.query, ['day', 'query'], queries)
+
+    def delete_user(self, session, user_id):
+        """Remove the rollups of a deleted user (SQLite can reuse the id of
+        the user), the caller commits the session"""
+        session.execute(self.user.delete().where(self.user.c.user_id == user_id))
+
+    # dashboard queries
+
+    def total_searches(self):
+        return self.db.session.execute(sa.select(sa.func.coalesce(sa.func.sum(self.day.c.count), 0))).scalar()
+
+    def searches_on(self, date):
+        count = self.db.session.execute(sa.select(self.day.c.count).where(self.day.c.day == day_of(date))).scalar()
+        return count or 0
+
+    def user_searches(self, user_id, date=None):
+        """Number of searches of a user (on ``date`` or in total)"""
+        stmt = sa.select(sa.func.coalesce(sa.func.sum(self.user.c.count), 0)).where(self.user.c.user_id == user_id)
+        if date is not None:
+            stmt = stmt.where(self.user.c.day == day_of(date))
+        return self.db.session.execute(stmt).scalar()
+
+    def daily_searches(self, since):
+        """``(date, count)`` rows since ``since``"""
+        return self.db.session.execute(
+            sa.select(self.day.c.day.label('date'), self.day.c.count.label('count'))
+            .where(self.day.c.day >= day_of(since))
+            .order_by(self.day.c.day)
+        ).all()
+
+    def hourly_searches(self, since):
+        """``(hour, count)`` rows of the searches since ``since``"""
+        count = sa.func.sum(self.hour.c.count)
+        return self.db.session.execute(
+            sa.select(self.hour.c.hour.label('hour'), count.label('count'))
+            .where(self.hour.c.day >= day_of(since))
+            .group_by(self.hour.c.hour)
+        ).all()
+
+    def popular_queries(self, since, limit=20):
+        """``(query, count)`` rows of the most searched queries since ``since``"""
+        count = sa.func.sum(self.query.c.count)
+        return self.db.session.execute(
+            sa.select(self.query.c.query.label('query'), count.label('count'))
+            .where(self.query.c.day >= day_of(since))
+            .group_by(self.query.c.query)
+            .order_by(count.desc())
+            .limit(limit)
+        ).all()
+
@@ -0,0 +1,278 @@
+"""
+Shared HTTP client for the SearXNG backend
+
+The Center Deep front ends (``app.py`` and ``api_server.py``) talk to SearXNG
+through one :class:`SearXNGClient` per process.  The client keeps a bounded
+pool of keep-alive connections, applies per-endpoint timeouts and records
+pool-saturation and latency metrics which can be used to size the pool.
+
+The ASGI mode of ``api_server.py`` uses :class:`AsyncSearXNGClient`, the
+:py:mod:`httpx` based counterpart with the same configuration and metrics.
+
+Configuration is read from the environment:
+
+``SEARXNG_URL``
+  Base URL of the SearXNG instance.
+
+``SEARXNG_POOL_MAXSIZE``
+  Max. number of (keep-alive) connections in the pool (default: 20).
+
+``SEARXNG_POOL_BLOCK``
+  If ``1`` (default) a request waits for a free connection when the pool is
+  exhausted, otherwise a throw-away connection is opened.
+
+``SEARXNG_TIMEOUT``, ``SEARXNG_TIMEOUT_<ENDPOINT>``
+  Timeouts in seconds, e.g. ``SEARXNG_TIMEOUT_AUTOCOMPLETER=3``.
+"""
+
+import os
+import threading
+import time
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+# Default timeouts (in sec.) per SearXNG endpoint
+DEFAULT_TIMEOUTS = {
+    'search': 10,
+    'config': 5,
+    'autocompleter': 3,
+    'healthz': 2,
+}
+
+DEFAULT_POOL_MAXSIZE = 20
+
+# Upper bounds (in sec.) of the latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, float('inf'))
+
+
+def timeouts_from_env(environ=None):
+    """Read the per-endpoint timeouts from the environment"""
+    environ = os.environ if environ is None else environ
+    timeouts = dict(DEFAULT_TIMEOUTS)
+    if environ.get('SEARXNG_TIMEOUT'):
+        timeouts['search'] = float(environ['SEARXNG_TIMEOUT'])
+    for endpoint in list(timeouts):
+        value = environ.get(f'SEARXNG_TIMEOUT_{endpoint.upper()}')
+        if value:
+            timeouts[endpoint] = float(value)
+    return timeouts
+
+
+class EndpointStats:
+    """Request counters and latency histogram of one endpoint"""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+
+    def observe(self, duration):
+        self.requests += 1
+        self.total_time += duration
+        self.max_time = max(self.max_time, duration)
+        for i, upper in enumerate(LATENCY_BUCKETS):
+            if duration <= upper:
+                self.buckets[i] += 1
+                break
+
+    def percentile(self, percentage):
+        """Upper bound of the bucket containing the given percentile"""
+        if not self.requests:
+            return None
+        limit = self.requests * percentage / 100
+        count = 0
+        for i, upper in enumerate(LATENCY_BUCKETS):
+            count += self.buckets[i]
+            if count >= limit:
+                return self.max_time if upper == float('inf') else upper
+        return self.max_time
+
+    def to_dict(self):
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'timeouts': self.timeouts,
+            'avg': round(self.total_time / self.requests, 4) if self.requests else None,
+            'max': round(self.max_time, 4),
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'histogram': {str(upper): count for upper, count in zip(LATENCY_BUCKETS, self.buckets)},
+        }
+
+
+class BackendStats:
+    """Thread safe pool and latency metrics of a backend client"""
+
+    def __init__(self, pool_maxsize):
+        self.pool_maxsize = pool_maxsize
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.saturated = 0
+        self.endpoints = {}
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Register a request entering the pool.  A request that finds all
+        pooled connections busy is counted as *saturated* (it has to wait for a
+        free connection)."""
+        with self._lock:
+            if self.in_flight >= self.pool_maxsize:
+                self.saturated += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def release(self, endpoint, duration, error=None):
+        with self._lock:
+            self.in_flight -= 1
+            stats = self.endpoints.setdefault(endpoint, EndpointStats())
+            stats.observe(duration)
+            if error is not None:
+                stats.errors += 1
+                if isinstance(error, (requests.exceptions.Timeout, httpx.TimeoutException)):
+                    stats.timeouts += 1
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                'pool': {
+                    'maxsize': self.pool_maxsize,
+                    'in_flight': self.in_flight,
+                    'peak_in_flight': self.peak_in_flight,
+                    'saturated': self.saturated,
+                    'utilization': round(self.in_flight / self.pool_maxsize, 2),
+                },
+                'endpoints': {name: stats.to_dict() for name, stats in self.endpoints.items()},
+            }
+
+
+class BaseSearXNGClient:
+    """Configuration and metrics shared by the sync and the async client"""
+
+    def __init__(self, base_url, pool_maxsize=DEFAULT_POOL_MAXSIZE, pool_block=True, timeouts=None):
+        self.base_url = base_url.rstrip('/')
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.timeouts = dict(DEFAULT_TIMEOUTS)
+        self.timeouts.update(timeouts or {})
+        self.stats = BackendStats(pool_maxsize)
+
+    @classmethod
+    def from_env(cls, default_url, **kwargs):
+        """Build a client from the ``SEARXNG_*`` environment variables"""
+        kwargs.setdefault('pool_maxsize', int(os.environ.get('SEARXNG_POOL_MAXSIZE', DEFAULT_POOL_MAXSIZE)))
+        kwargs.setdefault('pool_block', os.environ.get('SEARXNG_POOL_BLOCK', '1') == '1')
+        kwargs.setdefault('timeouts', timeouts_from_env())
+        return cls(os.environ.get('SEARXNG_URL', default_url), **kwargs)
+
+    def endpoint_timeout(self, endpoint, timeout=None):
+        if timeout is None:
+            timeout = self.timeouts.get(endpoint, self.timeouts['search'])
+        return timeout
+
+    def metrics(self):
+        """Pool saturation and latency metrics (JSON serializable)"""
+        data = self.stats.to_dict()
+        data['timeouts'] = self.timeouts
+        return data
+
+
+class SearXNGClient(BaseSearXNGClient):
+    """Pooled keep-alive HTTP client for the SearXNG backend"""
+
+    def __init__(self, base_url, **kwargs):
+        super().__init__(base_url, **kwargs)
+
+        # SearXNG is a single host, one pool with pool_maxsize connections is
+        # all we need.  With pool_block=True the number of open connections
+        # never exceeds pool_maxsize.
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=self.pool_maxsize, pool_block=self.pool_block, max_retries=0
+        )
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers['Connection'] = 'keep-alive'
+
+    def get(self, endpoint, params=None, timeout=None):
+        """Send a GET request to ``{base_url}/{endpoint}``.  The timeout defaults
+        to the timeout configured for the endpoint.  Exceptions from
+        :py:mod:`requests` are passed to the caller."""
+        endpoint = endpoint.strip('/')
+        timeout = self.endpoint_timeout(endpoint, timeout)
+
+        self.stats.acquire()
+        start_time = time.perf_counter()
+        error = None
+        try:
+            response = self.session.get(f'{self.base_url}/{endpoint}', params=params, timeout=timeout)
+            # read the body while measuring, the connection goes back to the
+            # pool when the content has been consumed
+            _ = response.content
+            return response
+        except requests.exceptions.RequestException as e:
+            error = e
+            raise
+        finally:
+            self.stats.release(endpoint, time.perf_counter() - start_time, error)
+
+    def search(self, params, timeout=None):
+        return self.get('search', params=params, timeout=timeout)
+
+    def close(self):
+        self.session.close()
+
+
+class AsyncSearXNGClient(BaseSearXNGClient):
+    """Pooled keep-alive :py:mod:`httpx` client for the SearXNG backend.  A
+    request waiting on SearXNG costs a coroutine, not a thread.
+
+    The underlying :py:obj:`httpx.AsyncClient` is created on first use, so it
+    is bound to the event loop of the ASGI server and not to the one of the
+    importing process.
+    """
+
+    def __init__(self, base_url, **kwargs):
+        super().__init__(base_url, **kwargs)
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            limits = httpx.Limits(
+                max_connections=self.pool_maxsize if self.pool_block else None,
+                max_keepalive_connections=self.pool_maxsize,
+            )
+            self._client = httpx.AsyncClient(base_url=self.base_url, limits=limits, headers={'Connection': 'keep-alive'})
+        return self._client
+
+    async def get(self, endpoint, params=None, timeout=None):
+        """Send a GET request to ``{base_url}/{endpoint}``.  Exceptions from
+        :py:mod:`httpx` are passed to the caller."""
+        endpoint = endpoint.strip('/')
+        timeout = self.endpoint_timeout(endpoint, timeout)
+
+        self.stats.acquire()
+        start_time = time.perf_counter()
+        error = None
+        try:
+            # with max_connections reached, httpx waits for a free connection,
+            # the pool timeout bounds that wait by the endpoint's timeout
+            return await self.client.get(f'/{endpoint}', params=params, timeout=timeout)
+        except httpx.HTTPError as e:
+            error = e
+            raise
+        finally:
+            self.stats.release(endpoint, time.perf_counter() - start_time, error)
+
+    async def search(self, params, timeout=None):
+        return await self.get('search', params=params, timeout=timeout)
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
@@ -0,0 +1,297 @@
+"""
+Result cache in front of SearXNG
+
+Popular queries dominate the traffic of a Center Deep instance.  The
+:class:`ResultCache` stores the JSON response of SearXNG keyed by the
+normalized query tuple ``(q, pageno, categories, language, safesearch,
+time_range)``:
+
+- an in-process LRU tier, bounded by the number of entries
+- an optional shared tier (all front end processes) on the backends of SearXNG:
+  Valkey (:py:mod:`searx.valkeydb`) or SQLite (:py:obj:`searx.cache.ExpireCacheSQLite`)
+
+Configuration is read from the environment:
+
+``CENTER_DEEP_CACHE``
+  ``0`` disables the cache (default: ``1``).
+
+``CENTER_DEEP_CACHE_MAXSIZE``
+  Max. number of entries in the in-process tier (default: 1024).
+
+``CENTER_DEEP_CACHE_TTL``, ``CENTER_DEEP_CACHE_TTL_<CATEGORY>``
+  Time to live in seconds (default: 300), e.g. ``CENTER_DEEP_CACHE_TTL_NEWS=60``.
+  For a search in several categories the shortest TTL is used.
+
+``CENTER_DEEP_CACHE_SHARED``
+  Shared tier: ``valkey``, ``sqlite`` or empty (default: no shared tier).
+
+The shared tier does blocking I/O, async callers use :meth:`ResultCache.aget`
+and :meth:`ResultCache.aset` which run it in a worker thread.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_MAXSIZE = 1024
+DEFAULT_TTL = 300
+
+logger = logging.getLogger('center_deep.cache')
+
+
+def normalize_key(q, pageno=1, categories='', language='', safesearch='0', time_range=''):
+    """Normalized cache key of a search: whitespace in the query is collapsed,
+    categories are sorted and the page number is an integer."""
+    if isinstance(categories, str):
+        categories = categories.split(',')
+    categories = ','.join(sorted({c.strip() for c in categories if c and c.strip()}))
+    try:
+        pageno = int(pageno)
+    except (TypeError, ValueError):
+        pageno = 1
+    return (' '.join(q.split()), pageno, categories, language or '', str(safesearch), time_range or '')
+
+
+def key_from_params(params):
+    """Cache key from the SearXNG request parameters"""
+    return normalize_key(
+        params['q'],
+        pageno=params.get('pageno', 1),
+        categories=params.get('categories', ''),
+        language=params.get('language', ''),
+        safesearch=params.get('safesearch', '0'),
+        time_range=params.get('time_range', ''),
+    )
+
+
+class ValkeyTier:
+    """Shared tier on the Valkey DB of SearXNG (:py:mod:`searx.valkeydb`)"""
+
+    prefix = 'center_deep:results:'
+
+    def __init__(self, client):
+        self.client = client
+
+    @classmethod
+    def build(cls):
+        # pylint: disable=import-outside-toplevel
+        from searx import valkeydb
+
+        if valkeydb.client() is None and not valkeydb.initialize():
+            return None
+        return cls(valkeydb.client())
+
+    def _key(self, key):
+        return self.prefix + hashlib.sha256(json.dumps(key).encode()).hexdigest()
+
+    def get(self, key):
+        value = self.client.get(self._key(key))
+        return None if value is None else json.loads(value)
+
+    def set(self, key, value, ttl):
+        self.client.set(self._key(key), json.dumps(value), ex=ttl)
+
+
+class SQLiteTier:
+    """Shared tier on a :py:obj:`searx.cache.ExpireCacheSQLite` DB"""
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    @classmethod
+    def build(cls):
+        # pylint: disable=import-outside-toplevel
+        from searx.cache import ExpireCache, ExpireCacheCfg
+
+        cfg = ExpireCacheCfg(
+            name='CENTER_DEEP_RESULTS',
+            MAX_VALUE_LEN=1024 * 512,  # a page of results is ~10-100kB
+            MAXHOLD_TIME=60 * 60,
+        )
+        return cls(ExpireCache.build_cache(cfg))
+
+    def get(self, key):
+        return self.cache.get(self.cache.secret_hash(json.dumps(key)))
+
+    def set(self, key, value, ttl):
+        self.cache.set(self.cache.secret_hash(json.dumps(key)), value, expire=ttl)
+
+
+SHARED_TIERS = {
+    'valkey': ValkeyTier,
+    'sqlite': SQLiteTier,
+}
+
+
+class ResultCache:
+    """Two tier (in-process LRU, optional shared) cache of SearXNG responses"""
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, ttl=DEFAULT_TTL, category_ttl=None, shared=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.category_ttl = category_ttl or {}
+        self.shared = shared
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters = {
+            'hits': 0,
+            'shared_hits': 0,
+            'misses': 0,
+            'stores': 0,
+            'evictions': 0,
+            'expired': 0,
+            'shared_errors': 0,
+        }
+
+    @classmethod
+    def from_env(cls, environ=None):
+        """Build a cache from the ``CENTER_DEEP_CACHE_*`` environment variables,
+        returns ``None`` if the cache is disabled."""
+        environ = os.environ if environ is None else environ
+        if environ.get('CENTER_DEEP_CACHE', '1') == '0':
+            return None
+
+        prefix = 'CENTER_DEEP_CACHE_TTL_'
+        category_ttl = {
+            name[len(prefix) :].lower().replace('_', ' '): int(value)
+            for name, value in environ.items()
+            if name.startswith(prefix)
+        }
+
+        shared = None
+        shared_name = environ.get('CENTER_DEEP_CACHE_SHARED', '')
+        if shared_name:
+            try:
+                shared = SHARED_TIERS[shared_name].build()
+            except Exception as e:
+                logger.error("can't build shared tier %r: %s", shared_name, e)
+
+        return cls(
+            maxsize=int(environ.get('CENTER_DEEP_CACHE_MAXSIZE', DEFAULT_MAXSIZE)),
+            ttl=int(environ.get('CENTER_DEEP_CACHE_TTL', DEFAULT_TTL)),
+            category_ttl=category_ttl,
+            shared=shared,
+        )
+
+    def ttl_for(self, key):
+        """TTL of a key, the shortest of the category overrides"""
+        categories = [c for c in key[2].split(',') if c]
+        ttls = [self.category_ttl[c] for c in categories if c in self.category_ttl]
+        return min(ttls) if ttls else self.ttl
+
+    def get(self, key):
+        """Return the cached response of ``key`` or ``None``"""
+        value = self.get_local(key)
+        if value is None:
+            value = self.get_shared(key)
+        return value
+
+    async def aget(self, key):
+        """Async :meth:`get`, the shared tier is read in a worker thread"""
+        value = self.get_local(key)
+        if value is None and self.shared is not None:
+            value = await asyncio.to_thread(self.get_shared, key)
+        elif value is None:
+            self._count('misses')
+        return value
+
+    def get_local(self, key):
+        """Return the response of ``key`` from the in-process tier or ``None``"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expire, value = entry
+                if expire > now:
+                    self._entries.move_to_end(key)
+                    self.counters['hits'] += 1
+                    return value
+                del self._entries[key]
+                self.counters['expired'] += 1
+        return None
+
+    def get_shared(self, key):
+        """Return the response of ``key`` from the shared tier (blocking I/O)
+        or ``None``, a miss is counted if there is no response."""
+        if self.shared is not None:
+            try:
+                value = self.shared.get(key)
+            except Exception as e:
+                logger.debug("shared tier: get failed: %s", e)
+                value = None
+                self._count('shared_errors')
+            if value is not None:
+                self._store(key, value, self.ttl_for(key))
+                self._count('shared_hits')
+                return value
+        self._count('misses')
+        return None
+
+    def _count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def set(self, key, value):
+        """Store a response.  Responses without results (e.g. all engines timed
+        out) are not cached."""
+        ttl = self.set_local(key, value)
+        if ttl:
+            self.set_shared(key, value, ttl)
+
+    async def aset(self, key, value):
+        """Async :meth:`set`, the shared tier is written in a worker thread"""
+        ttl = self.set_local(key, value)
+        if ttl and self.shared is not None:
+            await asyncio.to_thread(self.set_shared, key, value, ttl)
+
+    def set_local(self, key, value):
+        """Store a response in the in-process tier, returns its TTL (``0`` if
+        the response is not cached)."""
+        if not value or not value.get('results'):
+            return 0
+        ttl = self.ttl_for(key)
+        if ttl <= 0:
+            return 0
+        self._store(key, value, ttl)
+        return ttl
+
+    def set_shared(self, key, value, ttl):
+        """Store a response in the shared tier (blocking I/O)"""
+        if self.shared is None:
+            return
+        try:
+            self.shared.set(key, value, ttl)
+        except Exception as e:
+            logger.debug("shared tier: set failed: %s", e)
+            self._count('shared_errors')
+
+    def _store(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            self.counters['stores'] += 1
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.counters['evictions'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def metrics(self):
+        """Hit/miss counters (JSON serializable)"""
+        with self._lock:
+            data = dict(self.counters)
+            data['size'] = len(self._entries)
+        lookups = data['hits'] + data['shared_hits'] + data['misses']
+        data['hit_ratio'] = round((data['hits'] + data['shared_hits']) / lookups, 4) if lookups else None
+        data['maxsize'] = self.maxsize
+        data['ttl'] = self.ttl
+        data['category_ttl'] = self.category_ttl
+        data['shared'] = type(self.shared).__name__ if self.shared is not None else None
+        return data
@@ -4,6 +4,8 @@ from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime
 import os
 
+from .analytics import SearchRollups, search_log_indexes
+
 db = SQLAlchemy()
 
 class User(UserMixin, db.Model):
@@ -26,6 +28,7 @@ class User(UserMixin, db.Model):
 
 class SearchLog(db.Model):
     """Search history logging"""
+    __table_args__ = search_log_indexes(db)
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
     query = db.Column(db.String(500), nullable=False)
@@ -35,6 +38,9 @@ class SearchLog(db.Model):
     ip_address = db.Column(db.String(45))
     engines_used = db.Column(db.String(500))
 
+# Pre-aggregated search statistics, updated by the search log writer
+rollups = SearchRollups(db, SearchLog)
+
 class ProxyLog(db.Model):
     """Proxy usage logging"""
     id = db.Column(db.Integer, primary_key=True)
@@ -53,6 +59,7 @@ def init_db(app):
     
     with app.app_context():
         db.create_all()
+        rollups.init()
         
         # Create default admin user if not exists
         admin = User.query.filter_by(username='admin').first()
@@ -0,0 +1,198 @@
+"""
+Batched, asynchronous SearchLog writer
+
+Searches used to build a ``SearchLog`` row and commit it inline, every search
+paid for a SQLite fsync and searches were serialized on the SQLite write lock.
+The :class:`SearchLogWriter` decouples the request thread from the DB: rows are
+put into a bounded in-memory queue and a background thread flushes them as
+bulk INSERTs, when ``batch_size`` rows are queued or ``flush_interval`` seconds
+have passed.  The rollup tables of :py:mod:`center_deep.analytics` are updated
+with each flush.
+
+Configuration is read from the environment:
+
+``CENTER_DEEP_LOG_QUEUE_SIZE``
+  Max. number of queued rows (default: 10000).
+
+``CENTER_DEEP_LOG_BATCH_SIZE``
+  Max. number of rows per INSERT (default: 200).
+
+``CENTER_DEEP_LOG_FLUSH_INTERVAL``
+  Max. seconds a row waits in the queue (default: 2).
+
+``CENTER_DEEP_LOG_POLICY``
+  What to do when the queue is full:
+
+  - ``drop_newest`` (default): drop the row to log
+  - ``drop_oldest``: drop the oldest queued row
+  - ``block``: wait up to ``CENTER_DEEP_LOG_BLOCK_TIMEOUT`` seconds (default:
+    0.05) for a free slot, then drop the row
+"""
+
+import atexit
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+POLICIES = ('drop_newest', 'drop_oldest', 'block')
+POLL_INTERVAL = 0.1
+
+
+class SearchLogWriter:
+    """Background writer of ``SearchLog`` rows"""
+
+    def __init__(
+        self,
+        app,
+        db,
+        model,
+        queue_size=10000,
+        batch_size=200,
+        flush_interval=2.0,
+        policy='drop_newest',
+        block_timeout=0.05,
+        rollups=None,
+    ):
+        if policy not in POLICIES:
+            raise ValueError(f"unknown SearchLog queue policy {policy!r}, valid: {', '.join(POLICIES)}")
+        self.app = app
+        self.db = db
+        self.model = model
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.rollups = rollups
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.counters = {
+            'enqueued': 0,
+            'dropped': 0,
+            'written': 0,
+            'batches': 0,
+            'errors': 0,
+        }
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='searchlog-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    @classmethod
+    def from_env(cls, app, db, model, rollups=None, environ=None):
+        """Build a writer from the ``CENTER_DEEP_LOG_*`` environment variables"""
+        environ = os.environ if environ is None else environ
+        return cls(
+            app,
+            db,
+            model,
+            queue_size=int(environ.get('CENTER_DEEP_LOG_QUEUE_SIZE', 10000)),
+            batch_size=int(environ.get('CENTER_DEEP_LOG_BATCH_SIZE', 200)),
+            flush_interval=float(environ.get('CENTER_DEEP_LOG_FLUSH_INTERVAL', 2.0)),
+            policy=environ.get('CENTER_DEEP_LOG_POLICY', 'drop_newest'),
+            block_timeout=float(environ.get('CENTER_DEEP_LOG_BLOCK_TIMEOUT', 0.05)),
+            rollups=rollups,
+        )
+
+    def _count(self, name, value=1):
+        with self._lock:
+            self.counters[name] += value
+
+    def log(self, **row):
+        """Queue a row (column values of the model).  Never blocks on the DB,
+        returns ``False`` if the row was dropped."""
+        row.setdefault('timestamp', datetime.utcnow())
+        if self._stop.is_set():
+            self._count('dropped')
+            return False
+
+        try:
+            if self.policy == 'block':
+                self.queue.put(row, timeout=self.block_timeout)
+            else:
+                self.queue.put_nowait(row)
+        except queue.Full:
+            if self.policy != 'drop_oldest':
+                self._count('dropped')
+                return False
+            try:
+                self.queue.get_nowait()
+                self._count('dropped')
+            except queue.Empty:
+                pass
+            try:
+                self.queue.put_nowait(row)
+            except queue.Full:
+                self._count('dropped')
+                return False
+
+        self._count('enqueued')
+        return True
+
+    def _take_batch(self, timeout):
+        """Wait up to ``timeout`` seconds for the first row, then collect what is
+        queued (at most ``batch_size`` rows)"""
+        batch = []
+        deadline = time.monotonic() + timeout
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            waiting = remaining > 0 and not self._stop.is_set()
+            try:
+                if waiting:
+                    # wait in slices, close() does not wait for the flush interval
+                    batch.append(self.queue.get(timeout=min(remaining, POLL_INTERVAL)))
+                else:
+                    batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                if not waiting:
+                    break
+        return batch
+
+    def _run(self):
+        while not self._stop.is_set():
+            batch = self._take_batch(self.flush_interval)
+            if batch:
+                self.write(batch)
+        # drain the queue on shutdown
+        while True:
+            batch = self._take_batch(0)
+            if not batch:
+                break
+            self.write(batch)
+
+    def write(self, rows):
+        """Bulk INSERT of ``rows`` in one transaction, the rollups (if any) are
+        updated in the same transaction"""
+        try:
+            with self.app.app_context():
+                self.db.session.execute(self.db.insert(self.model), rows)
+                if self.rollups is not None:
+                    self.rollups.update(self.db.session, rows)
+                self.db.session.commit()
+        except Exception as e:
+            print(f"Error writing search log: {e}")
+            self._count('errors')
+            try:
+                with self.app.app_context():
+                    self.db.session.rollback()
+            except Exception:
+                pass
+            return
+        self._count('written', len(rows))
+        self._count('batches')
+
+    def close(self, timeout=10):
+        """Stop the writer and flush the queued rows"""
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+
+    def metrics(self):
+        with self._lock:
+            data = dict(self.counters)
+        data['queued'] = self.queue.qsize()
+        data['queue_size'] = self.queue.maxsize
+        data['policy'] = self.policy
+        return data
@@ -13,27 +13,28 @@ sys.path.insert(0, str(center_deep_path))
 
 from flask import Flask, request, g, session
 from datetime import datetime
-from .models import db, SearchLog
+from .models import db, SearchLog, rollups
 from .auth import init_auth, current_user
 from .admin import init_admin
+from .searchlog import SearchLogWriter
+
+# Background writer of the search log, see init_center_deep_webapp()
+search_log_writer = None
 
 def log_search(query, results_count=0, engines_used="", response_time=0):
-    """Log search query to database"""
-    try:
-        log = SearchLog(
-            user_id=current_user.id if current_user and current_user.is_authenticated else None,
-            query=query,
-            timestamp=datetime.utcnow(),
-            response_time=response_time,
-            results_count=results_count,
-            ip_address=request.remote_addr,
-            engines_used=engines_used
-        )
-        db.session.add(log)
-        db.session.commit()
-    except Exception as e:
-        print(f"Error logging search: {e}")
-        db.session.rollback()
+    """Queue search query for the search log (the request never waits on the DB)"""
+    if search_log_writer is None:
+        print("Error logging search: Center Deep is not initialized")
+        return
+    search_log_writer.log(
+        user_id=current_user.id if current_user and current_user.is_authenticated else None,
+        query=query,
+        timestamp=datetime.utcnow(),
+        response_time=response_time,
+        results_count=results_count,
+        ip_address=request.remote_addr,
+        engines_used=engines_used
+    )
 
 def init_center_deep_webapp(app):
     """Initialize Center Deep features in SearXNG webapp"""
@@ -44,6 +45,10 @@ def init_center_deep_webapp(app):
     # Initialize database
     from .models import init_db
     init_db(app)
+
+    # Start the background writer of the search log
+    global search_log_writer
+    search_log_writer = SearchLogWriter.from_env(app, db, SearchLog, rollups=rollups)
     
     # Initialize authentication
     init_auth(app)
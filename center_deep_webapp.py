@@ -13,6 +13,9 @@ from flask_login import LoginManager, UserMixin, login_user, logout_user, login_
 from werkzeug.security import generate_password_hash, check_password_hash
 from functools import wraps
 
+from center_deep.analytics import SearchRollups, search_log_indexes
+from center_deep.searchlog import SearchLogWriter
+
 # Import SearXNG's search functionality
 import sys
 sys.path.insert(0, '/usr/local/center-deep')
@@ -69,6 +72,7 @@ class User(UserMixin, db.Model):
         return check_password_hash(self.password_hash, password)
 
 class SearchLog(db.Model):
+    __table_args__ = search_log_indexes(db)
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
     query = db.Column(db.String(500), nullable=False)
@@ -77,9 +81,13 @@ class SearchLog(db.Model):
     results_count = db.Column(db.Integer)
     ip_address = db.Column(db.String(45))
 
+# Pre-aggregated search statistics, updated by the search log writer
+rollups = SearchRollups(db, SearchLog)
+
 # Create tables
 with app.app_context():
     db.create_all()
+    rollups.init()
     # Create default admin user if not exists
     admin = User.query.filter_by(username='admin').first()
     if not admin:
@@ -88,6 +96,9 @@ with app.app_context():
         db.session.add(admin)
         db.session.commit()
 
+# Background writer of the search log
+search_log_writer = SearchLogWriter.from_env(app, db, SearchLog, rollups=rollups)
+
 @login_manager.user_loader
 def load_user(user_id):
     return User.query.get(int(user_id))
@@ -136,15 +147,13 @@ def search():
     
     # Log the search
     if current_user.is_authenticated:
-        log = SearchLog(
+        search_log_writer.log(
             user_id=current_user.id,
             query=query,
             timestamp=datetime.utcnow(),
             results_count=len(result_container.get_ordered_results()),
             ip_address=request.remote_addr
         )
-        db.session.add(log)
-        db.session.commit()
     
     # Prepare results for Center Deep template
     results = []
@@ -197,7 +206,7 @@ def logout():
 def admin():
     """Admin dashboard"""
     total_users = User.query.count()
-    total_searches = SearchLog.query.count()
+    total_searches = rollups.total_searches()
     recent_searches = SearchLog.query.order_by(SearchLog.timestamp.desc()).limit(10).all()
     
     return render_template('admin.html',
@@ -10,6 +10,7 @@ import warnings
 
 from dataclasses import dataclass
 
+from searx.intent import DispatchStats, first_keyword
 from searx.utils import load_module
 from searx.result_types.answer import BaseAnswer
 
@@ -84,6 +85,12 @@ class ModuleAnswerer(Answerer):
         return AnswererInfo(**kwargs)
 
 
+def _answerer_name(answerer: Answerer) -> str:
+    if isinstance(answerer, ModuleAnswerer):
+        return answerer.module.__name__
+    return answerer.__class__.__module__
+
+
 class AnswerStorage(dict):  # type: ignore
     """A storage for managing the *answerers* of SearXNG.  With the
     :py:obj:`AnswerStorage.ask`” method, a caller can ask questions to all
@@ -92,9 +99,13 @@ class AnswerStorage(dict):  # type: ignore
     answerer_list: set[Answerer]
     """The list of :py:obj:`Answerer` in this storage."""
 
+    stats: DispatchStats
+    """Calls of the answerers (by the module of the answerer)."""
+
     def __init__(self):
         super().__init__()
         self.answerer_list = set()
+        self.stats = DispatchStats()
 
     def load_builtins(self):
         """Loads ``answerer.py`` modules from the python packages in
@@ -147,16 +158,14 @@ class AnswerStorage(dict):  # type: ignore
         as argument to the answerer function."""
 
         results = []
-        keyword = None
-        for keyword in query.split():
-            if keyword:
-                break
-
+        keyword = first_keyword(query)
         if not keyword or keyword not in self:
             return results
 
         for answerer in self[keyword]:
-            for answer in answerer.answer(query):
+            with self.stats.observe(_answerer_name(answerer)):
+                answers = answerer.answer(query)
+            for answer in answers:
                 # In case of *answers* prefix ``answerer:`` is set, see searx.result_types.Result
                 answer.engine = f"answerer: {keyword}"
                 results.append(answer)
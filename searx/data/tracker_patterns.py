@@ -1,21 +1,160 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
-"""Simple implementation to store TrackerPatterns data in a SQL database."""
+"""Simple implementation to store TrackerPatterns data in a SQL database.
+
+The rules are stored in the data cache (:py:obj:`searx.data.core.get_cache`).
+To clean a URL, the rules are compiled into a :py:obj:`TrackerPatternsMatcher`
+which is rebuilt from the database every :py:obj:`MATCHER_MAX_AGE` seconds.
+"""
 
 import typing
 
-__all__ = ["TrackerPatternsDB"]
+__all__ = ["TrackerPatternsDB", "TrackerPatternsMatcher"]
 
 import re
+import time
 from collections.abc import Iterator
-from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
+from urllib.parse import urlunparse, parse_qsl, urlencode
 
 from httpx import HTTPError
 
 from searx.data.core import get_cache, log
 from searx.network import get as http_get
+from searx.regexutils import compile_any, required_literal
+from searx.urls import parse_url
 
 RuleType = tuple[str, list[str], list[str]]
 
+MATCHER_MAX_AGE = 60 * 60
+"""Max. age (sec) of the compiled rules, the rules may have been (re-) loaded
+into the database by another process."""
+
+MIN_LITERAL_LENGTH = 3
+"""Min. length of the literal used to preselect the rules of a URL."""
+
+
+class _InvalidPattern:
+    """Placeholder of a pattern which can't be compiled: matching raises the
+    :py:obj:`re.error` of the pattern (same as an uncompiled ``re.match``)."""
+
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+
+    def match(self, string: str):
+        return re.match(self.pattern, string)
+
+
+def _compile(pattern: str) -> "re.Pattern | _InvalidPattern":
+    try:
+        return re.compile(pattern)
+    except re.error:
+        return _InvalidPattern(pattern)
+
+
+class TrackerPatternsMatcher:
+    """The rules of :py:obj:`TrackerPatternsDB` compiled for
+    :py:obj:`TrackerPatternsDB.clean_url`:
+
+    - The patterns are compiled once.
+    - The rules are bucketed by a literal which is part of every match of the
+      URL pattern of the rule (e.g. ``amazon``), a rule is only tried on URLs
+      which contain its literal.
+    - The exceptions of a rule and the tracker arguments of a rule are combined
+      into one alternation each.
+
+    The rules are applied in the order of the database (a rule sees the URL
+    cleaned by the rules before), the result is the same as applying each
+    regular expression of each rule.
+    """
+
+    def __init__(self, rules: "typing.Iterable[RuleType]"):
+        self.url_regexp: list[re.Pattern | _InvalidPattern] = []
+        self.url_ignore: list[re.Pattern | None] = []
+        self.url_ignore_list: list[list[re.Pattern | _InvalidPattern]] = []
+        self.del_args: list[re.Pattern | None] = []
+        self.del_args_list: list[list[re.Pattern | _InvalidPattern]] = []
+
+        # literal --> indices of the rules
+        self.buckets: dict[str, list[int]] = {}
+        # indices of the rules without a literal
+        self.always: list[int] = []
+
+        for i, (url_regexp, url_ignore, del_args) in enumerate(rules):
+            self.url_regexp.append(_compile(url_regexp))
+            self.url_ignore.append(compile_any(url_ignore))
+            self.url_ignore_list.append([_compile(p) for p in url_ignore])
+            self.del_args.append(compile_any(del_args))
+            self.del_args_list.append([_compile(p) for p in del_args])
+
+            literal = required_literal(url_regexp)
+            if len(literal) >= MIN_LITERAL_LENGTH:
+                self.buckets.setdefault(literal, []).append(i)
+            else:
+                self.always.append(i)
+
+    def __len__(self):
+        return len(self.url_regexp)
+
+    def candidates(self, url: str) -> list[int]:
+        """Indices (in order) of the rules which may match ``url``."""
+        indices = self.always.copy()
+        for literal, bucket in self.buckets.items():
+            if literal in url:
+                indices.extend(bucket)
+        indices.sort()
+        return indices
+
+    def is_ignored(self, i: int, url: str) -> bool:
+        """``True`` if ``url`` matches one of the exceptions of rule ``i``."""
+        combined = self.url_ignore[i]
+        if combined is not None:
+            return combined.match(url) is not None
+        return any(pattern.match(url) for pattern in self.url_ignore_list[i])
+
+    def count_del_args(self, i: int, name: str) -> int:
+        """Number of tracker argument patterns of rule ``i`` which match the
+        argument ``name``."""
+        combined = self.del_args[i]
+        if combined is not None and not combined.match(name):
+            return 0
+        return sum(1 for pattern in self.del_args_list[i] if pattern.match(name))
+
+    def clean_url(self, url: str) -> str:
+        """Returns ``url`` cleaned by the rules."""
+        new_url = url
+        parsed_new_url = parse_url(new_url)
+
+        candidates = self.candidates(new_url)
+        pos = 0
+        while pos < len(candidates):
+            i = candidates[pos]
+            pos += 1
+
+            if not self.url_regexp[i].match(new_url):
+                # no match / ignore pattern
+                continue
+
+            if self.is_ignored(i, new_url):
+                # pattern is in the list of exceptions / ignore pattern
+                continue
+
+            # remove tracker arguments from the url-query part
+            query_args: list[tuple[str, str]] = list(parse_qsl(parsed_new_url.query))
+
+            for name, val in query_args.copy():
+                for _ in range(self.count_del_args(i, name)):
+                    log.debug("TRACKER_PATTERNS: %s remove tracker arg: %s='%s'", parsed_new_url.netloc, name, val)
+                    query_args.remove((name, val))
+
+            parsed_new_url = parsed_new_url._replace(query=urlencode(query_args))
+            cleaned_url = urlunparse(parsed_new_url)
+            if cleaned_url != new_url:
+                # the following rules see the cleaned URL
+                new_url = cleaned_url
+                candidates = [j for j in self.candidates(new_url) if j > i]
+                pos = 0
+
+        return new_url
+
 
 class TrackerPatternsDB:
     # pylint: disable=missing-class-docstring
@@ -37,6 +176,8 @@ class TrackerPatternsDB:
 
     def __init__(self):
         self.cache = get_cache()
+        self._matcher: TrackerPatternsMatcher | None = None
+        self._matcher_time: float = 0
 
     def init(self):
         if self.cache.properties("tracker_patterns loaded") != "OK":
@@ -53,6 +194,7 @@ class TrackerPatternsDB:
             self.add(rule)
 
     def add(self, rule: RuleType):
+        self._matcher = None
         self.cache.set(
             key=rule[self.Fields.url_regexp],
             value=(
@@ -68,6 +210,15 @@ class TrackerPatternsDB:
         for key, value in self.cache.pairs(ctx=self.ctx_name):
             yield key, value[0], value[1]
 
+    def matcher(self) -> TrackerPatternsMatcher:
+        """Returns the compiled rules (rebuilt after :py:obj:`MATCHER_MAX_AGE`
+        seconds)."""
+        matcher = self._matcher
+        if matcher is None or time.time() - self._matcher_time > MATCHER_MAX_AGE:
+            matcher = TrackerPatternsMatcher(self.rules())
+            self._matcher, self._matcher_time = matcher, time.time()
+        return matcher
+
     def iter_clear_list(self) -> Iterator[RuleType]:
         resp = None
         for url in self.CLEAR_LIST_URL:
@@ -103,41 +254,7 @@ class TrackerPatternsDB:
         If URL should be modified, the returned string is the new URL to use.
         """
 
-        new_url = url
-        parsed_new_url = urlparse(url=new_url)
-
-        for rule in self.rules():
-
-            if not re.match(rule[self.Fields.url_regexp], new_url):
-                # no match / ignore pattern
-                continue
-
-            do_ignore = False
-            for pattern in rule[self.Fields.url_ignore]:
-                if re.match(pattern, new_url):
-                    do_ignore = True
-                    break
-
-            if do_ignore:
-                # pattern is in the list of exceptions / ignore pattern
-                # HINT:
-                #    we can't break the outer pattern loop since we have
-                #    overlapping urlPattern like ".*"
-                continue
-
-            # remove tracker arguments from the url-query part
-            query_args: list[tuple[str, str]] = list(parse_qsl(parsed_new_url.query))
-
-            for name, val in query_args.copy():
-                # remove URL arguments
-                for pattern in rule[self.Fields.del_args]:
-                    if re.match(pattern, name):
-                        log.debug("TRACKER_PATTERNS: %s remove tracker arg: %s='%s'", parsed_new_url.netloc, name, val)
-                        query_args.remove((name, val))
-
-            parsed_new_url = parsed_new_url._replace(query=urlencode(query_args))
-            new_url = urlunparse(parsed_new_url)
-
+        new_url = self.matcher().clean_url(url)
         if new_url != url:
             return new_url
 
@@ -255,6 +255,28 @@ class Engine(abc.ABC):  # pylint: disable=too-few-public-methods
     timeout: float
     """Specific timeout for search-engine."""
 
+    max_concurrency: int
+    """Max. number of concurrent jobs of the engine in the engine executor
+    (``0``: no limit), see :py:obj:`searx.search.executor`."""
+
+    hedging: bool
+    """Send a second request when the response is late, see
+    :py:obj:`searx.search.hedge`."""
+
+    hedging_percentile: float
+    """Percentile of the observed HTTP time after which a request is hedged."""
+
+    hedging_max_ratio: float
+    """Max. ratio of hedged requests."""
+
+    response_cache: bool
+    """Cache the results of the engine if the :ref:`response cache
+    <settings search>` is enabled, see :py:obj:`searx.search.response_cache`."""
+
+    response_cache_ttl: int
+    """TTL of the cached results in seconds (``0``: TTL of the response
+    cache)."""
+
     display_error_messages: bool
     """Display error messages on the web UI."""
 
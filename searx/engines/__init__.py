@@ -38,6 +38,12 @@ ENGINE_DEFAULT_ARGS: dict[str, int | str | list[t.Any] | dict[str, t.Any] | bool
     "enable_http": False,
     "shortcut": "-",
     "timeout": settings["outgoing"]["request_timeout"],
+    "max_concurrency": 0,
+    "hedging": False,
+    "hedging_percentile": 90,
+    "hedging_max_ratio": 0.1,
+    "response_cache": True,
+    "response_cache_ttl": 0,
     "display_error_messages": True,
     "disabled": False,
     "inactive": False,
@@ -63,6 +69,25 @@ engine_shortcuts = {}
 """
 
 
+class EngineRanking(t.NamedTuple):
+    """Properties of an engine used to score and group its results."""
+
+    weight: float
+    """:ref:`weight <settings engines>` of the engine (``1.0`` if not set)"""
+
+    category: str
+    """First category of the engine (``''`` if the engine has no category)"""
+
+
+engine_ranking: dict[str, EngineRanking] = {}
+"""Map of the registered engines to their :py:obj:`EngineRanking`, computed
+once by :py:obj:`register_engine` (the scoring in :py:obj:`searx.results` does
+not look up the engine attributes per result).
+
+:meta hide-value:
+"""
+
+
 def check_engine_module(module: types.ModuleType):
     # probe unintentional name collisions / for example name collisions caused
     # by import statements in the engine module ..
@@ -237,11 +262,17 @@ def register_engine(engine: "Engine | types.ModuleType"):
     for category_name in engine.categories:
         categories.setdefault(category_name, []).append(engine)
 
+    engine_ranking[engine.name] = EngineRanking(
+        weight=float(getattr(engine, 'weight', 1.0)),
+        category=engine.categories[0] if len(engine.categories) > 0 else "",
+    )
+
 
 def load_engines(engine_list: list[dict[str, t.Any]]):
     """usage: ``engine_list = settings['engines']``"""
     engines.clear()
     engine_shortcuts.clear()
+    engine_ranking.clear()
     categories.clear()
     categories['general'] = []
     for engine_data in engine_list:
@@ -12,10 +12,7 @@ from urllib.parse import quote_plus
 import babel
 import lxml.html
 
-from searx import (
-    locales,
-    external_bang,
-)
+from searx import locales
 from searx.utils import (
     eval_xpath,
     eval_xpath_getindex,
@@ -231,7 +228,9 @@ def quote_ddg_bangs(query):
     for val in re.split(r'(\s+)', query):
         if not val.strip():
             continue
-        if val.startswith('!') and external_bang.get_node(external_bang.EXTERNAL_BANGS, val[1:]):
+        # quote each "!word": DDG knows bangs which are not (yet) in the
+        # external_bangs.json
+        if val.startswith('!'):
             val = f"'{val}'"
         query_parts.append(val)
     return ' '.join(query_parts)
@@ -1,19 +1,215 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
-# pylint: disable=missing-module-docstring
+"""External bangs (``!!g``) from :origin:`searx/data/external_bangs.json`.
 
-__all__ = ["get_bang_url"]
+The bangs are looked up in a :py:obj:`BangIndex`: a sorted array of the bangs
+serialized in :origin:`searx/data/external_bangs.bin` (built together with the
+JSON file by :py:obj:`searxng_extra.update.update_external_bangs`).  The index
+file is mapped into memory (:py:obj:`mmap.mmap`), nothing has to be parsed on
+first use.  If the index file does not exist, the index is built from the
+JSON file.
+"""
 
+__all__ = ["get_bang_url", "BangIndex", "get_index"]
+
+import mmap
+import struct
+import threading
 import typing as t
+from collections import OrderedDict
 
 from urllib.parse import quote_plus, urlparse
-from searx.data import EXTERNAL_BANGS
+from searx.data import data_dir
 
 LEAF_KEY = chr(16)
 
+INDEX_FILE = data_dir / "external_bangs.bin"
+"""Prebuilt :py:obj:`BangIndex` of the ``external_bangs.json``."""
+
 if t.TYPE_CHECKING:
     from searx.search.models import SearchQuery
 
 
+class BangIndex:
+    """Sorted array of the external bangs (``{bang: bang_definition}``).
+
+    The bangs are sorted by their UTF-8 encoding, a bang is found by binary
+    search and the bangs with a common prefix are a continuous range of the
+    array.  Layout of the (little endian) buffer:
+
+    - header: magic, number of bangs ``N``, number of definitions ``M``
+    - ``uint32[N+1]`` offsets of the bangs in the bangs blob
+    - ``uint32[N]`` definition of each bang
+    - ``uint32[M+1]`` offsets of the definitions in the definitions blob
+    - ``int32[M]`` rank of each definition
+    - bangs blob, definitions blob (UTF-8)
+    """
+
+    MAGIC = b"SXNGBNG1"
+    _HEADER = struct.Struct("<8sII")
+
+    def __init__(self, buffer: bytes | mmap.mmap):
+        magic, self._count, def_count = self._HEADER.unpack_from(buffer, 0)
+        if magic != self.MAGIC:
+            raise ValueError("not a bang index")
+        self._buf = buffer
+        self._key_offsets = self._HEADER.size
+        self._key_defs = self._key_offsets + 4 * (self._count + 1)
+        self._def_offsets = self._key_defs + 4 * self._count
+        self._def_ranks = self._def_offsets + 4 * (def_count + 1)
+        self._keys = self._def_ranks + 4 * def_count
+        self._defs = self._keys + self._uint32(self._key_offsets, self._count)
+
+    @classmethod
+    def load(cls, path) -> "BangIndex":
+        with open(path, "rb") as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    @classmethod
+    def from_trie(cls, trie: dict[str, t.Any]) -> "BangIndex":
+        """Builds the index from the trie of the ``external_bangs.json``."""
+        return cls(cls.build(flatten_trie(trie)))
+
+    @classmethod
+    def build(cls, bangs: dict[str, str]) -> bytes:
+        """Serializes the index of ``bangs`` (``{bang: bang_definition}``)."""
+        items = sorted((bang.encode(), definition) for bang, definition in bangs.items())
+        definitions: dict[str, int] = {}
+        key_defs = [definitions.setdefault(definition, len(definitions)) for _, definition in items]
+        keys = [key for key, _ in items]
+        values = [definition.encode() for definition in definitions]
+
+        def offsets(blobs: list[bytes]) -> list[int]:
+            result = [0]
+            for blob in blobs:
+                result.append(result[-1] + len(blob))
+            return result
+
+        ranks = [resolve_bang_definition(definition, "")[1] for definition in definitions]
+        return b"".join(
+            [
+                cls._HEADER.pack(cls.MAGIC, len(keys), len(values)),
+                struct.pack(f"<{len(keys) + 1}I", *offsets(keys)),
+                struct.pack(f"<{len(keys)}I", *key_defs),
+                struct.pack(f"<{len(values) + 1}I", *offsets(values)),
+                struct.pack(f"<{len(values)}i", *ranks),
+                *keys,
+                *values,
+            ]
+        )
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _uint32(self, table: int, i: int) -> int:
+        return struct.unpack_from("<I", self._buf, table + 4 * i)[0]
+
+    def _key(self, i: int) -> bytes:
+        start, end = struct.unpack_from("<II", self._buf, self._key_offsets + 4 * i)
+        return self._buf[self._keys + start : self._keys + end]
+
+    def _definition(self, i: int) -> str:
+        d = self._uint32(self._key_defs, i)
+        start, end = struct.unpack_from("<II", self._buf, self._def_offsets + 4 * d)
+        return self._buf[self._defs + start : self._defs + end].decode()
+
+    def _rank(self, i: int) -> int:
+        d = self._uint32(self._key_defs, i)
+        return struct.unpack_from("<i", self._buf, self._def_ranks + 4 * d)[0]
+
+    def _bisect(self, key: bytes) -> int:
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def get(self, bang: str) -> str | None:
+        """Returns the definition of the ``bang`` (``None`` if it does not
+        exist)."""
+        key = bang.encode()
+        i = self._bisect(key)
+        if i < self._count and self._key(i) == key:
+            return self._definition(i)
+        return None
+
+    def _range(self, prefix: str) -> range:
+        key = prefix.encode()
+        # 0xff is not part of any UTF-8 sequence
+        return range(self._bisect(key), self._bisect(key + b"\xff"))
+
+    def prefixed(self, prefix: str) -> list[str]:
+        """Returns the bangs which start with ``prefix`` (sorted)."""
+        return [self._key(i).decode() for i in self._range(prefix)]
+
+    def autocomplete(self, prefix: str) -> list[str]:
+        """Returns the bangs which are longer than ``prefix`` and start with
+        ``prefix``, the bangs with the highest rank first."""
+        key = prefix.encode()
+        items = [(-self._rank(i), self._key(i)) for i in self._range(prefix)]
+        items.sort()
+        return [name.decode() for _, name in items if name != key]
+
+
+def flatten_trie(trie: dict[str, t.Any], prefix: str = "") -> dict[str, str]:
+    """Returns the bangs of the ``trie`` (``external_bangs.json``) as
+    ``{bang: bang_definition}``."""
+    bangs = {}
+    for key, value in trie.items():
+        if key == LEAF_KEY:
+            if prefix and isinstance(value, str):
+                bangs[prefix] = value
+        elif isinstance(value, dict):
+            bangs.update(flatten_trie(value, prefix + key))
+        elif isinstance(value, str):
+            bangs[prefix + key] = value
+    return bangs
+
+
+_INDEX: BangIndex | None = None
+
+
+def get_index() -> BangIndex:
+    """Returns the :py:obj:`BangIndex` of the ``external_bangs.json``."""
+    global _INDEX  # pylint: disable=global-statement
+    if _INDEX is None:
+        if INDEX_FILE.exists():
+            _INDEX = BangIndex.load(INDEX_FILE)
+        else:
+            from searx.data import EXTERNAL_BANGS  # pylint: disable=import-outside-toplevel
+
+            _INDEX = BangIndex.from_trie(EXTERNAL_BANGS["trie"])
+    return _INDEX
+
+
+_DB_INDEXES: "OrderedDict[int, tuple[dict[str, t.Any], BangIndex]]" = OrderedDict()
+_DB_INDEXES_MAX = 8
+_DB_INDEXES_LOCK = threading.Lock()
+
+
+def _get_index(external_bangs_db: dict[str, t.Any] | BangIndex | None) -> BangIndex:
+    if external_bangs_db is None:
+        return get_index()
+    if isinstance(external_bangs_db, BangIndex):
+        return external_bangs_db
+    # a dict can't be weak referenced: the index is memoized by the id() of
+    # the db, the entry holds the db (the id can't be reused)
+    key = id(external_bangs_db)
+    with _DB_INDEXES_LOCK:
+        entry = _DB_INDEXES.get(key)
+        if entry is not None and entry[0] is external_bangs_db:
+            _DB_INDEXES.move_to_end(key)
+            return entry[1]
+    index = BangIndex.from_trie(external_bangs_db["trie"])
+    with _DB_INDEXES_LOCK:
+        _DB_INDEXES[key] = (external_bangs_db, index)
+        while len(_DB_INDEXES) > _DB_INDEXES_MAX:
+            _DB_INDEXES.popitem(last=False)
+    return index
+
+
 def get_node(external_bangs_db: dict[str, t.Any], bang: str):
     node = external_bangs_db['trie']
     after = ''
@@ -62,35 +258,20 @@ def resolve_bang_definition(bang_definition: str, query: str) -> tuple[str, int]
 
 
 def get_bang_definition_and_autocomplete(
-    bang: str, external_bangs_db: dict[str, t.Any] | None = None
+    bang: str, external_bangs_db: dict[str, t.Any] | BangIndex | None = None
 ):  # pylint: disable=invalid-name
-    if external_bangs_db is None:
-        external_bangs_db = EXTERNAL_BANGS
-
-    bang_definition, bang_ac_list = get_bang_definition_and_ac(external_bangs_db, bang)
-
-    new_autocomplete = []
-    current = [*bang_ac_list]
-    done = set()
-    while len(current) > 0:
-        bang_ac = current.pop(0)
-        done.add(bang_ac)
+    """Returns the definition of the ``bang`` and the bangs which start with
+    ``bang`` (ordered by rank).  The bangs are looked up in
+    ``external_bangs_db`` (a ``external_bangs.json`` or a :py:obj:`BangIndex`,
+    the index of a JSON db is built once), by default in
+    :py:obj:`get_index`."""
+    index = _get_index(external_bangs_db)
+    return index.get(bang), index.autocomplete(bang)
 
-        current_bang_definition, current_bang_ac_list = get_bang_definition_and_ac(external_bangs_db, bang_ac)
-        if current_bang_definition:
-            _, order = resolve_bang_definition(current_bang_definition, '')
-            new_autocomplete.append((bang_ac, order))
-        for new_bang in current_bang_ac_list:
-            if new_bang not in done and new_bang not in current:
-                current.append(new_bang)
 
-    new_autocomplete.sort(key=lambda t: (-t[1], t[0]))
-    new_autocomplete = list(map(lambda t: t[0], new_autocomplete))
-
-    return bang_definition, new_autocomplete
-
-
-def get_bang_url(search_query: "SearchQuery", external_bangs_db: dict[str, t.Any] | None = None) -> str | None:
+def get_bang_url(
+    search_query: "SearchQuery", external_bangs_db: dict[str, t.Any] | BangIndex | None = None
+) -> str | None:
     """
     Redirects if the user supplied a correct bang search.
     :param search_query: This is a search_query object which contains preferences and the submitted queries.
@@ -98,12 +279,9 @@ def get_bang_url(search_query: "SearchQuery", external_bangs_db: dict[str, t.Any
     """
     ret_val = None
 
-    if external_bangs_db is None:
-        external_bangs_db = EXTERNAL_BANGS
-
     if search_query.external_bang:
-        bang_definition, _ = get_bang_definition_and_ac(external_bangs_db, search_query.external_bang)
-        if bang_definition and isinstance(bang_definition, str):
+        bang_definition = _get_index(external_bangs_db).get(search_query.external_bang)
+        if bang_definition:
             ret_val = resolve_bang_definition(bang_definition, search_query.query)[0]
 
     return ret_val
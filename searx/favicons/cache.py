@@ -24,9 +24,12 @@ import abc
 import dataclasses
 import hashlib
 import logging
+import queue
 import sqlite3
 import tempfile
+import threading
 import time
+from collections import OrderedDict
 import typer
 
 import msgspec
@@ -137,6 +140,27 @@ class FaviconCacheConfig(msgspec.Struct):  # pylint: disable=too-few-public-meth
       if required.
     """
 
+    WRITE_BATCH_SIZE: int = 64
+    """Max. number of favicons written to the DB in one transaction."""
+
+    WRITE_FLUSH_INTERVAL: float = 0.2
+    """Max. time in seconds a favicon waits for further favicons before the
+    batch is written to the DB."""
+
+    WRITE_QUEUE_SIZE: int = 1024
+    """Max. number of favicons waiting to be written, further favicons are not
+    cached."""
+
+    MEM_LIMIT_BYTES: int = 1024 * 1024 * 4  # 4 MB
+    """Maximum of bytes of the favicons held in the memory of the process, in
+    front of the SQLite DB (:py:obj:`FaviconHotCache`).  The least recently
+    used favicons are dropped first, ``0`` disables the in-memory cache."""
+
+    NEGATIVE_TTL: int = 60 * 60  # 1h
+    """Time in seconds a domain without a favicon is held in the memory of the
+    process (:py:obj:`FaviconHotCache`), after which the SQLite DB is asked
+    again."""
+
 
 @dataclasses.dataclass
 class FaviconCacheStats:
@@ -193,6 +217,16 @@ class FaviconCache(abc.ABC):
         registered in the cache.  The ``None`` indicates that there was no entry
         in the cache."""
 
+    def get(self, resolver: str, authority: str) -> None | tuple[None | bytes, None | str, None | str]:
+        """Like :py:obj:`FaviconCache.__call__`, the tuple ``(data, mime,
+        sha256)`` also has the SHA256 (hex) of the data (``None`` if there is
+        no favicon)."""
+        data_mime = self(resolver, authority)
+        if data_mime is None:
+            return None
+        data, mime = data_mime
+        return data, mime, None if data is None else hashlib.sha256(data).hexdigest()
+
     @abc.abstractmethod
     def set(self, resolver: str, authority: str, mime: str | None, data: bytes | None) -> bool:
         """Set data and mime-type in the cache.  If data is None, the
@@ -232,6 +266,68 @@ class FaviconCacheNull(FaviconCache):
         pass
 
 
+@t.final
+class FaviconHotCache:
+    """Byte-bounded LRU of ``(resolver, authority) -> (data, mime, sha256)`` in the
+    memory of the process.  Entries of domains without a favicon (*negative*
+    entries, ``data`` is ``None``) expire after
+    :py:obj:`FaviconCacheConfig.NEGATIVE_TTL`, another process may have found a
+    favicon in the meantime."""
+
+    ENTRY_OVERHEAD = 128
+    """Bytes accounted for the key and the bookkeeping of an entry."""
+
+    def __init__(self, limit_bytes: int, negative_ttl: int):
+        self.limit_bytes = limit_bytes
+        self.negative_ttl = negative_ttl
+        self.bytes_c = 0
+        self._lock = threading.Lock()
+        # key --> (data, mime, sha256, expire, bytes_c)
+        self._items: OrderedDict[tuple[str, str], tuple[bytes | None, str | None, str | None, float, int]] = (
+            OrderedDict()
+        )
+
+    def get(self, resolver: str, authority: str) -> None | tuple[None | bytes, None | str, None | str]:
+        if not self.limit_bytes:
+            return None
+        key = (resolver, authority)
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            data, mime, sha256, expire, bytes_c = item
+            if expire and expire < time.monotonic():
+                del self._items[key]
+                self.bytes_c -= bytes_c
+                return None
+            self._items.move_to_end(key)
+        return data, mime, sha256
+
+    def set(self, resolver: str, authority: str, mime: str | None, data: bytes | None, sha256: str | None):
+        if not self.limit_bytes:
+            return
+        key = (resolver, authority)
+        expire = 0.0
+        if data is None:
+            mime = sha256 = None
+            expire = time.monotonic() + self.negative_ttl
+        bytes_c = len(data or b"") + len(mime or "") + self.ENTRY_OVERHEAD
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.bytes_c -= old[4]
+            if bytes_c > self.limit_bytes:
+                return
+            self._items[key] = (data, mime, sha256, expire, bytes_c)
+            self.bytes_c += bytes_c
+            while self.bytes_c > self.limit_bytes:
+                _, old = self._items.popitem(last=False)
+                self.bytes_c -= old[4]
+
+    def __len__(self):
+        return len(self._items)
+
+
 @t.final
 class FaviconCacheSQLite(sqlitedb.SQLiteAppl, FaviconCache):  # pyright: ignore[reportUnsafeMultipleInheritance]
     """Favicon cache that manages the favicon BLOBs in a SQLite DB.  The DB
@@ -252,10 +348,29 @@ class FaviconCacheSQLite(sqlitedb.SQLiteAppl, FaviconCache):  # pyright: ignore[
     - :py:obj:`FaviconCacheConfig.BLOB_MAX_BYTES`
     - :py:obj:`MAINTENANCE_PERIOD`
     - :py:obj:`MAINTENANCE_MODE`
+    - :py:obj:`FaviconCacheConfig.WRITE_BATCH_SIZE`
+    - :py:obj:`FaviconCacheConfig.WRITE_FLUSH_INTERVAL`
+    - :py:obj:`FaviconCacheConfig.WRITE_QUEUE_SIZE`
+    - :py:obj:`FaviconCacheConfig.MEM_LIMIT_BYTES`
+    - :py:obj:`FaviconCacheConfig.NEGATIVE_TTL`
+
+    Recently used favicons are held in a :py:obj:`FaviconHotCache` in front of
+    the DB, a favicon found in the hot cache needs no DB lookup.
+
+    Favicons are not written in the request which resolved them: :py:obj:`set`
+    puts the favicon in a queue, a background thread (the *writer*) writes the
+    queued favicons in batches on its own (persistent) DB connection.  Until a
+    favicon is written, it is served from the queue.  The writer also runs the
+    maintenance of the cache (``MAINTENANCE_MODE = "auto"``), a request never
+    waits for the maintenance.
     """
 
     DB_SCHEMA = 1
 
+    WRITER_MIN_BACKOFF = 1.0
+    WRITER_MAX_BACKOFF = 60.0
+    """Delay (seconds) before the writer thread retries to open the DB."""
+
     DDL_BLOBS = """\
 CREATE TABLE IF NOT EXISTS blobs (
   sha256     TEXT,
@@ -298,6 +413,13 @@ CREATE TABLE IF NOT EXISTS blob_map (
         " ORDER BY bm.m_time ASC"
     )
 
+    SQL_SELECT_FAVICON = (
+        "SELECT bm.sha256, b.data, b.mime FROM blob_map bm"
+        "  LEFT JOIN blobs b"
+        "    ON b.sha256 = bm.sha256"
+        " WHERE bm.resolver = ? AND bm.authority = ?"
+    )
+
     SQL_INSERT_BLOBS = (
         "INSERT INTO blobs (sha256, bytes_c, mime, data) VALUES (?, ?, ?, ?)"
         "    ON CONFLICT (sha256) DO NOTHING"
@@ -316,31 +438,42 @@ CREATE TABLE IF NOT EXISTS blob_map (
             logger.critical("don't use SQLite DB in :memory: in production!!")
         super().__init__(cfg.db_url)
         self.cfg = cfg
+        self._writer_lock = threading.Lock()
+        self._writer_pid: int = 0
+        self._writer_thread: threading.Thread | None = None
+        self._writer_stop = threading.Event()
+        self._queue: queue.Queue[tuple[str, str, str, bytes | None, str | None]] = queue.Queue()
+        # (resolver, authority) --> (sha256, data, mime) of the queued favicons
+        self._pending: dict[tuple[str, str], tuple[str, bytes | None, str | None]] = {}
+        self.hot = FaviconHotCache(cfg.MEM_LIMIT_BYTES, cfg.NEGATIVE_TTL)
 
     def __call__(self, resolver: str, authority: str) -> None | tuple[None | bytes, None | str]:
+        entry = self.get(resolver, authority)
+        return None if entry is None else entry[:2]
+
+    def get(self, resolver: str, authority: str) -> None | tuple[None | bytes, None | str, None | str]:
+
+        entry = self.hot.get(resolver, authority)
+        if entry is not None:
+            return entry
 
-        sql = "SELECT sha256 FROM blob_map WHERE resolver = ? AND authority = ?"
-        res = self.DB.execute(sql, (resolver, authority)).fetchone()
+        pending = self._pending.get((resolver, authority))
+        if pending is not None:
+            sha256, data, mime = pending
+            return (None, None, None) if sha256 == FALLBACK_ICON else (data, mime, sha256)
+
+        res = self.DB.execute(self.SQL_SELECT_FAVICON, (resolver, authority)).fetchone()
         if res is None:
             return None
 
-        data, mime = (None, None)
-        sha256 = res[0]
-        if sha256 == FALLBACK_ICON:
-            return data, mime
-
-        sql = "SELECT data, mime FROM blobs WHERE sha256 = ?"
-        res = self.DB.execute(sql, (sha256,)).fetchone()
-        if res is not None:
-            data, mime = res
-        return data, mime
+        sha256, data, mime = res
+        if sha256 == FALLBACK_ICON or data is None:
+            sha256, data, mime = (None, None, None)
+        self.hot.set(resolver, authority, mime, data, sha256)
+        return data, mime, sha256
 
     def set(self, resolver: str, authority: str, mime: str | None, data: bytes | None) -> bool:
 
-        if self.cfg.MAINTENANCE_MODE == "auto" and int(time.time()) > self.next_maintenance_time:
-            # Should automatic maintenance be moved to a new thread?
-            self.maintenance()
-
         if data is not None and mime is None:
             logger.error(
                 "favicon resolver %s tries to cache mime-type None for authority %s",
@@ -361,17 +494,146 @@ CREATE TABLE IF NOT EXISTS blob_map (
         else:
             sha256 = hashlib.sha256(data).hexdigest()
 
-        with self.connect() as conn:
-            if sha256 != FALLBACK_ICON:
-                conn.execute(self.SQL_INSERT_BLOBS, (sha256, bytes_c, mime, data))
-            conn.execute(self.SQL_INSERT_BLOB_MAP, (sha256, resolver, authority))
-        # hint: the with context of the connection object closes the transaction
-        # but not the DB connection.  The connection has to be closed by the
-        # caller of self.connect()!
-        conn.close()
-
+        self._start_writer()
+        if self._queue.qsize() >= self.cfg.WRITE_QUEUE_SIZE:
+            logger.debug("write queue is full, favicon of %s / %s is not cached", resolver, authority)
+            return False
+        self.hot.set(resolver, authority, mime, data, sha256)
+        self._pending[(resolver, authority)] = (sha256, data, mime)
+        self._queue.put((sha256, resolver, authority, data, mime))
         return True
 
+    def flush(self):
+        """Blocks until the queued favicons have been written to the DB (or
+        have been dropped, when the DB can't be written)."""
+        self._queue.join()
+
+    def close(self, timeout: float | None = None):
+        """Stops the writer thread, favicons which are still queued are
+        dropped.  A later :py:obj:`set` starts a new writer."""
+        with self._writer_lock:
+            thread = self._writer_thread
+            self._writer_stop.set()
+        if thread is not None:
+            # wake up the writer waiting for the next batch
+            self._queue.put(None)
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def _start_writer(self):
+        pid = os.getpid()
+        if self._writer_pid == pid:
+            return
+        with self._writer_lock:
+            if self._writer_pid == pid:
+                return
+            if self._writer_pid:
+                # forked process: the writer thread of the parent does not
+                # exist in this process
+                self._queue = queue.Queue()
+                self._pending = {}
+            # create the DB schema in this thread, the initialization of the
+            # DB is not thread-safe
+            self.init(self.DB)
+            self._writer_stop = threading.Event()
+            self._writer_thread = threading.Thread(
+                target=self._writer, args=(self._writer_stop,), name="favicons-writer", daemon=True
+            )
+            self._writer_thread.start()
+            self._writer_pid = pid
+
+    def _next_batch(self, timeout: float) -> list[tuple[str, str, str, bytes | None, str | None]]:
+        batch = []
+        deadline = None
+        while len(batch) < self.cfg.WRITE_BATCH_SIZE:
+            if deadline is not None:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if item is None:
+                # wake-up call of close()
+                self._queue.task_done()
+                break
+            batch.append(item)
+            if deadline is None:
+                deadline = time.monotonic() + self.cfg.WRITE_FLUSH_INTERVAL
+        return batch
+
+    def _write(self, conn: sqlite3.Connection, batch: list[tuple[str, str, str, bytes | None, str | None]]):
+        with conn:
+            conn.executemany(
+                self.SQL_INSERT_BLOBS,
+                [(sha256, len(data), mime, data) for sha256, _, _, data, mime in batch if sha256 != FALLBACK_ICON],
+            )
+            conn.executemany(self.SQL_INSERT_BLOB_MAP, [(sha256, res, auth) for sha256, res, auth, _, _ in batch])
+
+    def _done(self, batch: list[tuple[str, str, str, bytes | None, str | None]]):
+        """The favicons of the ``batch`` have been written (or dropped)."""
+        for sha256, resolver, authority, _, _ in batch:
+            key = (resolver, authority)
+            if self._pending.get(key, (None,))[0] == sha256:
+                self._pending.pop(key, None)
+            self._queue.task_done()
+
+    def _drop_queued(self):
+        batch = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.task_done()
+            else:
+                batch.append(item)
+        self._done(batch)
+
+    def _writer(self, stop: threading.Event):
+        """Writes the queued favicons and runs the maintenance (background
+        thread).  If the DB can't be opened, the queued favicons are dropped and
+        the connection is retried with a growing delay."""
+        conn: sqlite3.Connection | None = None
+        backoff = self.WRITER_MIN_BACKOFF
+        next_maintenance = 0
+        try:
+            while not stop.is_set():
+                if conn is None:
+                    try:
+                        conn = self.connect()
+                        backoff = self.WRITER_MIN_BACKOFF
+                    except Exception as e:  # pylint: disable=broad-except
+                        logger.error("favicons writer: can't open DB, retry in %ss: %s", backoff, e)
+                        self._drop_queued()
+                        stop.wait(backoff)
+                        backoff = min(backoff * 2, self.WRITER_MAX_BACKOFF)
+                        continue
+
+                batch = self._next_batch(timeout=1.0)
+                try:
+                    if batch:
+                        self._write(conn, batch)
+                    if self.cfg.MAINTENANCE_MODE == "auto" and time.time() > next_maintenance:
+                        self.maintenance()
+                        next_maintenance = self.next_maintenance_time
+                except Exception as e:  # pylint: disable=broad-except
+                    logger.error("favicons writer: %s", e)
+                    conn.close()
+                    conn = None
+                finally:
+                    self._done(batch)
+        finally:
+            with self._writer_lock:
+                if self._writer_stop is stop:
+                    self._writer_pid = 0
+                    self._writer_thread = None
+            if conn is not None:
+                conn.close()
+            self._drop_queued()
+
     @property
     def next_maintenance_time(self) -> int:
         """Returns (unix epoch) time of the next maintenance."""
@@ -470,6 +732,14 @@ class FaviconCacheMEM(FaviconCache):
             data = None
         return data, mime
 
+    def get(self, resolver: str, authority: str) -> None | tuple[None | bytes, None | str, None | str]:
+        sha, _ = self._sha_mime.get(f"{resolver}:{authority}", (None, None))
+        data_mime = self(resolver, authority)
+        if data_mime is None:
+            return None
+        data, mime = data_mime
+        return data, mime, None if data is None else sha
+
     def set(self, resolver: str, authority: str, mime: str | None, data: bytes | None) -> bool:
 
         if data is None:
@@ -6,6 +6,7 @@ from typing import Callable
 
 import importlib
 import base64
+import hashlib
 import pathlib
 import urllib.parse
 
@@ -123,6 +124,9 @@ def favicon_proxy():
       HMAC :rfc:`2104`, build up from the :ref:`server.secret_key <settings
       server>` setting.
 
+    A favicon is sent with a strong ``ETag`` (SHA256 of the favicon), a request
+    with a matching ``If-None-Match`` header is answered by ``304 Not
+    Modified``.
     """
     authority = sxng_request.args.get('authority')
 
@@ -143,12 +147,15 @@ def favicon_proxy():
     if not resolver or resolver not in CFG.resolver_map.keys():
         return "", 400
 
-    data, mime = search_favicon(resolver, authority)
+    data, mime, sha256 = resolve_favicon(resolver, authority)
 
     if data is not None and mime is not None:
         resp = flask.Response(data, mimetype=mime)  # type: ignore
         resp.headers['Cache-Control'] = f"max-age={CFG.max_age}"
-        return resp
+        # strong ETag: a request with a matching If-None-Match header gets a
+        # "304 Not Modified" without the data
+        resp.set_etag(sha256 or hashlib.sha256(data).hexdigest())
+        return resp.make_conditional(sxng_request)
 
     # return default favicon from static path
     theme = sxng_request.preferences.get_value("theme")  # type: ignore
@@ -168,17 +175,25 @@ def search_favicon(resolver: str, authority: str) -> tuple[None | bytes, None |
       Mime type of the favicon.
 
     """
+    data, mime, _ = resolve_favicon(resolver, authority)
+    return data, mime
+
+
+def resolve_favicon(resolver: str, authority: str) -> tuple[None | bytes, None | str, None | str]:
+    """Like :py:obj:`search_favicon`, the tuple ``(data, mime, sha256)`` also
+    has the SHA256 (hex) of the favicon, taken from the cache (``None`` if
+    there is no favicon or it is not known)."""
 
     data, mime = (None, None)
 
     func = CFG.get_resolver(resolver)
     if func is None:
-        return data, mime
+        return data, mime, None
 
     # to avoid superfluous requests to the resolver, first look in the cache
-    data_mime = cache.CACHE(resolver, authority)
-    if data_mime is not None:
-        return data_mime
+    entry = cache.CACHE.get(resolver, authority)
+    if entry is not None:
+        return entry
 
     try:
         data, mime = func(authority, timeout=CFG.resolver_timeout)
@@ -189,7 +204,7 @@ def search_favicon(resolver: str, authority: str) -> tuple[None | bytes, None |
         pass
 
     cache.CACHE.set(resolver, authority, mime, data)
-    return data, mime
+    return data, mime, None
 
 
 def favicon_url(authority: str) -> str:
@@ -0,0 +1,147 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Dispatch of a search query to the :ref:`answerers <dev answerers>` and
+:ref:`plugins <dev plugin>` which can answer it.
+
+The *intent* of a query (:py:obj:`QueryIntent`) is matched once per query by
+an :py:obj:`IntentMatcher`:
+
+- ``keyword``: the first word of the query, the answerers and the plugins with
+  :py:obj:`keywords <searx.plugins.Plugin.keywords>` are looked up by this
+  word.
+
+- ``triggers``: the names of the :py:obj:`trigger patterns
+  <searx.plugins.Plugin.trigger>` which match the query.  Most patterns
+  contain a literal which is part of every match (:py:obj:`required_literal
+  <searx.regexutils.required_literal>`): the query is scanned once for all
+  these literals and only the patterns whose literal has been found are
+  searched.  Patterns without such a literal are always searched.
+
+The calls of the answerers and plugins are counted in :py:obj:`DispatchStats`
+(number of calls, number of skipped calls and the time spent), the counters
+are exported in the :ref:`open metrics <settings general>` of SearXNG.
+"""
+
+from __future__ import annotations
+
+__all__ = ["first_keyword", "QueryIntent", "IntentMatcher", "DispatchStats"]
+
+import re
+import threading
+import typing as t
+from contextlib import contextmanager
+from timeit import default_timer
+
+from searx.regexutils import required_literal
+
+
+def first_keyword(query: str) -> str | None:
+    """Returns the first word of ``query`` (``None`` if there is none)."""
+    for keyword in query.split(maxsplit=1):
+        return keyword
+    return None
+
+
+class QueryIntent(t.NamedTuple):
+    """The intent of a query, see :py:obj:`IntentMatcher.match`."""
+
+    keyword: str | None
+    """First word of the query."""
+
+    triggers: frozenset[str]
+    """Names of the trigger patterns which match the query."""
+
+
+def _literal(pattern: re.Pattern) -> str:
+    # the flags of the compiled pattern are not part of pattern.pattern
+    if not isinstance(pattern.pattern, str) or pattern.flags & (re.IGNORECASE | re.VERBOSE):
+        return ""
+    return required_literal(pattern.pattern)
+
+
+class _LiteralScanner:
+    """Finds all the ``literals`` in a string in one scan.
+
+    The literals are an alternation in a lookahead, the scan tests every
+    position of the string.  The longest literal is tried first, the other
+    literals which match at the same position are prefixes of it."""
+
+    def __init__(self, literals: t.Iterable[str]):
+        literals = sorted(set(literals), key=len, reverse=True)
+        self.regexp = re.compile("(?=(" + "|".join(re.escape(lit) for lit in literals) + "))")
+        self.prefixes: dict[str, frozenset[str]] = {
+            lit: frozenset(p for p in literals if lit.startswith(p)) for lit in literals
+        }
+
+    def scan(self, string: str) -> set[str]:
+        found: set[str] = set()
+        for m in self.regexp.finditer(string):
+            found.update(self.prefixes[m.group(1)])
+        return found
+
+
+class IntentMatcher:
+    """Matches the :py:obj:`QueryIntent` of a query.
+
+    ``triggers`` maps a name to a pattern, the name is in
+    :py:obj:`QueryIntent.triggers` if :py:obj:`re.search` finds the pattern in
+    the query."""
+
+    def __init__(self, triggers: dict[str, str | re.Pattern] | None = None):
+        self.patterns: dict[str, re.Pattern] = {name: re.compile(p) for name, p in (triggers or {}).items()}
+
+        # {literal: [(name, pattern), ..]}: the patterns which can only match
+        # if the literal is in the query
+        self._by_literal: dict[str, list[tuple[str, re.Pattern]]] = {}
+        self._always: list[tuple[str, re.Pattern]] = []
+        for name, pattern in self.patterns.items():
+            literal = _literal(pattern)
+            if literal:
+                self._by_literal.setdefault(literal, []).append((name, pattern))
+            else:
+                self._always.append((name, pattern))
+        self._scanner = _LiteralScanner(self._by_literal) if self._by_literal else None
+
+    def match(self, query: str) -> QueryIntent:
+        candidates = list(self._always)
+        if self._scanner is not None:
+            for literal in self._scanner.scan(query):
+                candidates.extend(self._by_literal[literal])
+        triggers = frozenset(name for name, pattern in candidates if pattern.search(query))
+        return QueryIntent(first_keyword(query), triggers)
+
+
+class DispatchStats:
+    """Thread-safe counters of the calls of the answerers / plugins:
+    ``{name: {"count": .., "skipped": .., "time": ..}}``."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: dict[str, dict[str, float]] = {}
+
+    def _get(self, name: str) -> dict[str, float]:
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = self._stats[name] = {"count": 0, "skipped": 0, "time": 0.0}
+        return stats
+
+    def skip(self, name: str):
+        """Count a call of ``name`` which has been skipped by the dispatcher."""
+        with self._lock:
+            self._get(name)["skipped"] += 1
+
+    @contextmanager
+    def observe(self, name: str):
+        """Count a call of ``name`` and the time spent in the ``with`` block."""
+        start = default_timer()
+        try:
+            yield
+        finally:
+            duration = default_timer() - start
+            with self._lock:
+                stats = self._get(name)
+                stats["count"] += 1
+                stats["time"] += duration
+
+    def get(self) -> dict[str, dict[str, float]]:
+        with self._lock:
+            return {name: dict(stats) for name, stats in self._stats.items()}
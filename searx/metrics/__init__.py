@@ -97,6 +97,18 @@ def initialize(engine_names: list[str] | None = None, enabled: bool = True) -> N
         counter_storage.configure('engine', engine_name, 'search', 'count', 'successful')
         # global counter of errors
         counter_storage.configure('engine', engine_name, 'search', 'count', 'error')
+        # jobs cancelled in the queue of the engine executor (deadline passed)
+        counter_storage.configure('engine', engine_name, 'search', 'count', 'expired')
+        # hedged requests (see searx.search.hedge)
+        counter_storage.configure('engine', engine_name, 'hedge', 'count', 'sent')
+        counter_storage.configure('engine', engine_name, 'hedge', 'count', 'won')
+        counter_storage.configure('engine', engine_name, 'hedge', 'count', 'skipped')
+        # response cache (see searx.search.response_cache)
+        counter_storage.configure('engine', engine_name, 'cache', 'count', 'hit')
+        counter_storage.configure('engine', engine_name, 'cache', 'count', 'miss')
+        # prefetch of the next page (see searx.search.prefetch)
+        counter_storage.configure('engine', engine_name, 'prefetch', 'count', 'sent')
+        counter_storage.configure('engine', engine_name, 'prefetch', 'count', 'hit')
         # score of the engine
         counter_storage.configure('engine', engine_name, 'score')
         # result count per requests
@@ -106,6 +118,8 @@ def initialize(engine_names: list[str] | None = None, enabled: bool = True) -> N
         # total time
         # .time.request and ...response times may overlap .time.http time.
         histogram_storage.configure(histogram_width, histogram_size, 'engine', engine_name, 'time', 'total')
+        # time waiting in the queue of the engine executor
+        histogram_storage.configure(histogram_width, histogram_size, 'engine', engine_name, 'time', 'queue')
 
 
 def get_engine_errors(engline_name_list):
@@ -172,7 +186,9 @@ def get_reliabilities(engline_name_list, checker_results):
     return reliabilities
 
 
-def get_engines_stats(engine_name_list: list[str]):
+def get_engines_stats(engine_name_list: list[str], timeouts: dict[str, float] | None = None):
+    """Statistics of the engines, ``timeouts`` are the current timeouts of the
+    engines (see :py:obj:`searx.search.timeouts.get_engine_timeouts`)."""
     assert counter_storage is not None
     assert histogram_storage is not None
 
@@ -193,6 +209,9 @@ def get_engines_stats(engine_name_list: list[str]):
         max_time_total = max(time_total or 0, max_time_total or 0)
         max_result_count = max(result_count or 0, max_result_count or 0)
 
+        cache_hit_count = counter('engine', engine_name, 'cache', 'count', 'hit')
+        cache_lookups = cache_hit_count + counter('engine', engine_name, 'cache', 'count', 'miss')
+
         stats = {
             'name': engine_name,
             'total': None,
@@ -204,6 +223,14 @@ def get_engines_stats(engine_name_list: list[str]):
             'processing': None,
             'processing_p80': None,
             'processing_p95': None,
+            'queue': None,
+            'queue_p95': None,
+            'expired_count': counter('engine', engine_name, 'search', 'count', 'expired'),
+            'hedge_sent_count': counter('engine', engine_name, 'hedge', 'count', 'sent'),
+            'hedge_won_count': counter('engine', engine_name, 'hedge', 'count', 'won'),
+            'cache_hit_count': cache_hit_count,
+            'cache_hit_rate': round(100 * cache_hit_count / cache_lookups) if cache_lookups else None,
+            'timeout': (timeouts or {}).get(engine_name),
             'score': 0,
             'score_per_result': 0,
             'result_count': result_count,
@@ -240,6 +267,11 @@ def get_engines_stats(engine_name_list: list[str]):
             stats['processing_p80'] = round(time_total_p80 - time_http_p80, 1)
             stats['processing_p95'] = round(time_total_p95 - time_http_p95, 1)
 
+        time_queue = histogram('engine', engine_name, 'time', 'queue').percentage(50)
+        if time_queue is not None:
+            stats['queue'] = round(time_queue, 1)
+            stats['queue_p95'] = round(histogram('engine', engine_name, 'time', 'queue').percentage(95), 1)
+
         list_time.append(stats)
 
     return {
@@ -249,7 +281,37 @@ def get_engines_stats(engine_name_list: list[str]):
     }
 
 
-def openmetrics(engine_stats, engine_reliabilities):
+def _dispatch_metrics(kind: str, stats: dict[str, dict[str, float]]) -> list[OpenMetricsFamily]:
+    """Metrics of the :py:obj:`searx.intent.DispatchStats` of the ``kind``
+    (``plugin`` or ``answerer``)."""
+    names = sorted(stats)
+    data_info = [{f'{kind}_name': name} for name in names]
+    return [
+        OpenMetricsFamily(
+            key=f"searxng_{kind}s_call_count_total",
+            type_hint="counter",
+            help_hint=f"The total amount of calls of the {kind}",
+            data_info=data_info,
+            data=[stats[name]['count'] for name in names],
+        ),
+        OpenMetricsFamily(
+            key=f"searxng_{kind}s_skipped_count_total",
+            type_hint="counter",
+            help_hint=f"The total amount of queries the {kind} has been skipped for",
+            data_info=data_info,
+            data=[stats[name]['skipped'] for name in names],
+        ),
+        OpenMetricsFamily(
+            key=f"searxng_{kind}s_time_seconds_total",
+            type_hint="counter",
+            help_hint=f"The total time spent in the {kind}",
+            data_info=data_info,
+            data=[round(stats[name]['time'], 6) for name in names],
+        ),
+    ]
+
+
+def openmetrics(engine_stats, engine_reliabilities, plugin_stats=None, answerer_stats=None):
     metrics = [
         OpenMetricsFamily(
             key="searxng_engines_response_time_total_seconds",
@@ -272,6 +334,34 @@ def openmetrics(engine_stats, engine_reliabilities):
             data_info=[{'engine_name': engine['name']} for engine in engine_stats['time']],
             data=[engine['http'] or 0 for engine in engine_stats['time']],
         ),
+        OpenMetricsFamily(
+            key="searxng_engines_response_time_queue_seconds",
+            type_hint="gauge",
+            help_hint="The average time the engine waits in the queue of the engine executor",
+            data_info=[{'engine_name': engine['name']} for engine in engine_stats['time']],
+            data=[engine['queue'] or 0 for engine in engine_stats['time']],
+        ),
+        OpenMetricsFamily(
+            key="searxng_engines_timeout_seconds",
+            type_hint="gauge",
+            help_hint="The current timeout of the engine",
+            data_info=[{'engine_name': engine['name']} for engine in engine_stats['time']],
+            data=[engine['timeout'] or 0 for engine in engine_stats['time']],
+        ),
+        OpenMetricsFamily(
+            key="searxng_engines_hedged_request_count_total",
+            type_hint="counter",
+            help_hint="The total amount of hedged requests made to this engine",
+            data_info=[{'engine_name': engine['name']} for engine in engine_stats['time']],
+            data=[engine['hedge_sent_count'] for engine in engine_stats['time']],
+        ),
+        OpenMetricsFamily(
+            key="searxng_engines_response_cache_hit_count_total",
+            type_hint="counter",
+            help_hint="The total amount of results of this engine taken from the response cache",
+            data_info=[{'engine_name': engine['name']} for engine in engine_stats['time']],
+            data=[engine['cache_hit_count'] for engine in engine_stats['time']],
+        ),
         OpenMetricsFamily(
             key="searxng_engines_result_count_total",
             type_hint="counter",
@@ -300,4 +390,8 @@ def openmetrics(engine_stats, engine_reliabilities):
             ],
         ),
     ]
+    if plugin_stats:
+        metrics += _dispatch_metrics('plugin', plugin_stats)
+    if answerer_stats:
+        metrics += _dispatch_metrics('answerer', answerer_stats)
     return "".join([str(metric) for metric in metrics])
@@ -47,6 +47,10 @@ class Histogram:  # pylint: disable=missing-class-docstring
     def count(self):
         return self._count
 
+    @property
+    def width(self):
+        return self._width
+
     @property
     def sum(self):
         return self._sum
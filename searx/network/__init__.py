@@ -31,6 +31,13 @@ def reset_time_for_thread():
     THREADLOCAL.total_time = 0
 
 
+def add_time_for_thread(duration: float):
+    """Add ``duration`` to thread's total time (if the total time is recorded),
+    used when a HTTP request has been awaited outside of the thread."""
+    if hasattr(THREADLOCAL, 'total_time'):
+        THREADLOCAL.total_time += duration
+
+
 def get_time_for_thread():
     """returns thread's total time or None"""
     return THREADLOCAL.__dict__.get('total_time')
@@ -37,6 +37,19 @@ PROXY_PATTERN_MAPPING = {
 ADDRESS_MAPPING = {'ipv4': '0.0.0.0', 'ipv6': '::'}
 
 
+class Hedge(t.Protocol):
+    """Hedging of a request, see :py:obj:`Network.request_hedged`"""
+
+    delay: float
+    """Seconds to wait for a response before a second request is sent."""
+
+    def acquire(self) -> bool:
+        """Returns ``True`` if the second request may be sent."""
+
+    def won(self) -> None:
+        """Called when the response of the second request wins."""
+
+
 @t.final
 class Network:
 
@@ -299,8 +312,39 @@ class Network:
             retries -= 1
 
     async def request(self, method: str, url: str, **kwargs):
+        hedge: "Hedge | None" = kwargs.pop('hedge', None)
+        if hedge is not None:
+            return await self.request_hedged(hedge, method, url, **kwargs)
         return await self.call_client(False, method, url, **kwargs)
 
+    async def request_hedged(self, hedge: "Hedge", method: str, url: str, **kwargs):
+        """Send a request, if there is no response after ``hedge.delay`` seconds
+        (and ``hedge.acquire()`` allows it) a second request is sent.  The
+        second request is sent through the next proxy / local address of the
+        cycles (see :py:obj:`Network.get_client`).  The first response wins,
+        the other request is cancelled."""
+        first = asyncio.ensure_future(self.call_client(False, method, url, **kwargs))
+        tasks = {first}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedge.delay)
+            if done or not hedge.acquire():
+                return await first
+            second = asyncio.ensure_future(self.call_client(False, method, url, **kwargs))
+            tasks.add(second)
+            while True:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is second:
+                            hedge.won()
+                        return task.result()
+                # a failed request loses as long as the other one is pending
+                if not tasks:
+                    return done.pop().result()
+        finally:
+            for task in tasks:
+                task.cancel()
+
     async def stream(self, method: str, url: str, **kwargs):
         return await self.call_client(True, method, url, **kwargs)
 
@@ -15,6 +15,7 @@ from collections.abc import Sequence
 from dataclasses import dataclass, field
 
 from searx.extended_types import SXNG_Request
+from searx.intent import DispatchStats, IntentMatcher
 from searx.result_types import Result
 
 if typing.TYPE_CHECKING:
@@ -80,6 +81,14 @@ class Plugin(abc.ABC):
     of the search query, the list of keywords should be empty (which is also the
     default in the base class for Plugins)."""
 
+    trigger: str | re.Pattern | None = None
+    """Regular expression which must be found in the search query
+    (:py:obj:`re.search`) to run :py:obj:`Plugin.post_search`.  A plugin which
+    answers only a certain kind of query (e.g. a mathematical expression) should
+    set a trigger, the query is matched against the triggers of all plugins at
+    once (:py:obj:`searx.intent.IntentMatcher`).  If the value is ``None``
+    (default) the plugin is not filtered by a trigger."""
+
     log: logging.Logger
     """A logger object, is automatically initialized when calling the
     constructor (if not already set in the subclass)."""
@@ -193,8 +202,13 @@ class PluginStorage:
     plugin_list: set[Plugin]
     """The list of :py:obj:`Plugins` in this storage."""
 
+    stats: DispatchStats
+    """Calls of :py:obj:`Plugin.post_search` per plugin ID."""
+
     def __init__(self):
         self.plugin_list = set()
+        self.stats = DispatchStats()
+        self._matcher: IntentMatcher | None = None
 
     def __iter__(self):
         yield from self.plugin_list
@@ -237,6 +251,7 @@ class PluginStorage:
             raise KeyError(msg)
 
         self.plugin_list.add(plugin)
+        self._matcher = None
         plugin.log.debug("plugin has been loaded")
 
     def init(self, app: "flask.Flask") -> None:
@@ -247,6 +262,33 @@ class PluginStorage:
         for plg in self.plugin_list.copy():
             if not plg.init(app):
                 self.plugin_list.remove(plg)
+        self._matcher = None
+
+    @property
+    def matcher(self) -> IntentMatcher:
+        """The :py:obj:`IntentMatcher` of the triggers of the plugins (built on
+        first use)."""
+        if self._matcher is None:
+            self._matcher = IntentMatcher({p.id: p.trigger for p in self.plugin_list if p.trigger is not None})
+        return self._matcher
+
+    def dispatch(self, query: str, plugin_ids: typing.Container[str]) -> list[Plugin]:
+        """Returns the plugins (from ``plugin_ids``) whose :py:obj:`keywords
+        <Plugin.keywords>` and :py:obj:`trigger <Plugin.trigger>` match the
+        ``query``.  The query is matched once for all plugins."""
+        intent = self.matcher.match(query)
+        plugins = []
+        for plugin in self.plugin_list:
+            if plugin.id not in plugin_ids:
+                continue
+            # plugin with keywords: skip plugin if no keyword match
+            if (plugin.keywords and intent.keyword and intent.keyword not in plugin.keywords) or (
+                plugin.trigger is not None and plugin.id not in intent.triggers
+            ):
+                self.stats.skip(plugin.id)
+                continue
+            plugins.append(plugin)
+        return plugins
 
     def pre_search(self, request: SXNG_Request, search: "SearchWithPlugins") -> bool:
 
@@ -283,19 +325,10 @@ class PluginStorage:
         in :py:obj:`search.user_plugins <SearchWithPlugins.user_plugins>`.
         """
 
-        keyword = None
-        for keyword in search.search_query.query.split():
-            if keyword:
-                break
-
-        for plugin in [p for p in self.plugin_list if p.id in search.user_plugins]:
-
-            if plugin.keywords:
-                # plugin with keywords: skip plugin if no keyword match
-                if keyword and keyword not in plugin.keywords:
-                    continue
+        for plugin in self.dispatch(search.search_query.query, search.user_plugins):
             try:
-                results = plugin.post_search(request=request, search=search) or []
+                with self.stats.observe(plugin.id):
+                    results = plugin.post_search(request=request, search=search) or []
             except Exception:  # pylint: disable=broad-except
                 plugin.log.exception("Exception while calling post_search")
                 continue
@@ -1,18 +1,38 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
-"""Calculate mathematical expressions using :py:obj:`ast.parse` (mode="eval")."""
+"""Calculate mathematical expressions using :py:obj:`ast.parse` (mode="eval").
+
+An expression is evaluated
+
+- in the process of the search, if its AST contains only numbers, constants
+  and operators with a bounded runtime (no ``**`` and no ``<<``), see
+  :py:obj:`is_trivial`.
+
+- otherwise, in an :py:obj:`EvaluatorPool`: a small pool of pre-forked worker
+  processes.  An evaluation which exceeds the deadline (:py:obj:`TIMEOUT`) is
+  aborted, the stuck worker is killed and replaced by a new one.
+
+The results are memoized in a LRU cache (:py:obj:`CACHE_SIZE`), an expression
+which has exceeded the deadline is not evaluated again.
+"""
 
 import typing
 
 import ast
 import math
+import os
+import queue
 import re
 import operator
 import multiprocessing
+import threading
+from collections import OrderedDict
+from multiprocessing.connection import Connection
 
 import babel
 import babel.numbers
 from flask_babel import gettext
 
+from searx import logger
 from searx.result_types import EngineResults
 from searx.plugins import Plugin, PluginInfo
 
@@ -38,22 +58,11 @@ class SXNGPlugin(Plugin):
             description=gettext("Calculate mathematical expressions via the search bar"),
             preference_section="general",
         )
-
-    def timeout_func(self, timeout, func, *args, **kwargs):
-        que = mp_fork.Queue()
-        p = mp_fork.Process(target=handler, args=(que, func, args), kwargs=kwargs)
-        p.start()
-        p.join(timeout=timeout)
-        ret_val = None
-        # pylint: disable=used-before-assignment,undefined-variable
-        if not p.is_alive():
-            ret_val = que.get()
-        else:
-            self.log.debug("terminate function (%s: %s // %s) after timeout is exceeded", func.__name__, args, kwargs)
-            p.terminate()
-        p.join()
-        p.close()
-        return ret_val
+        # a term that can be calculated contains a number or a constant, the
+        # "x" is replaced by "*" (see post_search)
+        letter = r"[^\W\d_x]"
+        constants = "|".join(re.escape(c) for c in math_constants)
+        self.trigger = re.compile(rf"\d|(?<!{letter})(?:{constants})(?!{letter})")
 
     def post_search(self, request: "SXNG_Request", search: "SearchWithPlugins") -> EngineResults:
         results = EngineResults()
@@ -103,7 +112,7 @@ class SXNGPlugin(Plugin):
         query_py_formatted = query.replace("^", "**")
 
         # Prevent the runtime from being longer than 50 ms
-        res = self.timeout_func(0.05, _eval_expr, query_py_formatted)
+        res = evaluate(query_py_formatted)
         if res is None or res[0] == "":
             return results
 
@@ -225,9 +234,190 @@ def _eval(node):
     raise TypeError(node)
 
 
-def handler(q: multiprocessing.Queue, func, args, **kwargs):  # pylint:disable=invalid-name
+log = logger.getChild("plugins.calculator")
+
+TIMEOUT = 0.05
+"""Deadline (sec) of an evaluation in the :py:obj:`EvaluatorPool`."""
+
+POOL_SIZE = 2
+"""Number of worker processes of the :py:obj:`EvaluatorPool`."""
+
+MAX_TASKS_PER_WORKER = 1000
+"""A worker process is replaced after this number of evaluations."""
+
+CACHE_SIZE = 1024
+"""Max. number of expressions in the LRU cache of :py:obj:`evaluate`."""
+
+# the runtime of these operators is bounded by the length of the expression
+_TRIVIAL_OPS = tuple(op for op in operators if op not in (ast.Pow, ast.LShift, ast.Compare))
+_UNKNOWN = object()
+
+
+def is_trivial(node: ast.AST) -> bool:
+    """``True`` if the expression ``node`` can be evaluated in the process of
+    the search (no operator with an unbounded runtime like ``9**9**9``)."""
+    if isinstance(node, ast.Expression):
+        return is_trivial(node.body)
+    if isinstance(node, ast.Constant):
+        return isinstance(node.value, (int, float))
+    if isinstance(node, ast.Name):
+        return node.id in math_constants
+    if isinstance(node, ast.BinOp):
+        return isinstance(node.op, _TRIVIAL_OPS) and is_trivial(node.left) and is_trivial(node.right)
+    if isinstance(node, ast.UnaryOp):
+        return isinstance(node.op, _TRIVIAL_OPS) and is_trivial(node.operand)
+    if isinstance(node, ast.Compare):
+        return is_trivial(node.left) and all(is_trivial(c) for c in node.comparators)
+    return False
+
+
+def _safe_eval_expr(expr: str):
     try:
-        q.put(func(*args, **kwargs))
-    except:
-        q.put(None)
-        raise
+        return _eval_expr(expr)
+    except Exception:  # pylint: disable=broad-except
+        # e.g. an operator which is not implemented
+        return None
+
+
+def _worker_main(conn: Connection):
+    """Main loop of a worker process of the :py:obj:`EvaluatorPool`."""
+    while True:
+        try:
+            expr = conn.recv()
+        except (EOFError, OSError):
+            return
+        conn.send(_safe_eval_expr(expr))
+
+
+class _Worker:
+    """A worker process and the connection to it."""
+
+    def __init__(self):
+        self.conn, child_conn = mp_fork.Pipe()
+        self.process = mp_fork.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.tasks = 0
+
+    def close(self):
+        self.conn.close()
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.process.close()
+
+
+class EvaluatorPool:
+    """Pool of pre-forked worker processes which evaluate expressions with a
+    deadline."""
+
+    def __init__(self, size: int = POOL_SIZE, max_tasks: int = MAX_TASKS_PER_WORKER):
+        self.pid = os.getpid()
+        self.max_tasks = max_tasks
+        self._idle: queue.Queue[_Worker] = queue.Queue()
+        for _ in range(size):
+            self._idle.put(_Worker())
+
+    def evaluate(self, expr: str, timeout: float = TIMEOUT):
+        """Evaluates ``expr`` in a worker process.  Returns the result of
+        :py:obj:`_eval_expr`, ``None`` if the expression can't be evaluated or
+        exceeds the deadline.  Raises :py:obj:`queue.Empty` if there is no
+        idle worker in time."""
+        worker = self._idle.get(timeout=timeout)
+        recycle = True
+        try:
+            worker.conn.send(expr)
+            if not worker.conn.poll(timeout):
+                log.debug("terminate evaluation of %s after timeout is exceeded", expr)
+                return None
+            result = worker.conn.recv()
+            recycle = False
+            return result
+        except (EOFError, OSError) as exc:
+            log.debug("worker failed to evaluate %s: %s", expr, exc)
+            return None
+        finally:
+            worker.tasks += 1
+            if recycle or worker.tasks >= self.max_tasks:
+                worker.close()
+                worker = _Worker()
+            self._idle.put(worker)
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+_POOL: EvaluatorPool | None = None
+_POOL_LOCK = threading.Lock()
+
+
+def get_pool() -> EvaluatorPool:
+    """Returns the :py:obj:`EvaluatorPool` of this process (created on first
+    use, a forked process does not use the pool of its parent)."""
+    global _POOL  # pylint: disable=global-statement
+    with _POOL_LOCK:
+        if _POOL is None or _POOL.pid != os.getpid():
+            _POOL = EvaluatorPool()
+        return _POOL
+
+
+class _LRUCache:
+    """Thread-safe LRU cache of the evaluated expressions."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: OrderedDict[str, typing.Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            value = self._data.get(key, _UNKNOWN)
+            if value is not _UNKNOWN:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+CACHE = _LRUCache(CACHE_SIZE)
+
+
+def evaluate(expr: str):
+    """Evaluates the (Python formatted) expression ``expr``, returns the
+    result of :py:obj:`_eval_expr` or ``None`` if the expression can't be
+    evaluated in time."""
+    result = CACHE.get(expr)
+    if result is not _UNKNOWN:
+        return result
+
+    try:
+        tree = ast.parse(expr, mode='eval')
+    except SyntaxError:
+        result = ("", False)
+    else:
+        if is_trivial(tree):
+            # fast path, no IPC
+            result = _safe_eval_expr(expr)
+        else:
+            try:
+                result = get_pool().evaluate(expr)
+            except queue.Empty:
+                # all workers are busy, don't cache
+                log.debug("no idle worker to evaluate %s", expr)
+                return None
+
+    CACHE.set(expr, result)
+    return result
@@ -50,6 +50,11 @@ PluginStorage (it is not available for selection).
 If the URL matches the pattern of ``high_priority`` AND ``low_priority``, the
 higher priority wins over the lower priority.
 
+The patterns of each list are compiled into one :py:obj:`HostnameRules`
+matcher, the hostname of a URL is looked up in one pass over all patterns of
+the list.  If a hostname matches more than one pattern of ``replace``, the
+first pattern wins.
+
 Alternatively, you can also specify a file name for the **mappings** or
 **lists** to load these from an external file:
 
@@ -83,13 +88,15 @@ something like this:
 import typing as t
 
 import re
-from urllib.parse import urlunparse, urlparse
+from urllib.parse import urlunparse
 
 from flask_babel import gettext  # pyright: ignore[reportUnknownVariableType]
 
 from searx import settings
 from searx.result_types._base import MainResult, LegacyResult
+from searx.regexutils import compile_any
 from searx.settings_loader import get_yaml_cfg
+from searx.urls import parse_url
 from searx.plugins import Plugin, PluginInfo
 
 from ._core import log
@@ -101,10 +108,118 @@ if t.TYPE_CHECKING:
     from searx.result_types import Result
     from searx.plugins import PluginCfg
 
-REPLACE: dict[re.Pattern, str] = {}
-REMOVE: set = set()
-HIGH: set = set()
-LOW: set = set()
+# "(.*\.)?example\.com$", "^(.*\.)?example\.com$", "example\.com$", ..
+_PLAIN_DOMAIN_RE = re.compile(r"^(\^?)(\(\.\*\\\.\)\?)?((?:[a-zA-Z0-9_-]+\\\.)*[a-zA-Z0-9_-]+)\$$")
+
+
+class HostnameRule(t.NamedTuple):
+    """A rule of the hostnames plugin."""
+
+    pattern: re.Pattern
+    """Regular expression of the hostnames"""
+
+    replacement: str | None
+    """New hostname (``hostnames.replace``)"""
+
+
+class HostnameRules:
+    """Matches a hostname against a list of rules in one pass:
+
+    - Patterns of plain domains like ``(.*\\.)?example\\.com$`` are stored in a
+      trie of the reversed domain names (a suffix trie of the hostname).
+    - The other patterns are combined into one alternation, only if the
+      alternation matches, the patterns are tested one by one to find the
+      first matching rule.
+
+    :py:obj:`HostnameRules.match` returns the same rule as testing the
+    patterns of the rules in their order with :py:obj:`re.Pattern.search`.
+    """
+
+    def __init__(self, rules: "dict[str, str | None] | list[str] | None" = None):
+        if isinstance(rules, list):
+            rules = dict.fromkeys(rules)
+        rules = rules or {}
+
+        self.rules: list[HostnameRule] = [HostnameRule(re.compile(p), r) for p, r in rules.items()]
+        # reversed domain --> .. --> {"": index of the rule}
+        self._trie: dict[str, t.Any] = {}
+        # hostname --> index of the rule
+        self._exact: dict[str, int] = {}
+        # (index, pattern, tested by the alternation)
+        self._regexes: list[tuple[int, re.Pattern, bool]] = []
+
+        regexes: list[tuple[int, re.Pattern]] = []
+        for index, rule in enumerate(self.rules):
+            m = _PLAIN_DOMAIN_RE.match(rule.pattern.pattern)
+            if m is None or rule.pattern.flags & re.IGNORECASE:
+                regexes.append((index, rule.pattern))
+                continue
+            anchored, prefix, domain = m.group(1), m.group(2), m.group(3).replace("\\.", ".")
+            if not anchored:
+                # re.search: the hostname ends with the domain
+                self._add_suffix(domain, index)
+            else:
+                self._exact.setdefault(domain, index)
+                if prefix:
+                    self._add_suffix("." + domain, index)
+
+        combinable = {pattern.pattern for _, pattern in regexes if compile_any([pattern.pattern])}
+        self._combined = compile_any(p.pattern for _, p in regexes if p.pattern in combinable)
+        for index, pattern in regexes:
+            in_combined = self._combined is not None and pattern.pattern in combinable
+            self._regexes.append((index, pattern, in_combined))
+
+    def _add_suffix(self, suffix: str, index: int):
+        node = self._trie
+        for char in reversed(suffix):
+            node = node.setdefault(char, {})
+        node.setdefault("", index)
+
+    def __bool__(self):
+        return bool(self.rules)
+
+    def match(self, hostname: str) -> HostnameRule | None:
+        """Returns the first rule whose pattern matches ``hostname`` (or
+        ``None``)."""
+        if not self.rules:
+            return None
+        if "\n" in hostname:
+            # "$" also matches before a trailing newline
+            for rule in self.rules:
+                if rule.pattern.search(hostname):
+                    return rule
+            return None
+
+        best: int | None = self._exact.get(hostname)
+        node = self._trie
+        for char in reversed(hostname):
+            node = node.get(char)
+            if node is None:
+                break
+            index = node.get("")
+            if index is not None and (best is None or index < best):
+                best = index
+
+        combined_match = self._combined is not None and self._combined.search(hostname) is not None
+        for index, pattern, in_combined in self._regexes:
+            if best is not None and index > best:
+                break
+            if in_combined and not combined_match:
+                continue
+            if pattern.search(hostname):
+                best = index
+                break
+
+        return None if best is None else self.rules[best]
+
+
+REPLACE = HostnameRules()
+REMOVE = HostnameRules()
+HIGH = HostnameRules()
+LOW = HostnameRules()
+
+# the settings REPLACE, REMOVE, HIGH and LOW have been built from
+_LOADED: tuple | None = None
 
 
 class SXNGPlugin(Plugin):
@@ -123,42 +238,44 @@ class SXNGPlugin(Plugin):
 
     def on_result(self, request: "SXNG_Request", search: "SearchWithPlugins", result: "Result") -> bool:
 
-        for pattern in REMOVE:
-            if result.parsed_url and pattern.search(result.parsed_url.netloc):
+        if result.parsed_url:
+            rule = REMOVE.match(result.parsed_url.netloc)
+            if rule:
                 # if the link (parsed_url) of the result match, then remove the
                 # result from the result list, in any other case, the result
                 # remains in the list / see final "return True" below.
-                # log.debug("FIXME: remove [url/parsed_url] %s %s", pattern.pattern, result.url)
+                log.debug("hostnames: remove %s (rule %s)", result.url, rule.pattern.pattern)
                 return False
 
         result.filter_urls(filter_url_field)
 
-        if isinstance(result, (MainResult, LegacyResult)):
-            for pattern in LOW:
-                if result.parsed_url and pattern.search(result.parsed_url.netloc):
-                    result.priority = "low"
+        if isinstance(result, (MainResult, LegacyResult)) and result.parsed_url:
+            if LOW.match(result.parsed_url.netloc):
+                result.priority = "low"
 
-            for pattern in HIGH:
-                if result.parsed_url and pattern.search(result.parsed_url.netloc):
-                    result.priority = "high"
+            if HIGH.match(result.parsed_url.netloc):
+                result.priority = "high"
 
         return True
 
     def init(self, app: "flask.Flask") -> bool:  # pylint: disable=unused-argument
-        global REPLACE, REMOVE, HIGH, LOW  # pylint: disable=global-statement
+        global REPLACE, REMOVE, HIGH, LOW, _LOADED  # pylint: disable=global-statement
 
         if not settings.get(self.id):
             # Remove plugin, if there isn't a "hostnames:" setting
             return False
 
-        REPLACE = self._load_regular_expressions("replace") or {}  # type: ignore
-        REMOVE = self._load_regular_expressions("remove") or set()  # type: ignore
-        HIGH = self._load_regular_expressions("high_priority") or set()  # type: ignore
-        LOW = self._load_regular_expressions("low_priority") or set()  # type: ignore
+        loaded = tuple(
+            self._load_regular_expressions(key) for key in ("replace", "remove", "high_priority", "low_priority")
+        )
+        if loaded != _LOADED:
+            # the matchers are only rebuilt if the settings have been changed
+            REPLACE, REMOVE, HIGH, LOW = (HostnameRules(value) for value in loaded)  # type: ignore
+            _LOADED = loaded
 
         return True
 
-    def _load_regular_expressions(self, settings_key) -> dict[re.Pattern, str] | set | None:
+    def _load_regular_expressions(self, settings_key) -> dict[str, str] | list[str] | None:
         setting_value = settings.get(self.id, {}).get(settings_key)
 
         if not setting_value:
@@ -169,10 +286,10 @@ class SXNGPlugin(Plugin):
             setting_value = get_yaml_cfg(setting_value)
 
         if isinstance(setting_value, list):
-            return {re.compile(r) for r in setting_value}
+            return list(setting_value)
 
         if isinstance(setting_value, dict):
-            return {re.compile(p): r for (p, r) in setting_value.items()}
+            return dict(setting_value)
 
         return None
 
@@ -185,16 +302,19 @@ def filter_url_field(result: "Result|LegacyResult", field_name: str, url_src: st
         log.debug("missing a URL in field %s", field_name)
         return True
 
-    url_src_parsed = urlparse(url=url_src)
+    if field_name == "url" and result.parsed_url and url_src == result.url:
+        # the link of the result has already been parsed
+        url_src_parsed = result.parsed_url
+    else:
+        url_src_parsed = parse_url(url_src)
 
-    for pattern in REMOVE:
-        if pattern.search(url_src_parsed.netloc):
-            return False
+    if REMOVE.match(url_src_parsed.netloc):
+        return False
 
-    for pattern, replacement in REPLACE.items():
-        if pattern.search(url_src_parsed.netloc):
-            new_url = url_src_parsed._replace(netloc=pattern.sub(replacement, url_src_parsed.netloc))
-            new_url = urlunparse(new_url)
-            return new_url
+    rule = REPLACE.match(url_src_parsed.netloc)
+    if rule:
+        new_url = url_src_parsed._replace(netloc=rule.pattern.sub(rule.replacement, url_src_parsed.netloc))
+        new_url = urlunparse(new_url)
+        return new_url
 
     return True
@@ -49,6 +49,8 @@ class SXNGPlugin(Plugin):
             description=gettext("Convert between units"),
             preference_section="general",
         )
+        # one of the parts of the query is a convert keyword (see post_search)
+        self.trigger = re.compile(f"(?:^| )(?:{'|'.join(CONVERT_KEYWORDS)})(?: |$)")
 
     def post_search(self, request: "SXNG_Request", search: "SearchWithPlugins") -> EngineResults:
         results = EngineResults()
@@ -0,0 +1,87 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Helpers to match large sets of regular expressions, see
+:py:obj:`searx.data.tracker_patterns` and the :ref:`hostnames plugin`.
+
+The functions analyze the parsed pattern (:py:mod:`re._parser`), they never
+change the result of a match: a pattern which can't be analyzed is left as it
+is.
+"""
+
+__all__ = ["compile_any", "required_literal"]
+
+import re
+from collections.abc import Iterable
+
+try:
+    from re import _parser as sre_parse  # type: ignore
+    from re import _constants as sre_constants  # type: ignore
+except ImportError:  # Python < 3.11
+    import sre_parse  # type: ignore  # pylint: disable=deprecated-module
+    import sre_constants  # type: ignore  # pylint: disable=deprecated-module
+
+
+def compile_any(patterns: Iterable[str]) -> re.Pattern | None:
+    """Compiles ``patterns`` into one alternation: ``alternation.match(s)``
+    (``alternation.search(s)``) matches if any of the patterns matches ``s``.
+    Returns ``None`` if there are no patterns or if the patterns can't be
+    combined (backreferences, global flags, duplicate group names, ..)."""
+    patterns = list(patterns)
+    if not patterns:
+        return None
+    try:
+        for pattern in patterns:
+            parsed = sre_parse.parse(pattern)
+            # global flags would apply to all the patterns
+            if parsed.state.flags & ~re.UNICODE or _has_groupref(parsed):
+                return None
+        return re.compile("|".join(f"(?:{pattern})" for pattern in patterns))
+    except (re.error, RecursionError):
+        return None
+
+
+def _has_groupref(value) -> bool:
+    if isinstance(value, sre_parse.SubPattern):
+        return any(
+            op in (sre_constants.GROUPREF, sre_constants.GROUPREF_EXISTS) or _has_groupref(av) for op, av in value
+        )
+    if isinstance(value, (tuple, list)):
+        return any(_has_groupref(v) for v in value)
+    return False
+
+
+def _literals(items, found: list[str]):
+    """Collects literal strings which are part of every match of the parsed
+    pattern ``items``."""
+    run: list[str] = []
+    for op, av in items:
+        if op is sre_constants.LITERAL:
+            run.append(chr(av))
+            continue
+        if run:
+            found.append("".join(run))
+            run = []
+        if op is sre_constants.SUBPATTERN:
+            _group, add_flags, _del_flags, sub = av
+            if not add_flags & re.IGNORECASE:
+                _literals(sub, found)
+        elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+            lo, _hi, sub = av
+            if lo >= 1:
+                _literals(sub, found)
+    if run:
+        found.append("".join(run))
+
+
+def required_literal(pattern: str) -> str:
+    """Returns the longest literal string which is contained in every match of
+    ``pattern``.  Returns an empty string if there is no such literal (or the
+    pattern can't be parsed)."""
+    try:
+        parsed = sre_parse.parse(pattern)
+    except (re.error, RecursionError):
+        return ""
+    if parsed.state.flags & re.IGNORECASE:
+        return ""
+    found: list[str] = []
+    _literals(parsed, found)
+    return max(found, key=len, default="")
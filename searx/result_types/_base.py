@@ -31,6 +31,7 @@ from collections.abc import Callable
 import msgspec
 
 from searx import logger as log
+from searx.urls import normalize_parsed_url, normalize_url, parse_url
 
 WHITESPACE_REGEX = re.compile('( |\t|\n)+', re.M | re.U)
 UNKNOWN = object()
@@ -41,21 +42,17 @@ def _normalize_url_fields(result: "Result | LegacyResult"):
     # As soon we need LegacyResult not any longer, we can move this function to
     # method Result.normalize_result_fields
 
+    # if the result has no scheme, use http as default (see searx.urls)
     if result.url and not result.parsed_url:
         if not isinstance(result.url, str):
             log.debug('result: invalid URL: %s', str(result))
             result.url = ""
             result.parsed_url = None
         else:
-            result.parsed_url = urllib.parse.urlparse(result.url)
+            result.parsed_url, result.url = normalize_url(result.url)
 
-    if result.parsed_url:
-        result.parsed_url = result.parsed_url._replace(
-            # if the result has no scheme, use http as default
-            scheme=result.parsed_url.scheme or "http",
-            path=result.parsed_url.path,
-        )
-        result.url = result.parsed_url.geturl()
+    elif result.parsed_url:
+        result.parsed_url, result.url = normalize_parsed_url(result.parsed_url)
 
     if isinstance(result, LegacyResult) and getattr(result, "infobox", None):
         # As soon we have InfoboxResult, we can move this function to method
@@ -66,21 +63,11 @@ def _normalize_url_fields(result: "Result | LegacyResult"):
             _url = item.get("url")
             if not _url:
                 continue
-            _url = urllib.parse.urlparse(_url)
-            item["url"] = _url._replace(
-                scheme=_url.scheme or "http",
-                # netloc=_url.netloc.replace("www.", ""),
-                path=_url.path,
-            ).geturl()
+            item["url"] = normalize_url(_url)[1]
 
         infobox_id: str | None = getattr(result, "id", None)
         if infobox_id:
-            _url = urllib.parse.urlparse(infobox_id)
-            result.id = _url._replace(
-                scheme=_url.scheme or "http",
-                # netloc=_url.netloc.replace("www.", ""),
-                path=_url.path,
-            ).geturl()
+            result.id = normalize_url(infobox_id)[1]
 
 
 def _normalize_text_fields(result: "MainResult | LegacyResult"):
@@ -143,7 +130,7 @@ def _filter_urls(
             if not new_url:
                 result.parsed_url = None
             elif isinstance(new_url, str):
-                result.parsed_url = urllib.parse.urlparse(new_url)
+                result.parsed_url = parse_url(new_url)
 
     # "urls": are from infobox
     #
@@ -12,6 +12,7 @@ import searx.engines
 from searx.metrics import histogram_observe, counter_add
 from searx.result_types import Result, LegacyResult, MainResult
 from searx.result_types.answer import AnswerSet, BaseAnswer
+from searx.urls import normalize_parsed_url
 
 
 def calculate_score(
@@ -21,8 +22,9 @@ def calculate_score(
     weight = 1.0
 
     for result_engine in result['engines']:
-        if hasattr(searx.engines.engines.get(result_engine), 'weight'):
-            weight *= float(searx.engines.engines[result_engine].weight)
+        ranking = searx.engines.engine_ranking.get(result_engine)
+        if ranking is not None:
+            weight *= ranking.weight
 
     weight *= len(result['positions'])
     score = 0
@@ -38,6 +40,46 @@ def calculate_score(
     return score
 
 
+def calculate_scores(results: list[MainResult | LegacyResult]) -> list[float]:
+    """Returns the scores of ``results``, same values as
+    :py:obj:`calculate_score` for each result.
+
+    Batch scoring for large result sets: the engine weights are taken from
+    :py:obj:`searx.engines.engine_ranking` and the weight of each engine
+    combination is computed only once.  The additions are done in the same
+    order as in :py:obj:`calculate_score` to get bit-identical scores.
+    """
+    ranking = searx.engines.engine_ranking
+    # engines of a result (in iteration order) --> product of their weights
+    weights: dict[tuple[str, ...], float] = {}
+    scores: list[float] = []
+
+    for result in results:
+        result_engines = tuple(result['engines'])
+        weight = weights.get(result_engines)
+        if weight is None:
+            weight = 1.0
+            for result_engine in result_engines:
+                engine_ranking = ranking.get(result_engine)
+                if engine_ranking is not None:
+                    weight *= engine_ranking.weight
+            weights[result_engines] = weight
+
+        positions = result['positions']
+        weight *= len(positions)
+        priority = result.priority
+        score = 0
+        if priority == 'high':
+            for _ in positions:
+                score += weight
+        elif priority != 'low':
+            for position in positions:
+                score += weight / position
+        scores.append(score)
+
+    return scores
+
+
 class Timing(t.NamedTuple):
     engine: str
     total: float
@@ -52,7 +94,19 @@ class UnresponsiveEngine(t.NamedTuple):
 
 class ResultContainer:
     """In the result container, the results are collected, sorted and duplicates
-    will be merged."""
+    will be merged.
+
+    With ``staging`` (:ref:`settings search` ``result_staging``) the main
+    results and infoboxes of each engine are appended to a buffer of the
+    engine, without taking the lock of the container.  The buffers are merged
+    in one loop by :py:obj:`ResultContainer.close`.  Staging is bypassed while
+    a :py:obj:`on_extend` listener is set, the listener needs the merged
+    results.
+
+    The ``on_extend`` listener is called with the lock of the container held:
+    the results in the delta can be merged by other engine threads, the
+    listener has to serialize (or copy) them before it returns.
+    """
 
     # pylint: disable=too-many-statements
 
@@ -62,7 +116,7 @@ class ResultContainer:
     answers: AnswerSet
     corrections: set[str]
 
-    def __init__(self):
+    def __init__(self, staging: bool = False):
         self.main_results_map = {}
         self.infoboxes = []
         self.suggestions = set()
@@ -77,8 +131,12 @@ class ResultContainer:
         self.timings: list[Timing] = []
         self.redirect_url: str | None = None
         self.on_result: t.Callable[[Result | LegacyResult], bool] = lambda _: True
+        self.on_extend: t.Callable[[str | None, dict[str, list[t.Any]]], None] | None = None
         self._lock: RLock = RLock()
         self._main_results_sorted: list[MainResult | LegacyResult] = None  # type: ignore
+        self._staging: bool = staging
+        # engine name --> [(main result, position) or (infobox, None), ..]
+        self._staged: dict[str | None, list[tuple[LegacyResult | MainResult, int | None]]] = {}
 
     def extend(
         self, engine_name: str | None, results: list[Result | LegacyResult]
@@ -87,6 +145,12 @@ class ResultContainer:
             log.debug("container is closed, ignoring results: %s", results)
             return
         main_count = 0
+        # results added (or updated by a merge) in this call, see on_extend
+        delta: dict[str, list[t.Any]] = defaultdict(list)
+        staged = None
+        if self._staging and self.on_extend is None:
+            # dict.setdefault is atomic, the buffer is owned by the engine
+            staged = self._staged.setdefault(engine_name, [])
 
         for result in list(results):
 
@@ -98,9 +162,13 @@ class ResultContainer:
 
                 if isinstance(result, BaseAnswer):
                     self.answers.add(result)
+                    delta["answers"].append(result)
                 elif isinstance(result, MainResult):
                     main_count += 1
-                    self._merge_main_result(result, main_count)
+                    if staged is not None:
+                        staged.append((result, main_count))
+                    else:
+                        delta["results"].append(self._merge_main_result(result, main_count))
                 else:
                     # more types need to be implemented in the future ..
                     raise NotImplementedError(f"no handler implemented to process the result of type {result}")
@@ -113,6 +181,7 @@ class ResultContainer:
                 if "suggestion" in result:
                     if self.on_result(result):
                         self.suggestions.add(result["suggestion"])
+                        delta["suggestions"].append(result["suggestion"])
                     continue
 
                 if "answer" in result:
@@ -123,16 +192,22 @@ class ResultContainer:
                             DeprecationWarning,
                         )
                         self.answers.add(result)  # type: ignore
+                        delta["answers"].append(result)
                     continue
 
                 if "correction" in result:
                     if self.on_result(result):
                         self.corrections.add(result["correction"])
+                        delta["corrections"].append(result["correction"])
                     continue
 
                 if "infobox" in result:
-                    if self.on_result(result):
-                        self._merge_infobox(result)
+                    if not self.on_result(result):
+                        continue
+                    if staged is not None:
+                        staged.append((result, None))
+                    else:
+                        delta["infoboxes"].append(self._merge_infobox(result))
                     continue
 
                 if "number_of_results" in result:
@@ -148,7 +223,10 @@ class ResultContainer:
 
                 if self.on_result(result):
                     main_count += 1
-                    self._merge_main_result(result, main_count)
+                    if staged is not None:
+                        staged.append((result, main_count))
+                    else:
+                        delta["results"].append(self._merge_main_result(result, main_count))
                     continue
 
         if engine_name in searx.engines.engines:
@@ -157,20 +235,25 @@ class ResultContainer:
             if not self.paging and eng.paging:
                 self.paging = True
 
-    def _merge_infobox(self, new_infobox: LegacyResult):
-        add_infobox = True
+        if self.on_extend is not None and delta:
+            # no merge while the listener reads the results
+            with self._lock:
+                self.on_extend(engine_name, delta)
 
+    def _merge_infobox(self, new_infobox: LegacyResult) -> LegacyResult:
+        """Returns the infobox in the container which contains ``new_infobox``."""
         new_id = getattr(new_infobox, "id", None)
         if new_id is not None:
             with self._lock:
                 for existing_infobox in self.infoboxes:
                     if new_id == getattr(existing_infobox, "id", None):
                         merge_two_infoboxes(existing_infobox, new_infobox)
-                        add_infobox = False
-        if add_infobox:
-            self.infoboxes.append(new_infobox)
+                        return existing_infobox
+        self.infoboxes.append(new_infobox)
+        return new_infobox
 
-    def _merge_main_result(self, result: MainResult | LegacyResult, position: int):
+    def _merge_main_result(self, result: MainResult | LegacyResult, position: int) -> MainResult | LegacyResult:
+        """Returns the result in the container which contains ``result``."""
         result_hash = hash(result)
 
         with self._lock:
@@ -180,17 +263,33 @@ class ResultContainer:
                 # if there is no duplicate in the merged results, append result
                 result.positions = [position]
                 self.main_results_map[result_hash] = result
-                return
+                return result
 
             merge_two_main_results(merged, result)
             # add the new position
             merged.positions.append(position)
+            return merged
+
+    def _merge_staged(self):
+        """Merges the buffers of the engines (staging) into the container."""
+        # results of engines which are still running go to a new buffer and
+        # are ignored (the container is closed)
+        staged, self._staged = self._staged, {}
+        with self._lock:
+            for buffer in staged.values():
+                for result, position in buffer:
+                    if position is None:
+                        self._merge_infobox(result)  # type: ignore
+                    else:
+                        self._merge_main_result(result, position)
 
     def close(self):
         self._closed = True
+        self._merge_staged()
 
-        for result in self.main_results_map.values():
-            result.score = calculate_score(result, result.priority)
+        results = list(self.main_results_map.values())
+        for result, score in zip(results, calculate_scores(results)):
+            result.score = score
             for eng_name in result.engines:
                 counter_add(result.score, 'engine', eng_name, 'score')
 
@@ -208,46 +307,16 @@ class ResultContainer:
         results = sorted(self.main_results_map.values(), key=lambda x: x.score, reverse=True)
 
         # pass 2 : group results by category and template
-        gresults: list[MainResult | LegacyResult] = []
-        categoryPositions: dict[str, t.Any] = {}
-        max_count = 8
-        max_distance = 20
-
         for res in results:
             # do we need to handle more than one category per engine?
-            engine = searx.engines.engines.get(res.engine or "")
-            if engine:
-                res.category = engine.categories[0] if len(engine.categories) > 0 else ""
+            ranking = searx.engines.engine_ranking.get(res.engine or "")
+            if ranking is not None:
+                res.category = ranking.category
 
-            # do we need to handle more than one category per engine?
-            category = f"{res.category}:{res.template}:{'img_src' if (res.thumbnail or res.img_src) else ''}"
-            grp = categoryPositions.get(category)
-
-            # group with previous results using the same category, if the group
-            # can accept more result and is not too far from the current
-            # position
-
-            if (grp is not None) and (grp["count"] > 0) and (len(gresults) - grp["index"] < max_distance):
-                # group with the previous results using the same category with
-                # this one
-                index = grp["index"]
-                gresults.insert(index, res)
-
-                # update every index after the current one (including the
-                # current one)
-                for item in categoryPositions.values():
-                    v = item["index"]
-                    if v >= index:
-                        item["index"] = v + 1
-
-                # update this category
-                grp["count"] -= 1
-
-            else:
-                gresults.append(res)
-                # update categoryIndex
-                categoryPositions[category] = {"index": len(gresults), "count": max_count}
-                continue
+        gresults = group_results(
+            results,
+            key=lambda res: f"{res.category}:{res.template}:{'img_src' if (res.thumbnail or res.img_src) else ''}",
+        )
 
         self._main_results_sorted = gresults
         return self._main_results_sorted
@@ -294,6 +363,62 @@ class ResultContainer:
             return self.timings
 
 
+def group_results(
+    results: list[t.Any], key: t.Callable[[t.Any], str], max_count: int = 8, max_distance: int = 20
+) -> list[t.Any]:
+    """Groups the (sorted) ``results`` by category (``key``).
+
+    A result is moved up to the previous results of its category, if the group
+    can accept more results (``max_count``) and is not too far from the current
+    position (less than ``max_distance`` results have been placed behind the
+    group).  Otherwise the result is appended and starts a new group of its
+    category.
+
+    The grouped list is a sequence of *blocks*, each block is the first result
+    of a group followed by the results moved up to it.  The blocks are collected
+    separately and concatenated at the end, the number of results behind a
+    block is taken from a Fenwick tree of the block sizes: O(n log n) instead
+    of a list insert and an update of all group positions per result.
+    """
+
+    blocks: list[list[t.Any]] = []
+    # Fenwick tree (1-based) of the block sizes
+    tree = [0] * (len(results) + 1)
+    # category --> [block index, remaining count]
+    groups: dict[str, list[int]] = {}
+
+    def _add(i: int):
+        i += 1
+        while i < len(tree):
+            tree[i] += 1
+            i += i & -i
+
+    def _prefix(i: int) -> int:
+        # number of results in the blocks 0..i
+        i += 1
+        total = 0
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    for count, res in enumerate(results):
+        category = key(res)
+        grp = groups.get(category)
+
+        if (grp is not None) and (grp[1] > 0) and (count - _prefix(grp[0]) < max_distance):
+            # group with the previous results using the same category
+            blocks[grp[0]].append(res)
+            grp[1] -= 1
+            _add(grp[0])
+        else:
+            groups[category] = [len(blocks), max_count]
+            _add(len(blocks))
+            blocks.append([res])
+
+    return [res for block in blocks for res in block]
+
+
 def merge_two_infoboxes(origin: LegacyResult, other: LegacyResult):
     """Merges the values from ``other`` into ``origin``."""
     # pylint: disable=too-many-branches
@@ -377,5 +502,6 @@ def merge_two_main_results(origin: MainResult | LegacyResult, other: MainResult
     # use https, ftps, .. if possible
     if origin.parsed_url and not origin.parsed_url.scheme.endswith("s"):
         if other.parsed_url and other.parsed_url.scheme.endswith("s"):
-            origin.parsed_url = origin.parsed_url._replace(scheme=other.parsed_url.scheme)
-            origin.url = origin.parsed_url.geturl()
+            origin.parsed_url, origin.url = normalize_parsed_url(
+                origin.parsed_url._replace(scheme=other.parsed_url.scheme)
+            )
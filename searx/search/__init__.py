@@ -7,8 +7,8 @@
 import typing as t
 
 import threading
+import concurrent.futures
 from timeit import default_timer
-from uuid import uuid4
 
 from flask import copy_current_request_context
 
@@ -23,6 +23,12 @@ from searx.network import initialize as initialize_network, check_network_config
 from searx.results import ResultContainer
 from searx.search.checker import initialize as initialize_checker
 from searx.search.processors import PROCESSORS, initialize as initialize_processors
+import searx.search.fanout
+import searx.search.prefetch
+import searx.search.singleflight
+from searx.search.executor import get_executor
+import searx.search.timeouts
+from searx.search.timeouts import get_engine_timeout, get_search_timeout
 
 
 if t.TYPE_CHECKING:
@@ -44,6 +50,7 @@ def initialize(
     if check_network:
         check_network_configuration()
     initialize_metrics([engine['name'] for engine in settings_engines], enable_metrics)
+    searx.search.timeouts.reset()
     initialize_processors(settings_engines)
     if enable_checker:
         initialize_checker()
@@ -59,7 +66,7 @@ class Search:
         # init vars
         super().__init__()
         self.search_query: "SearchQuery" = search_query
-        self.result_container: ResultContainer = ResultContainer()
+        self.result_container: ResultContainer = ResultContainer(staging=settings['search']['result_staging'])
         self.start_time: float | None = None
         self.actual_timeout: float | None = None
 
@@ -108,25 +115,12 @@ class Search:
             requests.append((engineref.name, self.search_query.query, request_params))
 
             # update default_timeout
-            default_timeout = max(default_timeout, processor.engine.timeout)
+            default_timeout = max(default_timeout, get_engine_timeout(engineref.name))
 
         # adjust timeout
         max_request_timeout = settings['outgoing']['max_request_timeout']
-        actual_timeout = default_timeout
         query_timeout = self.search_query.timeout_limit
-
-        if max_request_timeout is None and query_timeout is None:
-            # No max, no user query: default_timeout
-            pass
-        elif max_request_timeout is None and query_timeout is not None:
-            # No max, but user query: From user query except if above default
-            actual_timeout = min(default_timeout, query_timeout)
-        elif max_request_timeout is not None and query_timeout is None:
-            # Max, no user query: Default except if above max
-            actual_timeout = min(default_timeout, max_request_timeout)
-        elif max_request_timeout is not None and query_timeout is not None:
-            # Max & user query: From user query except if above max
-            actual_timeout = min(query_timeout, max_request_timeout)
+        actual_timeout = get_search_timeout(default_timeout, query_timeout)
 
         logger.debug(
             "actual_timeout={0} (default_timeout={1}, ?timeout_limit={2}, max_request_timeout={3})".format(
@@ -137,39 +131,75 @@ class Search:
         return requests, actual_timeout
 
     def search_multiple_requests(self, requests: list[tuple[str, str, dict[str, t.Any]]]):
-        # pylint: disable=protected-access
-        search_id = str(uuid4())
+        if settings['search']['fanout'] == 'asyncio':
+            self.search_multiple_requests_asyncio(requests)
+            return
 
+        executor = get_executor()
+        deadline = self.start_time + self.actual_timeout
+        jobs = []
         for engine_name, query, request_params in requests:
             _search = copy_current_request_context(PROCESSORS[engine_name].search)
-            th = threading.Thread(  # pylint: disable=invalid-name
-                target=_search,
-                args=(query, request_params, self.result_container, self.start_time, self.actual_timeout),
-                name=search_id,
+            timed_out = threading.Event()
+            future = executor.submit(
+                engine_name,
+                deadline,
+                timed_out,
+                _search,
+                query,
+                request_params,
+                self.result_container,
+                self.start_time,
+                self.actual_timeout,
             )
-            th._timeout = False
-            th._engine_name = engine_name
-            th.start()
-
-        for th in threading.enumerate():  # pylint: disable=invalid-name
-            if th.name == search_id:
-                remaining_time = max(0.0, self.actual_timeout - (default_timer() - self.start_time))
-                th.join(remaining_time)
-                if th.is_alive():
-                    th._timeout = True
-                    self.result_container.add_unresponsive_engine(th._engine_name, 'timeout')
-                    PROCESSORS[th._engine_name].logger.error('engine timeout')
-
-    def search_standard(self):
-        """
-        Update self.result_container, self.actual_timeout
-        """
+            jobs.append((engine_name, future, timed_out))
+
+        remaining_time = max(0.0, deadline - default_timer())
+        concurrent.futures.wait([future for _, future, _ in jobs], timeout=remaining_time)
+        for engine_name, future, timed_out in jobs:
+            if not future.done():
+                # still queued or running: cancel it or, if the engine is
+                # already running, drop its late results
+                timed_out.set()
+                future.cancel()
+                processor = PROCESSORS[engine_name]
+                processor.handle_exception(self.result_container, 'timeout', None)
+                processor.logger.error('engine timeout')
+                searx.search.timeouts.observe(engine_name, self.actual_timeout)
+
+    def search_multiple_requests_asyncio(self, requests: list[tuple[str, str, dict[str, t.Any]]]):
+        remaining_time = max(0.0, self.actual_timeout - (default_timer() - self.start_time))
+        timed_out = searx.search.fanout.search_multiple_requests(
+            requests, self.result_container, self.start_time, self.actual_timeout, remaining_time
+        )
+        for engine_name in timed_out:
+            processor = PROCESSORS[engine_name]
+            processor.handle_exception(self.result_container, 'timeout', None)
+            processor.logger.error('engine timeout')
+            searx.search.timeouts.observe(engine_name, self.actual_timeout)
+
+    def search_engines(self):
+        """Send the requests of the engines, update self.result_container and
+        self.actual_timeout"""
         requests, self.actual_timeout = self._get_requests()
 
         # send all search-request
         if requests:
             self.search_multiple_requests(requests)
 
+    def search_standard(self):
+        """
+        Update self.result_container, self.actual_timeout
+        """
+        if settings['search']['single_flight'] and self.result_container.on_extend is None:
+            # share the engine requests with identical searches
+            searx.search.singleflight.search_engines(self)
+        else:
+            self.search_engines()
+
+        # prefetch the next page (if enabled)
+        searx.search.prefetch.schedule(self.search_query, self.result_container)
+
         # return results, suggestions, answers and infoboxes
         return True
 
@@ -0,0 +1,160 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Process-wide executor of the engine work.
+
+All searches share one :py:obj:`EngineExecutor`, a fixed-size pool of threads
+(``search.fanout_pool_size``).  A traffic spike queues up work in the pool
+instead of multiplying the number of threads by the number of engines.
+
+By default (``fanout_pool_size: 0``) the size of the pool is derived from the
+number of engines (:py:obj:`default_pool_size`), a search never waits
+for a thread unless :py:obj:`POOL_SIZE_PER_ENGINE` searches with all the
+engines run at the same time.
+
+- Per-engine concurrency cap: an engine never has more than
+  ``max_concurrency`` jobs in the pool (engine setting, ``0`` means no cap).
+  Jobs above the cap wait in a per-engine queue and do not hold a thread.
+
+- Deadline: each job has the deadline of its search.  A job which is still
+  queued when the deadline has passed is cancelled and never runs.
+
+- Queue time: the time a job waits before it starts is recorded in the
+  histogram ``('engine', <name>, 'time', 'queue')`` of :py:mod:`searx.metrics`,
+  cancelled jobs are counted in ``('engine', <name>, 'search', 'count',
+  'expired')``.
+
+While a job runs, its pool thread is marked with the ``timed_out`` event of the
+job, see :py:obj:`EngineProcessor.extend_container
+<searx.search.processors.abstract.EngineProcessor.extend_container>`.
+"""
+
+from __future__ import annotations
+
+import typing as t
+
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from timeit import default_timer
+
+from searx import logger, settings
+from searx.engines import engines
+from searx.metrics import counter_inc, histogram_observe
+
+logger = logger.getChild('search.executor')
+
+POOL_SIZE_PER_ENGINE = 4
+"""Threads of the default pool per engine."""
+
+MIN_POOL_SIZE = 32
+"""Min. number of threads of the default pool."""
+
+
+class EngineWork:
+    """A job of an engine in the :py:obj:`EngineExecutor`."""
+
+    __slots__ = 'engine_name', 'deadline', 'timed_out', 'func', 'args', 'future', 'submit_time'
+
+    def __init__(self, engine_name: str, deadline: float, timed_out: threading.Event, func, args):
+        self.engine_name = engine_name
+        self.deadline = deadline
+        self.timed_out = timed_out
+        self.func = func
+        self.args = args
+        self.future: Future = Future()
+        self.submit_time = default_timer()
+
+
+class EngineExecutor:
+    """Fixed-size thread pool with per-engine concurrency caps."""
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='engine')
+        self._lock = threading.Lock()
+        self._running: dict[str, int] = defaultdict(int)
+        self._waiting: dict[str, deque[EngineWork]] = defaultdict(deque)
+
+    @staticmethod
+    def max_concurrency(engine_name: str) -> int:
+        engine = engines.get(engine_name)
+        return getattr(engine, 'max_concurrency', 0) or 0
+
+    def submit(self, engine_name: str, deadline: float, timed_out: threading.Event, func, *args) -> Future:
+        """Schedule ``func(*args)`` for the engine ``engine_name``.  Returns a
+        :py:obj:`concurrent.futures.Future`, a job can be cancelled as long as
+        it has not started."""
+        work = EngineWork(engine_name, deadline, timed_out, func, args)
+        limit = self.max_concurrency(engine_name)
+        with self._lock:
+            if limit and self._running[engine_name] >= limit:
+                self._waiting[engine_name].append(work)
+                return work.future
+            self._running[engine_name] += 1
+        self._pool.submit(self._run, work)
+        return work.future
+
+    def _run(self, work: EngineWork):
+        try:
+            self._run_work(work)
+        finally:
+            self._next(work.engine_name)
+
+    def _run_work(self, work: EngineWork):
+        now = default_timer()
+        if now > work.deadline:
+            # the search does not wait anymore
+            work.future.cancel()
+        if not work.future.set_running_or_notify_cancel():
+            counter_inc('engine', work.engine_name, 'search', 'count', 'expired')
+            return
+        histogram_observe(now - work.submit_time, 'engine', work.engine_name, 'time', 'queue')
+
+        thread = threading.current_thread()
+        thread._timeout_event = work.timed_out  # pylint: disable=protected-access
+        try:
+            work.future.set_result(work.func(*work.args))
+        except BaseException as e:  # pylint: disable=broad-except
+            work.future.set_exception(e)
+        finally:
+            thread._timeout_event = None  # pylint: disable=protected-access
+
+    def _next(self, engine_name: str):
+        """Start the next queued job of the engine (if any), the slot of the
+        finished job is handed over."""
+        with self._lock:
+            waiting = self._waiting[engine_name]
+            if not waiting:
+                self._running[engine_name] -= 1
+                return
+            work = waiting.popleft()
+        self._pool.submit(self._run, work)
+
+    def stats(self) -> dict[str, t.Any]:
+        with self._lock:
+            return {
+                'max_workers': self.max_workers,
+                'running': {name: count for name, count in self._running.items() if count},
+                'waiting': {name: len(waiting) for name, waiting in self._waiting.items() if waiting},
+            }
+
+
+_EXECUTOR: EngineExecutor | None = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def default_pool_size() -> int:
+    """Returns the size of the pool when ``search.fanout_pool_size`` is not
+    set: :py:obj:`POOL_SIZE_PER_ENGINE` threads per engine (at least
+    :py:obj:`MIN_POOL_SIZE`).  Engines which are disabled by default can be
+    enabled in the preferences, all the loaded engines are counted."""
+    return max(MIN_POOL_SIZE, POOL_SIZE_PER_ENGINE * len(engines))
+
+
+def get_executor() -> EngineExecutor:
+    """Returns the process-wide :py:obj:`EngineExecutor` (created on first
+    use)."""
+    global _EXECUTOR  # pylint: disable=global-statement
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = EngineExecutor(settings['search']['fanout_pool_size'] or default_pool_size())
+        return _EXECUTOR
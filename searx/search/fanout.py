@@ -0,0 +1,112 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Asyncio fan-out of the engine requests (``search.fanout: asyncio``).
+
+With the default fan-out (``threads``) the search of each engine runs in a
+thread of the :py:obj:`engine executor <searx.search.executor>`, from the
+engine's HTTP request to the parsed results.  With the *asyncio* fan-out the
+requests of a search are run on the loop of :py:mod:`searx.network`:
+
+- An ``online`` engine is a coroutine (:py:obj:`OnlineProcessor.search_async
+  <searx.search.processors.online.OnlineProcessor.search_async>`), its HTTP
+  request is awaited on the loop and does not block a thread.  Only
+  ``engine.request`` and ``engine.response`` (CPU-bound) are run in the
+  engine executor.
+
+- The other processors (``offline`` engines, ..) are run in the engine
+  executor.
+
+The search waits for all its engines with a single deadline (the
+``actual_timeout`` of the search).  Engines which have not answered by then
+are cancelled: HTTP requests in flight are aborted and jobs which wait in the
+engine executor are dropped.
+"""
+
+from __future__ import annotations
+
+import typing as t
+
+import asyncio
+import threading
+
+from flask import copy_current_request_context, has_request_context
+
+from searx import logger
+from searx.network import get_loop
+from searx.search.executor import get_executor
+from searx.search.processors import PROCESSORS
+from searx.search.processors.online import OnlineProcessor
+
+if t.TYPE_CHECKING:
+    from searx.results import ResultContainer
+
+logger = logger.getChild('search.fanout')
+
+
+class EngineJob:
+    """The work of one engine in a search.
+
+    Functions of the engine are run in the :py:obj:`engine executor
+    <searx.search.executor.EngineExecutor>` by :py:obj:`run_sync`, in a copy
+    of the Flask request context of the search.
+    """
+
+    def __init__(self, engine_name: str, query: str, params: dict[str, t.Any], deadline: float):
+        self.engine_name = engine_name
+        self.query = query
+        self.params = params
+        self.deadline = deadline
+        self.timed_out = threading.Event()
+        self._call = self._call_in_context
+        if has_request_context():
+            self._call = copy_current_request_context(self._call_in_context)
+
+    @staticmethod
+    def _call_in_context(func, args):
+        return func(*args)
+
+    async def run_sync(self, func, *args):
+        """Run ``func(*args)`` in the engine executor and await its result."""
+        future = get_executor().submit(self.engine_name, self.deadline, self.timed_out, self._call, func, args)
+        return await asyncio.wrap_future(future)
+
+    async def search(self, result_container: ResultContainer, start_time: float, timeout_limit: float):
+        processor = PROCESSORS[self.engine_name]
+        if isinstance(processor, OnlineProcessor):
+            await processor.search_async(
+                self.query, self.params, result_container, start_time, timeout_limit, self.run_sync
+            )
+        else:
+            await self.run_sync(
+                processor.search, self.query, self.params, result_container, start_time, timeout_limit
+            )
+
+
+async def _gather(jobs: list[EngineJob], result_container, start_time, timeout_limit, remaining_time):
+    tasks = {asyncio.ensure_future(job.search(result_container, start_time, timeout_limit)): job for job in jobs}
+    _, pending = await asyncio.wait(tasks, timeout=remaining_time)
+    timed_out = []
+    for task in pending:
+        job = tasks[task]
+        job.timed_out.set()
+        task.cancel()
+        timed_out.append(job.engine_name)
+    return timed_out
+
+
+def search_multiple_requests(
+    requests: list[tuple[str, str, dict[str, t.Any]]],
+    result_container: ResultContainer,
+    start_time: float,
+    timeout_limit: float,
+    remaining_time: float,
+) -> list[str]:
+    """Send the ``requests`` of a search and wait at most ``remaining_time``
+    seconds for the engines.  Returns the names of the engines which have not
+    answered in time."""
+    deadline = start_time + timeout_limit
+    jobs = [EngineJob(engine_name, query, params, deadline) for engine_name, query, params in requests]
+    future = asyncio.run_coroutine_threadsafe(
+        _gather(jobs, result_container, start_time, timeout_limit, remaining_time),
+        get_loop(),
+    )
+    return future.result()
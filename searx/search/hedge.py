@@ -0,0 +1,93 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Hedged requests for engines with a latency tail (engine setting
+``hedging: true``).
+
+If the response of an engine takes longer than the engine's observed
+``hedging_percentile`` (default: p90) of the HTTP time, a second request is
+sent through the next proxy / local address of the engine's network.  The
+first response wins, the other request is cancelled (see
+:py:obj:`searx.network.network.Network.request_hedged`).
+
+The delay is taken from the histogram ``('engine', <name>, 'time', 'http')`` of
+:py:mod:`searx.metrics`, there is no hedging until the histogram holds
+:py:obj:`MIN_OBSERVATIONS` values.
+
+The number of hedged requests is bounded by a token bucket: each request of the
+engine adds ``hedging_max_ratio`` (default: 0.1) tokens, a hedged request costs
+one token.  Over time at most 10% of the requests are hedged, with bursts of at
+most :py:obj:`MAX_BURST` hedged requests.
+
+Counters in :py:mod:`searx.metrics`:
+
+- ``('engine', <name>, 'hedge', 'count', 'sent')``: hedged requests
+- ``('engine', <name>, 'hedge', 'count', 'won')``: the second response won
+- ``('engine', <name>, 'hedge', 'count', 'skipped')``: a hedge was due but the
+  budget was exhausted
+"""
+
+from __future__ import annotations
+
+import threading
+
+from searx.metrics import counter_inc, histogram
+
+MIN_OBSERVATIONS = 20
+"""Number of HTTP times to observe before the first hedged request."""
+
+MAX_BURST = 5.0
+"""Max. number of tokens in the bucket."""
+
+
+class Hedge:
+    """Hedging of one request (:py:obj:`searx.network.network.Hedge`)"""
+
+    __slots__ = 'delay', 'policy'
+
+    def __init__(self, delay: float, policy: HedgePolicy):
+        self.delay = delay
+        self.policy = policy
+
+    def acquire(self) -> bool:
+        return self.policy.acquire()
+
+    def won(self) -> None:
+        counter_inc('engine', self.policy.engine_name, 'hedge', 'count', 'won')
+
+
+class HedgePolicy:
+    """Hedging policy of an engine."""
+
+    def __init__(self, engine_name: str, percentile: float = 90, max_ratio: float = 0.1):
+        self.engine_name = engine_name
+        self.percentile = percentile
+        self.max_ratio = max_ratio
+        self._tokens = 1.0
+        self._lock = threading.Lock()
+
+    def delay(self) -> float | None:
+        """Observed percentile of the HTTP time or ``None`` if there are not
+        enough observations."""
+        h = histogram('engine', self.engine_name, 'time', 'http', raise_on_not_found=False)
+        if h is None or h.count < MIN_OBSERVATIONS:
+            return None
+        delay = h.percentage(self.percentile)
+        return None if delay is None else float(delay)
+
+    def hedge(self) -> Hedge | None:
+        """Returns the :py:obj:`Hedge` of a new request, ``None`` if the request
+        can't be hedged."""
+        with self._lock:
+            self._tokens = min(MAX_BURST, round(self._tokens + self.max_ratio, 6))
+        delay = self.delay()
+        if not delay:
+            return None
+        return Hedge(delay, self)
+
+    def acquire(self) -> bool:
+        with self._lock:
+            if self._tokens < 1:
+                counter_inc('engine', self.engine_name, 'hedge', 'count', 'skipped')
+                return False
+            self._tokens -= 1
+        counter_inc('engine', self.engine_name, 'hedge', 'count', 'sent')
+        return True
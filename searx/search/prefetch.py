@@ -0,0 +1,244 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Prefetch of the next results page (``search.prefetch``).
+
+When a search of the first page has been answered, the requests of the second
+page are sent in the background to the engines which support :py:obj:`paging
+<searx.enginelib.Engine.paging>`.  The parsed results are held in memory for
+``ttl`` seconds, the search of the second page takes the results of an engine
+from the prefetch cache instead of sending the request (each prefetched page
+is used once).
+
+Prefetching never competes with the searches of the users (admission
+control):
+
+- The requests are sent by a pool of ``max_jobs`` threads of its own, a
+  prefetch is dropped (not queued) if all the threads are busy.
+
+- There is no prefetch while more than ``max_load`` of the threads of the
+  :py:obj:`engine executor <searx.search.executor.EngineExecutor>` are busy,
+  jobs of the searches are waiting in the executor or the engine has reached
+  its ``max_concurrency``.
+
+- Engines which did not answer the first page (suspended, timeout, error) are
+  not prefetched.  An engine which blocks a prefetch (CAPTCHA, access denied,
+  too many requests) is suspended like in a search, other errors of a prefetch
+  are only logged.
+
+Counters in :py:mod:`searx.metrics`:
+
+- ``('engine', <name>, 'prefetch', 'count', 'sent')``: prefetched pages
+- ``('engine', <name>, 'prefetch', 'count', 'hit')``: prefetched pages which
+  have been used by a search
+"""
+
+from __future__ import annotations
+
+import typing as t
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from timeit import default_timer
+
+import searx.network
+from searx import logger, settings
+from searx.exceptions import (
+    SearxEngineAccessDeniedException,
+    SearxEngineCaptchaException,
+    SearxEngineTooManyRequestsException,
+)
+from searx.metrics import counter_inc
+from searx.search.executor import get_executor
+from searx.search.response_cache import request_key
+from searx.search.timeouts import get_engine_timeout
+
+if t.TYPE_CHECKING:
+    from searx.results import ResultContainer
+    from searx.search.models import SearchQuery
+
+logger = logger.getChild('search.prefetch')
+
+MAX_ENTRIES = 1024
+"""Max. number of prefetched pages in memory, the oldest pages are dropped."""
+
+PrefetchKey = tuple
+
+
+class PrefetchCache:
+    """Prefetched results in memory: ``{(engine, request): (expire, results)}``."""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._pages: OrderedDict[PrefetchKey, tuple[float, list[t.Any]]] = OrderedDict()
+        self._pending: set[PrefetchKey] = set()
+
+    def reserve(self, key: PrefetchKey) -> bool:
+        """Returns ``False`` if the page is already prefetched (or is being
+        prefetched)."""
+        with self._lock:
+            page = self._pages.get(key)
+            if key in self._pending or (page is not None and page[0] > default_timer()):
+                return False
+            self._pending.add(key)
+            return True
+
+    def release(self, key: PrefetchKey, results: list[t.Any] | None, ttl: float):
+        with self._lock:
+            self._pending.discard(key)
+            if not results:
+                return
+            self._pages[key] = (default_timer() + ttl, results)
+            self._pages.move_to_end(key)
+            while len(self._pages) > self.max_entries:
+                self._pages.popitem(last=False)
+
+    def pop(self, key: PrefetchKey) -> list[t.Any] | None:
+        with self._lock:
+            page = self._pages.pop(key, None)
+        if page is None or page[0] < default_timer():
+            return None
+        return page[1]
+
+
+class Prefetcher:
+    """Sends the requests of the next page in a pool of ``max_jobs`` threads."""
+
+    def __init__(self, max_jobs: int, max_load: float, ttl: float):
+        self.max_jobs = max_jobs
+        self.max_load = max_load
+        self.ttl = ttl
+        self.cache = PrefetchCache()
+        self._slots = threading.BoundedSemaphore(max_jobs)
+        self._pool = ThreadPoolExecutor(max_workers=max_jobs, thread_name_prefix='prefetch')
+
+    def saturated(self) -> bool:
+        """Returns ``True`` if the engine executor has no idle capacity for a
+        prefetch."""
+        stats = get_executor().stats()
+        return bool(stats['waiting']) or sum(stats['running'].values()) > self.max_load * stats['max_workers']
+
+    def admit(self, engine_name: str) -> bool:
+        """Returns ``True`` if the engine has not reached its
+        ``max_concurrency`` in the engine executor."""
+        executor = get_executor()
+        limit = executor.max_concurrency(engine_name)
+        return not (limit and executor.stats()['running'].get(engine_name, 0) >= limit)
+
+    def schedule(self, search_query: SearchQuery, result_container: ResultContainer) -> int:
+        """Prefetch the next page of ``search_query`` for the engines which
+        have answered in ``result_container``, returns the number of
+        scheduled prefetches."""
+        # pylint: disable=import-outside-toplevel
+        from searx.search.models import SearchQuery
+        from searx.search.processors import PROCESSORS, OnlineProcessor
+
+        # the engine data of the results (e.g. a token of the next page) is
+        # sent back by the search of the next page
+        next_query = SearchQuery(
+            search_query.query,
+            search_query.engineref_list,
+            search_query.lang,
+            search_query.safesearch,
+            search_query.pageno + 1,
+            search_query.time_range,
+            search_query.timeout_limit,
+            search_query.external_bang,
+            {name: dict(data) for name, data in result_container.engine_data.items()},
+            search_query.redirect_to_first_result,
+        )
+        if self.saturated():
+            logger.debug("no idle capacity")
+            return 0
+        unresponsive = {engine.engine for engine in result_container.unresponsive_engines}
+        count = 0
+        for engineref in search_query.engineref_list:
+            processor = PROCESSORS.get(engineref.name)
+            if (
+                processor is None
+                or not isinstance(processor, OnlineProcessor)
+                or not processor.engine.paging
+                or engineref.name in unresponsive
+                or processor.suspended_status.is_suspended
+            ):
+                continue
+            params = processor.get_params(next_query, engineref.category)
+            if params is None:
+                continue
+            key = (engineref.name, request_key(params))
+            if not self.admit(engineref.name):
+                logger.debug("%s: max_concurrency reached", engineref.name)
+                continue
+            if not self.cache.reserve(key):
+                continue
+            if not self._slots.acquire(blocking=False):  # pylint: disable=consider-using-with
+                self.cache.release(key, None, 0)
+                break
+            self._pool.submit(self._prefetch, key, processor, next_query.query, params)
+            count += 1
+        return count
+
+    def _prefetch(self, key: PrefetchKey, processor, query: str, params: dict[str, t.Any]):
+        results = None
+        try:
+            timeout = get_engine_timeout(processor.engine_name)
+            searx.network.set_timeout_for_thread(timeout, start_time=default_timer())
+            searx.network.reset_time_for_thread()
+            searx.network.set_context_network_name(processor.engine_name)
+            results = processor._search_basic(query, params)  # pylint: disable=protected-access
+            counter_inc('engine', processor.engine_name, 'prefetch', 'count', 'sent')
+        except (
+            SearxEngineCaptchaException,
+            SearxEngineTooManyRequestsException,
+            SearxEngineAccessDeniedException,
+        ) as e:
+            # the engine blocks us: suspend it, as OnlineProcessor.handle_search_exception does
+            processor.suspend(e)
+            logger.error("%s: prefetch blocked, engine suspended: %r", processor.engine_name, e)
+        except Exception as e:  # pylint: disable=broad-except
+            logger.debug("%s: prefetch failed: %r", processor.engine_name, e)
+        finally:
+            self.cache.release(key, list(results) if results else None, self.ttl)
+            self._slots.release()
+
+    def get(self, engine_name: str, params: dict[str, t.Any]) -> list[t.Any] | None:
+        """Returns the prefetched results of the request ``params`` or
+        ``None``."""
+        results = self.cache.pop((engine_name, request_key(params)))
+        if results is not None:
+            counter_inc('engine', engine_name, 'prefetch', 'count', 'hit')
+        return results
+
+
+_PREFETCHER: Prefetcher | None = None
+_PREFETCHER_LOCK = threading.Lock()
+
+
+def get_prefetcher() -> Prefetcher | None:
+    """Returns the :py:obj:`Prefetcher` (``None`` if prefetching is disabled),
+    created on first use."""
+    global _PREFETCHER  # pylint: disable=global-statement
+    cfg = settings['search']['prefetch']
+    if not cfg['enabled']:
+        return None
+    with _PREFETCHER_LOCK:
+        if _PREFETCHER is None:
+            _PREFETCHER = Prefetcher(cfg['max_jobs'], cfg['max_load'], cfg['ttl'])
+        return _PREFETCHER
+
+
+def schedule(search_query: SearchQuery, result_container: ResultContainer):
+    """Prefetch the second page of a search of the first page."""
+    prefetcher = get_prefetcher()
+    if prefetcher is None or search_query.pageno != 1:
+        return
+    prefetcher.schedule(search_query, result_container)
+
+
+def get(engine_name: str, params: dict[str, t.Any]) -> list[t.Any] | None:
+    """Returns the prefetched results of the request ``params`` of the engine
+    ``engine_name`` or ``None``."""
+    prefetcher = get_prefetcher()
+    if prefetcher is None or params['pageno'] == 1:
+        return None
+    return prefetcher.get(engine_name, params)
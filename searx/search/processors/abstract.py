@@ -13,6 +13,7 @@ from timeit import default_timer
 from searx import settings, logger
 from searx.engines import engines
 from searx.network import get_time_for_thread, get_network
+from searx.search import timeouts
 from searx.metrics import histogram_observe, counter_inc, count_exception, count_error
 from searx.exceptions import SearxEngineAccessDeniedException, SearxEngineResponseException
 from searx.utils import get_engine_from_settings
@@ -87,16 +88,18 @@ class EngineProcessor(ABC):
     def has_initialize_function(self):
         return hasattr(self.engine, 'init')
 
-    def handle_exception(self, result_container, exception_or_message, suspend=False):
-        # update result_container
+    @staticmethod
+    def error_message(exception_or_message) -> str:
         if isinstance(exception_or_message, BaseException):
             exception_class = exception_or_message.__class__
             module_name = getattr(exception_class, '__module__', 'builtins')
             module_name = '' if module_name == 'builtins' else module_name + '.'
-            error_message = module_name + exception_class.__qualname__
-        else:
-            error_message = exception_or_message
-        result_container.add_unresponsive_engine(self.engine_name, error_message)
+            return module_name + exception_class.__qualname__
+        return exception_or_message
+
+    def handle_exception(self, result_container, exception_or_message, suspend=False):
+        # update result_container
+        result_container.add_unresponsive_engine(self.engine_name, self.error_message(exception_or_message))
         # metrics
         counter_inc('engine', self.engine_name, 'search', 'count', 'error')
         if isinstance(exception_or_message, BaseException):
@@ -105,12 +108,19 @@ class EngineProcessor(ABC):
             count_error(self.engine_name, exception_or_message)
         # suspend the engine ?
         if suspend:
-            suspended_time = None
-            if isinstance(exception_or_message, SearxEngineAccessDeniedException):
-                suspended_time = exception_or_message.suspended_time
-            self.suspended_status.suspend(suspended_time, error_message)  # pylint: disable=no-member
-
-    def _extend_container_basic(self, result_container, start_time, search_results):
+            self.suspend(exception_or_message)
+
+    def suspend(self, exception_or_message):
+        """Suspend the engine, the time is from the settings
+        (``search.suspended_times``) or from the exception."""
+        suspended_time = None
+        if isinstance(exception_or_message, SearxEngineAccessDeniedException):
+            suspended_time = exception_or_message.suspended_time
+        self.suspended_status.suspend(  # pylint: disable=no-member
+            suspended_time, self.error_message(exception_or_message)
+        )
+
+    def _extend_container_basic(self, result_container, start_time, search_results, cached=False):
         # update result_container
         result_container.extend(self.engine_name, search_results)
         engine_time = default_timer() - start_time
@@ -118,18 +128,30 @@ class EngineProcessor(ABC):
         result_container.add_timing(self.engine_name, engine_time, page_load_time)
         # metrics
         counter_inc('engine', self.engine_name, 'search', 'count', 'successful')
+        if cached:
+            # the times of the response cache are not the times of the engine
+            return
         histogram_observe(engine_time, 'engine', self.engine_name, 'time', 'total')
+        timeouts.observe(self.engine_name, engine_time)
         if page_load_time is not None:
             histogram_observe(page_load_time, 'engine', self.engine_name, 'time', 'http')
 
-    def extend_container(self, result_container, start_time, search_results):
-        if getattr(threading.current_thread(), '_timeout', False):
-            # the main thread is not waiting anymore
-            self.handle_exception(result_container, 'timeout', None)
+    @staticmethod
+    def search_timed_out() -> bool:
+        """True if the search is not waiting anymore for the engine running in
+        this thread (see :py:obj:`searx.search.executor`)."""
+        timeout_event = getattr(threading.current_thread(), '_timeout_event', None)
+        return timeout_event is not None and timeout_event.is_set()
+
+    def extend_container(self, result_container, start_time, search_results, cached=False):
+        if self.search_timed_out():
+            # the search is not waiting anymore, the timeout has already been
+            # reported (see searx.search.executor)
+            pass
         else:
             # check if the engine accepted the request
             if search_results is not None:
-                self._extend_container_basic(result_container, start_time, search_results)
+                self._extend_container_basic(result_container, start_time, search_results, cached)
             self.suspended_status.resume()
 
     def extend_container_if_suspended(self, result_container):
@@ -17,6 +17,9 @@ from searx.exceptions import (
     SearxEngineTooManyRequestsException,
 )
 from searx.metrics.error_recorder import count_error
+from searx.search import prefetch, timeouts
+from searx.search.hedge import HedgePolicy
+from searx.search.response_cache import EngineResponseCache
 from .abstract import EngineProcessor
 
 
@@ -39,6 +42,17 @@ class OnlineProcessor(EngineProcessor):
 
     engine_type = 'online'
 
+    def __init__(self, engine, engine_name: str):
+        super().__init__(engine, engine_name)
+        self.hedge_policy: HedgePolicy | None = None
+        if getattr(self.engine, 'hedging', False):
+            self.hedge_policy = HedgePolicy(
+                engine_name,
+                percentile=self.engine.hedging_percentile,
+                max_ratio=self.engine.hedging_max_ratio,
+            )
+        self.response_cache = EngineResponseCache(self.engine)
+
     def initialize(self):
         # set timeout for all HTTP requests
         searx.network.set_timeout_for_thread(self.engine.timeout, start_time=default_timer())
@@ -76,7 +90,9 @@ class OnlineProcessor(EngineProcessor):
         self.logger.debug('HTTP Accept-Language: %s', params['headers'].get('Accept-Language', ''))
         return params
 
-    def _send_http_request(self, params):
+    def _get_request_args(self, params):
+        """Returns ``(method, url, request_args, soft_max_redirects)`` of the
+        HTTP request described by the engine's ``params``."""
         # create dictionary which contain all
         # information about the request
         request_args = dict(headers=params['headers'], cookies=params['cookies'], auth=params['auth'])
@@ -104,17 +120,19 @@ class OnlineProcessor(EngineProcessor):
         # raise_for_status
         request_args['raise_for_httperror'] = params.get('raise_for_httperror', True)
 
-        # specific type of request (GET or POST)
-        if params['method'] == 'GET':
-            req = searx.network.get
-        else:
-            req = searx.network.post
+        # hedging (see searx.search.hedge)
+        if self.hedge_policy is not None:
+            hedge = self.hedge_policy.hedge()
+            if hedge is not None:
+                request_args['hedge'] = hedge
 
         request_args['data'] = params['data']
 
-        # send the request
-        response = req(params['url'], **request_args)
+        # specific type of request (GET or POST)
+        method = 'GET' if params['method'] == 'GET' else 'POST'
+        return method, params['url'], request_args, soft_max_redirects
 
+    def _check_redirects(self, response, soft_max_redirects):
         # check soft limit of the redirect count
         if len(response.history) > soft_max_redirects:
             # unexpected redirect : record an error
@@ -129,8 +147,41 @@ class OnlineProcessor(EngineProcessor):
                 secondary=True,
             )
 
+    def _send_http_request(self, params):
+        method, url, request_args, soft_max_redirects = self._get_request_args(params)
+
+        # send the request
+        if method == 'GET':
+            response = searx.network.get(url, **request_args)
+        else:
+            response = searx.network.post(url, **request_args)
+
+        self._check_redirects(response, soft_max_redirects)
+        return response
+
+    async def _send_http_request_async(self, params, timeout_limit):
+        """Coroutine version of :py:obj:`OnlineProcessor._send_http_request`,
+        the request is sent by the engine's network on the network loop."""
+        method, url, request_args, soft_max_redirects = self._get_request_args(params)
+        request_args.setdefault('timeout', timeout_limit)
+        if method == 'GET':
+            request_args.setdefault('allow_redirects', True)
+
+        network = searx.network.get_network(self.engine_name)
+        response = await network.request(method, url, **request_args)
+
+        self._check_redirects(response, soft_max_redirects)
         return response
 
+    def _cached_results(self, params):
+        """Results of the request from the :py:obj:`prefetch
+        <searx.search.prefetch>` or the :py:obj:`response cache
+        <searx.search.response_cache>` (``None`` if there are none)."""
+        search_results = prefetch.get(self.engine_name, params)
+        if search_results is None:
+            search_results = self.response_cache.get(params)
+        return search_results
+
     def _search_basic(self, query, params):
         # update request parameters dependent on
         # search-engine (contained in engines folder)
@@ -145,7 +196,9 @@ class OnlineProcessor(EngineProcessor):
 
         # parse the response
         response.search_params = params
-        return self.engine.response(response)
+        search_results = self.engine.response(response)
+        self.response_cache.set(params, search_results)
+        return search_results
 
     def search(self, query, params, result_container, start_time, timeout_limit):
         # set timeout for all HTTP requests
@@ -156,41 +209,103 @@ class OnlineProcessor(EngineProcessor):
         searx.network.set_context_network_name(self.engine_name)
 
         try:
+            # results of the same request from the prefetch / response cache
+            search_results = self._cached_results(params)
+            if search_results is not None:
+                self.extend_container(result_container, start_time, search_results, cached=True)
+                return
             # send requests and parse the results
             search_results = self._search_basic(query, params)
             self.extend_container(result_container, start_time, search_results)
-        except ssl.SSLError as e:
+        except Exception as e:  # pylint: disable=broad-except
+            self.handle_search_exception(result_container, e, start_time, timeout_limit)
+
+    async def search_async(self, query, params, result_container, start_time, timeout_limit, run_sync):
+        """Coroutine version of :py:obj:`OnlineProcessor.search`, runs on the
+        network loop (see :py:obj:`searx.search.fanout`).
+
+        Only the HTTP request of the engine is a coroutine; ``engine.request``,
+        ``engine.response`` (CPU-bound) and the update of the result container
+        are run by ``run_sync`` in a thread of the bounded engine pool.
+        """
+
+        def _prepare():
+            searx.network.set_timeout_for_thread(timeout_limit, start_time=start_time)
+            searx.network.set_context_network_name(self.engine_name)
+            cached_results = self._cached_results(params)
+            if cached_results is None:
+                self.engine.request(query, params)
+            return cached_results
+
+        def _parse(response, http_time, cached_results=None):
+            searx.network.set_timeout_for_thread(timeout_limit, start_time=start_time)
+            searx.network.reset_time_for_thread()
+            searx.network.add_time_for_thread(http_time)
+            searx.network.set_context_network_name(self.engine_name)
+            if cached_results is not None:
+                self.extend_container(result_container, start_time, cached_results, cached=True)
+                return
+            search_results = None
+            if response is not None:
+                response.search_params = params
+                search_results = self.engine.response(response)
+                self.response_cache.set(params, search_results)
+            self.extend_container(result_container, start_time, search_results)
+
+        try:
+            cached_results = await run_sync(_prepare)
+            if cached_results is not None:
+                await run_sync(_parse, None, 0, cached_results)
+                return
+            response = None
+            http_time = 0
+            # ignoring empty urls
+            if params['url']:
+                http_start = default_timer()
+                response = await self._send_http_request_async(params, timeout_limit)
+                http_time = default_timer() - http_start
+            await run_sync(_parse, response, http_time)
+        except Exception as e:  # pylint: disable=broad-except
+            self.handle_search_exception(result_container, e, start_time, timeout_limit)
+
+    def handle_search_exception(self, result_container, e, start_time, timeout_limit):
+        # pylint: disable=too-many-branches
+        if isinstance(e, ssl.SSLError):
             # requests timeout (connect or read)
             self.handle_exception(result_container, e, suspend=True)
             self.logger.error("SSLError {}, verify={}".format(e, searx.network.get_network(self.engine_name).verify))
-        except (httpx.TimeoutException, asyncio.TimeoutError) as e:
+        elif isinstance(e, (httpx.TimeoutException, asyncio.TimeoutError)):
             # requests timeout (connect or read)
             self.handle_exception(result_container, e, suspend=True)
+            if not self.search_timed_out():
+                # otherwise the timeout has already been observed by the search
+                timeouts.observe(self.engine_name, timeout_limit)
             self.logger.error(
                 "HTTP requests timeout (search duration : {0} s, timeout: {1} s) : {2}".format(
                     default_timer() - start_time, timeout_limit, e.__class__.__name__
                 )
             )
-        except (httpx.HTTPError, httpx.StreamError) as e:
+        elif isinstance(e, (httpx.HTTPError, httpx.StreamError)):
             # other requests exception
             self.handle_exception(result_container, e, suspend=True)
             self.logger.exception(
                 "requests exception (search duration : {0} s, timeout: {1} s) : {2}".format(
                     default_timer() - start_time, timeout_limit, e
-                )
+                ),
+                exc_info=e,
             )
-        except SearxEngineCaptchaException as e:
+        elif isinstance(e, SearxEngineCaptchaException):
             self.handle_exception(result_container, e, suspend=True)
-            self.logger.exception('CAPTCHA')
-        except SearxEngineTooManyRequestsException as e:
+            self.logger.exception('CAPTCHA', exc_info=e)
+        elif isinstance(e, SearxEngineTooManyRequestsException):
             self.handle_exception(result_container, e, suspend=True)
-            self.logger.exception('Too many requests')
-        except SearxEngineAccessDeniedException as e:
+            self.logger.exception('Too many requests', exc_info=e)
+        elif isinstance(e, SearxEngineAccessDeniedException):
             self.handle_exception(result_container, e, suspend=True)
-            self.logger.exception('SearXNG is blocked')
-        except Exception as e:  # pylint: disable=broad-except
+            self.logger.exception('SearXNG is blocked', exc_info=e)
+        else:
             self.handle_exception(result_container, e)
-            self.logger.exception('exception : {0}'.format(e))
+            self.logger.exception('exception : {0}'.format(e), exc_info=e)
 
     def get_default_tests(self):
         tests = {}
@@ -0,0 +1,184 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Cache of the parsed responses of the engines (``search.response_cache``).
+
+If the cache is enabled, the results of an ``online`` engine (the return value
+of ``engine.response``) are cached for ``ttl`` seconds.  A search which sends
+the same request to the engine (query, page, language, safe search, time
+range, category and engine data) within the TTL gets the cached results, the
+engine's ``request`` and ``response`` functions are not called and no HTTP
+request is sent.
+
+- An engine can be excluded from the cache (engine setting ``response_cache:
+  false``) or have its own TTL (``response_cache_ttl``).
+
+- Only non-empty results are cached, a value which is (serialized) bigger than
+  ``max_value_size`` is not cached.
+
+- The backend is a :py:obj:`ExpireCacheSQLite <searx.cache.ExpireCacheSQLite>`
+  (``sqlite``, expired values are removed by the maintenance of the cache) or
+  the :ref:`Valkey DB <settings valkey>` (``valkey``, values expire by the TTL
+  and are evicted by the ``maxmemory-policy`` of the DB).
+
+The cache keys are HMACs of the request (the query is not stored in clear
+text).  Hits and misses are counted in :py:obj:`searx.metrics`
+(``('engine', <name>, 'cache', 'count', 'hit' | 'miss')``), the hit rate of
+an engine is shown on the ``/stats`` page.
+"""
+
+from __future__ import annotations
+
+import typing as t
+
+import abc
+import hmac
+import pickle
+import threading
+
+from searx import logger, settings, valkeydb
+from searx.cache import ExpireCache, ExpireCacheCfg, ExpireCacheSQLite
+from searx.metrics import counter_inc
+
+logger = logger.getChild('search.response_cache')
+
+
+def request_key(params: dict[str, t.Any]) -> tuple:
+    """Returns the request of the engine (the values of the request ``params``
+    which select the results)."""
+    return (
+        params['query'],
+        params['category'],
+        params['pageno'],
+        params['safesearch'],
+        params['time_range'],
+        params['searxng_locale'],
+        tuple(sorted(params['engine_data'].items())),
+    )
+
+
+class ResponseCache(abc.ABC):
+    """Abstract backend of the response cache."""
+
+    def __init__(self, ttl: int, max_value_size: int):
+        self.ttl = ttl
+        self.max_value_size = max_value_size
+        self.cfg = ExpireCacheCfg(
+            name="RESPONSE_CACHE",
+            MAX_VALUE_LEN=max_value_size,
+            MAXHOLD_TIME=ttl,
+            MAINTENANCE_PERIOD=max(ttl, 60),
+        )
+
+    def secret_hash(self, name: str) -> str:
+        """Returns a HMAC of ``name`` (see :py:obj:`searx.cache.ExpireCache.secret_hash`)."""
+        return hmac.new(name.encode('utf-8') + self.cfg.password, digestmod='sha256').hexdigest()
+
+    @abc.abstractmethod
+    def get(self, engine_name: str, key: str) -> t.Any:
+        """Returns the cached results or ``None``."""
+
+    @abc.abstractmethod
+    def set(self, engine_name: str, key: str, results: t.Any, ttl: int) -> bool:
+        """Caches the results of the engine for ``ttl`` seconds."""
+
+    def key(self, params: dict[str, t.Any]) -> str:
+        """Returns the cache key of the request ``params`` of an engine."""
+        return self.secret_hash(repr(request_key(params)))
+
+
+class ResponseCacheSQLite(ResponseCache):
+    """Response cache in a :py:obj:`ExpireCacheSQLite
+    <searx.cache.ExpireCacheSQLite>`, one table per engine."""
+
+    def __init__(self, ttl: int, max_value_size: int, db_url: str = ""):
+        super().__init__(ttl, max_value_size)
+        if db_url:
+            self.cfg.db_url = db_url
+        self.cache = ExpireCacheSQLite.build_cache(self.cfg)
+
+    def get(self, engine_name: str, key: str) -> t.Any:
+        return self.cache.get(key, ctx=ExpireCache.normalize_name(engine_name))
+
+    def set(self, engine_name: str, key: str, results: t.Any, ttl: int) -> bool:
+        return self.cache.set(key, results, expire=ttl, ctx=ExpireCache.normalize_name(engine_name))
+
+
+class ResponseCacheValkey(ResponseCache):
+    """Response cache in the :ref:`Valkey DB <settings valkey>`."""
+
+    PREFIX = "SearXNG_response_cache"
+
+    def __init__(self, ttl: int, max_value_size: int, client):
+        super().__init__(ttl, max_value_size)
+        self.client = client
+
+    def get(self, engine_name: str, key: str) -> t.Any:
+        value = self.client.get(f"{self.PREFIX}|{engine_name}|{key}")
+        if value is None:
+            return None
+        return pickle.loads(value)
+
+    def set(self, engine_name: str, key: str, results: t.Any, ttl: int) -> bool:
+        value = pickle.dumps(results)
+        if len(value) > self.max_value_size:
+            logger.debug("%s: value too big to cache (len: %s)", engine_name, len(value))
+            return False
+        self.client.set(f"{self.PREFIX}|{engine_name}|{key}", value, ex=ttl)
+        return True
+
+
+_CACHE: ResponseCache | None = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_cache() -> ResponseCache | None:
+    """Returns the response cache (``None`` if the cache is disabled), the
+    backend is created on first use."""
+    global _CACHE  # pylint: disable=global-statement
+    cfg = settings['search']['response_cache']
+    if not cfg['enabled']:
+        return None
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            if cfg['backend'] == 'valkey':
+                client = valkeydb.client()
+                if client is None:
+                    logger.error("response cache: no Valkey DB, falling back to SQLite")
+                else:
+                    _CACHE = ResponseCacheValkey(cfg['ttl'], cfg['max_value_size'], client)
+            if _CACHE is None:
+                _CACHE = ResponseCacheSQLite(cfg['ttl'], cfg['max_value_size'])
+        return _CACHE
+
+
+class EngineResponseCache:
+    """Response cache of one engine, used by the :py:obj:`OnlineProcessor
+    <searx.search.processors.online.OnlineProcessor>`."""
+
+    def __init__(self, engine):
+        self.engine_name: str = engine.name
+        self.enabled: bool = engine.response_cache
+        self.ttl: int = engine.response_cache_ttl
+
+    def get(self, params: dict[str, t.Any]) -> t.Any:
+        """Returns the cached results of the request ``params`` or ``None``."""
+        cache = get_cache() if self.enabled else None
+        if cache is None:
+            return None
+        try:
+            results = cache.get(self.engine_name, cache.key(params))
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("%s: can't read from the response cache", self.engine_name)
+            results = None
+        counter_inc('engine', self.engine_name, 'cache', 'count', 'miss' if results is None else 'hit')
+        return results
+
+    def set(self, params: dict[str, t.Any], results) -> None:
+        """Caches the ``results`` of the request ``params``."""
+        cache = get_cache() if self.enabled else None
+        if cache is None or not results:
+            return
+        try:
+            cache.set(self.engine_name, cache.key(params), list(results), self.ttl or cache.ttl)
+        except Exception:  # pylint: disable=broad-except
+            # e.g. results which can't be pickled
+            logger.exception("%s: can't write to the response cache", self.engine_name)
@@ -0,0 +1,157 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Single-flight of identical searches (``search.single_flight: true``).
+
+Identical searches which run at the same time (a trending query) share one
+fan-out to the engines: the first search (the *leader*) sends the requests of
+the engines, the other searches (the *followers*) wait for the responses of
+the leader's engines.  Searches are identical if their :py:obj:`flight key
+<flight_key>` is equal (query, engines, language, safe search, page, time
+range, timeout and engine data of the :py:obj:`SearchQuery
+<searx.search.models.SearchQuery>`).
+
+The engines put their responses into a :py:obj:`Flight` (instead of a
+:py:obj:`ResultContainer <searx.results.ResultContainer>`), the responses are
+replayed into the result container of each search.  A follower gets a copy of
+the responses, the plugins (``on_result``, ``post_search``) still run for
+each search with its own request and preferences.
+
+Only searches which run at the same time are coalesced, the responses are not
+cached.  A streamed search (``format=stream``) is never coalesced, its results
+are sent while the engines answer.
+"""
+
+from __future__ import annotations
+
+import typing as t
+
+import copy
+import threading
+
+from searx import logger
+from searx.search.timeouts import get_engine_timeout, get_search_timeout
+
+if t.TYPE_CHECKING:
+    from searx.results import ResultContainer
+    from searx.search import Search
+    from searx.search.models import SearchQuery
+
+logger = logger.getChild('search.singleflight')
+
+WAIT_GRACE = 1.0
+"""Seconds a follower waits longer than the timeout of the search, if the
+leader has not finished by then, the follower runs its own fan-out."""
+
+FlightKey = tuple
+
+
+def flight_key(search_query: SearchQuery) -> FlightKey:
+    """Returns the key of the identical searches of ``search_query``."""
+    engine_data = tuple(sorted((name, tuple(sorted(data.items()))) for name, data in search_query.engine_data.items()))
+    return (
+        search_query.query,
+        tuple(search_query.engineref_list),
+        search_query.lang,
+        search_query.safesearch,
+        search_query.pageno,
+        search_query.time_range,
+        search_query.timeout_limit,
+        engine_data,
+    )
+
+
+class Flight:
+    """The responses of the engines of a search, recorded in the order in
+    which the engines have put them into the :py:obj:`ResultContainer
+    <searx.results.ResultContainer>` (the methods the processors call)."""
+
+    def __init__(self):
+        self.followers = 0
+        self.actual_timeout: float | None = None
+        self._calls: list[tuple[str, tuple]] = []
+        self._snapshot: list[tuple[str, tuple]] | None = None
+        self._closed = False
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+
+    def _record(self, method: str, *args):
+        with self._lock:
+            if self._closed:
+                logger.debug("flight is closed, ignoring %s%s", method, args[:1])
+                return
+            self._calls.append((method, args))
+
+    def extend(self, engine_name: str | None, results):
+        self._record('extend', engine_name, list(results))
+
+    def add_unresponsive_engine(self, engine_name: str, error_type: str, suspended: bool = False):
+        self._record('add_unresponsive_engine', engine_name, error_type, suspended)
+
+    def add_timing(self, engine_name: str, engine_time: float, page_load_time: float):
+        self._record('add_timing', engine_name, engine_time, page_load_time)
+
+    def land(self):
+        """Close the flight (late responses are ignored) and wake up the
+        followers."""
+        with self._lock:
+            self._closed = True
+        if self.followers:
+            # the leader modifies the recorded results in its container, the
+            # followers copy from a snapshot
+            self._snapshot = copy.deepcopy(self._calls)
+        self._done.set()
+
+    def wait(self, timeout: float) -> bool:
+        return self._done.wait(timeout)
+
+    def replay(self, result_container: ResultContainer, leader: bool):
+        """Put the recorded responses into ``result_container``."""
+        calls = self._calls if leader else copy.deepcopy(self._snapshot)
+        for method, args in calls or []:
+            getattr(result_container, method)(*args)
+
+
+_FLIGHTS: dict[FlightKey, Flight] = {}
+_FLIGHTS_LOCK = threading.Lock()
+
+
+def search_engines(search: Search):
+    """Runs :py:obj:`Search.search_engines <searx.search.Search.search_engines>`
+    of ``search`` or, if an identical search is already running, waits for
+    its responses."""
+    from searx.search import Search  # pylint: disable=import-outside-toplevel
+
+    key = flight_key(search.search_query)
+    with _FLIGHTS_LOCK:
+        flight = _FLIGHTS.get(key)
+        leader = flight is None
+        if flight is None:
+            flight = _FLIGHTS[key] = Flight()
+        else:
+            flight.followers += 1
+
+    if leader:
+        fanout = Search(search.search_query)
+        fanout.result_container = flight  # type: ignore
+        fanout.start_time = search.start_time
+        try:
+            fanout.search_engines()
+            flight.actual_timeout = fanout.actual_timeout
+        finally:
+            with _FLIGHTS_LOCK:
+                del _FLIGHTS[key]
+            flight.land()
+        flight.replay(search.result_container, leader=True)
+        search.actual_timeout = flight.actual_timeout
+        return
+
+    # the timeout of the search, as computed by Search._get_requests
+    timeout = get_search_timeout(
+        max((get_engine_timeout(ref.name) for ref in search.search_query.engineref_list), default=0),
+        search.search_query.timeout_limit,
+    )
+    if not flight.wait(timeout + WAIT_GRACE):
+        logger.warning("leader of %r has not finished in time", search.search_query.query)
+        search.search_engines()
+        return
+    flight.replay(search.result_container, leader=False)
+    search.actual_timeout = flight.actual_timeout
@@ -0,0 +1,94 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Adaptive engine timeouts (``outgoing.adaptive_timeout``).
+
+By default the timeout of an engine is its static ``timeout`` setting and the
+deadline of a search is the max of the timeouts of the selected engines.  With
+``outgoing.adaptive_timeout.enabled`` the timeout of an engine is derived from
+the last ``window`` observed response times of the engine::
+
+    timeout = percentile(total time) * factor
+
+clamped to ``[min_timeout, engine.timeout]``.  The static ``timeout`` of the
+engine stays the upper bound, until ``min_observations`` response times have
+been observed it is used as is.
+
+A request which runs into the timeout is observed with the time it was given
+(the deadline): when an engine becomes slower, its timeouts fill the window
+and the percentile climbs back, by ``factor`` each time, to the static timeout.
+Since the window only keeps the last response times, the timeout also follows
+an engine which becomes faster again.
+
+The deadline of a search is the max of the timeouts of its engines (further
+limited by ``outgoing.max_request_timeout`` and the ``timeout_limit`` of the
+query as before), a search with engines which usually answer in 300ms does not
+wait for the static timeout of the slowest engine.
+"""
+
+from __future__ import annotations
+
+import collections
+import math
+import threading
+
+from searx import settings
+from searx.engines import engines
+
+_lock = threading.Lock()
+_windows: dict[str, collections.deque[float]] = {}
+
+
+def observe(engine_name: str, seconds: float):
+    """Records the response time of the engine ``engine_name``; a request which
+    runs into the timeout is recorded with its timeout."""
+    window = settings['outgoing']['adaptive_timeout']['window']
+    with _lock:
+        times = _windows.get(engine_name)
+        if times is None or times.maxlen != window:
+            times = _windows[engine_name] = collections.deque(times or (), maxlen=window)
+        times.append(seconds)
+
+
+def reset():
+    """Forgets the observed response times of all engines."""
+    with _lock:
+        _windows.clear()
+
+
+def get_engine_timeout(engine_name: str) -> float:
+    """Returns the timeout of the engine ``engine_name`` in seconds."""
+    engine = engines[engine_name]
+    cfg = settings['outgoing']['adaptive_timeout']
+    if not cfg['enabled']:
+        return engine.timeout
+
+    with _lock:
+        times = sorted(_windows.get(engine_name, ()))
+    if not times or len(times) < cfg['min_observations']:
+        return engine.timeout
+    # nearest-rank percentile
+    rank = max(0, min(len(times) - 1, math.ceil(cfg['percentile'] / 100 * len(times)) - 1))
+    timeout = times[rank] * cfg['factor']
+    return round(max(cfg['min_timeout'], min(engine.timeout, timeout)), 2)
+
+
+def get_search_timeout(default_timeout: float, query_timeout: float | None) -> float:
+    """Returns the timeout of a search: the max. timeout of its engines
+    (``default_timeout``) limited by ``outgoing.max_request_timeout`` and the
+    ``timeout_limit`` of the query (``query_timeout``)."""
+    max_request_timeout = settings['outgoing']['max_request_timeout']
+    if max_request_timeout is None and query_timeout is None:
+        # No max, no user query: default_timeout
+        return default_timeout
+    if max_request_timeout is None:
+        # No max, but user query: From user query except if above default
+        return min(default_timeout, query_timeout)  # type: ignore
+    if query_timeout is None:
+        # Max, no user query: Default except if above max
+        return min(default_timeout, max_request_timeout)
+    # Max & user query: From user query except if above max
+    return min(query_timeout, max_request_timeout)
+
+
+def get_engine_timeouts(engine_names) -> dict[str, float]:
+    """Returns the current timeouts of the engines (``{name: timeout}``)"""
+    return {name: get_engine_timeout(name) for name in engine_names if name in engines}
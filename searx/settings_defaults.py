@@ -18,7 +18,7 @@ from .sxng_locales import sxng_locales
 searx_dir = abspath(dirname(__file__))
 
 logger = logging.getLogger('searx')
-OUTPUT_FORMATS = ['html', 'csv', 'json', 'rss']
+OUTPUT_FORMATS = ['html', 'csv', 'json', 'rss', 'stream']
 SXNG_LOCALE_TAGS = ['all', 'auto'] + list(l[0] for l in sxng_locales)
 SIMPLE_STYLE = ('auto', 'light', 'dark', 'black')
 CATEGORIES_AS_TABS: dict[str, dict[str, t.Any]] = {
@@ -193,6 +193,22 @@ SCHEMA: dict[str, t.Any] = {
         },
         'formats': SettingsValue(list, OUTPUT_FORMATS),
         'max_page': SettingsValue(int, 0),
+        'fanout': SettingsValue(('threads', 'asyncio'), 'threads'),
+        'fanout_pool_size': SettingsValue(int, 0),
+        'result_staging': SettingsValue(bool, False),
+        'single_flight': SettingsValue(bool, False),
+        'response_cache': {
+            'enabled': SettingsValue(bool, False),
+            'backend': SettingsValue(('sqlite', 'valkey'), 'sqlite'),
+            'ttl': SettingsValue(int, 300),
+            'max_value_size': SettingsValue(int, 100 * 1024),
+        },
+        'prefetch': {
+            'enabled': SettingsValue(bool, False),
+            'ttl': SettingsValue(numbers.Real, 60),
+            'max_jobs': SettingsValue(int, 4),
+            'max_load': SettingsValue(numbers.Real, 0.5),
+        },
     },
     'server': {
         'port': SettingsValue((int, str), 8888, 'SEARXNG_PORT'),
@@ -240,6 +256,14 @@ SCHEMA: dict[str, t.Any] = {
         'enable_http2': SettingsValue(bool, True),
         'verify': SettingsValue((bool, str), True),
         'max_request_timeout': SettingsValue((None, numbers.Real), None),
+        'adaptive_timeout': {
+            'enabled': SettingsValue(bool, False),
+            'percentile': SettingsValue(numbers.Real, 95),
+            'factor': SettingsValue(numbers.Real, 1.5),
+            'min_timeout': SettingsValue(numbers.Real, 1.0),
+            'min_observations': SettingsValue(int, 20),
+            'window': SettingsValue(int, 100),
+        },
         'pool_connections': SettingsValue(int, 100),
         'pool_maxsize': SettingsValue(int, 10),
         'keepalive_expiry': SettingsValue(numbers.Real, 5.0),
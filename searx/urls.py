@@ -0,0 +1,74 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Parsed URLs shared by the processing of results.
+
+The URL of a result is parsed once, in :py:obj:`Result.normalize_result_fields
+<searx.result_types.Result.normalize_result_fields>`, and stored in the field
+``parsed_url`` of the result.  The hash of a result, the merge of duplicates
+(:py:obj:`searx.results.merge_two_main_results`) and the plugins work on this
+field.
+
+The same URLs are returned by many engines and again on the next page, the
+functions of this module are memoized in a bounded LRU cache
+(:py:obj:`URL_CACHE_SIZE`).  A :py:obj:`urllib.parse.ParseResult` is an
+immutable tuple and can be shared by the results.  Long URLs (``data:`` URLs of
+images) are not cached.
+"""
+
+__all__ = ["parse_url", "normalize_url", "normalize_parsed_url"]
+
+import typing as t
+
+from functools import lru_cache
+from urllib.parse import ParseResult, urlparse
+
+URL_CACHE_SIZE = 8192
+"""Max. number of URLs in each cache."""
+
+MAX_CACHED_URL_LENGTH = 2048
+"""URLs longer than this are parsed without cache."""
+
+
+def _normalize(parsed_url: ParseResult) -> tuple[ParseResult, str]:
+    parsed_url = parsed_url._replace(scheme=parsed_url.scheme or "http")
+    return parsed_url, parsed_url.geturl()
+
+
+_parse_url_cached = lru_cache(maxsize=URL_CACHE_SIZE)(urlparse)
+_normalize_cached = lru_cache(maxsize=URL_CACHE_SIZE)(_normalize)
+
+
+def parse_url(url: str) -> ParseResult:
+    """Memoized :py:obj:`urllib.parse.urlparse`."""
+    if len(url) > MAX_CACHED_URL_LENGTH:
+        return urlparse(url)
+    return _parse_url_cached(url)
+
+
+def normalize_parsed_url(parsed_url: ParseResult) -> tuple[ParseResult, str]:
+    """Returns the normalized ``parsed_url`` (scheme ``http`` if the URL has no
+    scheme) and its URL string."""
+    if sum(map(len, parsed_url)) > MAX_CACHED_URL_LENGTH:
+        return _normalize(parsed_url)
+    return _normalize_cached(parsed_url)
+
+
+def normalize_url(url: str) -> tuple[ParseResult, str]:
+    """Parses and normalizes the URL string ``url``, see
+    :py:obj:`normalize_parsed_url`."""
+    if len(url) > MAX_CACHED_URL_LENGTH:
+        return _normalize(urlparse(url))
+    return _normalize_cached(_parse_url_cached(url))
+
+
+def cache_info() -> dict[str, t.Any]:
+    """Statistics of the caches (:py:obj:`functools.lru_cache`)."""
+    return {
+        "parse_url": _parse_url_cached.cache_info()._asdict(),
+        "normalize_url": _normalize_cached.cache_info()._asdict(),
+    }
+
+
+def cache_clear():
+    """Clears the caches."""
+    _parse_url_cached.cache_clear()
+    _normalize_cached.cache_clear()
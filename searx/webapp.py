@@ -6,6 +6,7 @@
 import json
 import os
 import sys
+import threading
 import base64
 
 from timeit import default_timer
@@ -119,6 +120,7 @@ from searx.sxng_locales import sxng_locales
 import searx.search
 from searx.network import stream as http_stream, set_context_network_name
 from searx.search.checker import get_result as checker_get_result
+from searx.search.timeouts import get_engine_timeouts
 
 
 logger = logger.getChild('webapp')
@@ -550,6 +552,8 @@ def post_request(response: flask.Response):
 def index_error(output_format: str, error_message: str):
     if output_format == 'json':
         return Response(json.dumps({'error': error_message}), mimetype='application/json')
+    if output_format == 'stream':
+        return Response(json.dumps({'type': 'error', 'error': error_message}) + '\n', mimetype='application/x-ndjson')
     if output_format == 'csv':
         response = Response('', mimetype='application/csv')
         cont_disp = 'attachment;Filename=searx.csv'
@@ -613,11 +617,35 @@ def rss_xsl():
     )
 
 
+def search_stream(search_obj: searx.search.SearchWithPlugins) -> Response:
+    """Run the search in a thread and stream the results as the engines answer,
+    see :py:obj:`searx.webutils.SearchStream`."""
+    stream = webutils.SearchStream(sse=sxng_request.accept_mimetypes.best == 'text/event-stream')
+    search_obj.result_container.on_extend = stream.on_extend
+
+    @flask.copy_current_request_context
+    def _search():
+        try:
+            search_obj.search()
+            stream.done(search_obj.search_query, search_obj.result_container, gettext('search error'))
+        except Exception as e:  # pylint: disable=broad-except
+            logger.exception(e, exc_info=True)
+            # no-op if done() has already ended the stream
+            stream.error(gettext('search error'))
+
+    threading.Thread(target=_search, name='search_stream', daemon=True).start()
+    response = Response(stream, mimetype=stream.mimetype)
+    response.headers['Cache-Control'] = 'no-cache'
+    # disable the response buffering of a nginx proxy
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
 @app.route('/search', methods=['GET', 'POST'])
 def search():
     """Search query in q and return results.
 
-    Supported outputs: html, json, csv, rss.
+    Supported outputs: html, json, csv, rss, stream.
     """
     # pylint: disable=too-many-locals, too-many-return-statements, too-many-branches
     # pylint: disable=too-many-statements
@@ -650,6 +678,8 @@ def search():
             sxng_request.preferences, sxng_request.form
         )
         search_obj = searx.search.SearchWithPlugins(search_query, sxng_request, sxng_request.user_plugins)
+        if output_format == 'stream':
+            return search_stream(search_obj)
         result_container = search_obj.search()
 
     except SearxParameterException as e:
@@ -1132,7 +1162,7 @@ def stats():
         checker_results['engines'] if checker_results['status'] == 'ok' and 'engines' in checker_results else {}
     )
 
-    engine_stats = get_engines_stats(filtered_engines)
+    engine_stats = get_engines_stats(filtered_engines, get_engine_timeouts(filtered_engines))
     engine_reliabilities = get_reliabilities(filtered_engines, checker_results)
 
     if sort_order not in STATS_SORT_PARAMETERS:
@@ -1211,9 +1241,14 @@ def stats_open_metrics():
         checker_results['engines'] if checker_results['status'] == 'ok' and 'engines' in checker_results else {}
     )
 
-    engine_stats = get_engines_stats(filtered_engines)
+    engine_stats = get_engines_stats(filtered_engines, get_engine_timeouts(filtered_engines))
     engine_reliabilities = get_reliabilities(filtered_engines, checker_results)
-    metrics_text = openmetrics(engine_stats, engine_reliabilities)
+    metrics_text = openmetrics(
+        engine_stats,
+        engine_reliabilities,
+        plugin_stats=searx.plugins.STORAGE.stats.get(),
+        answerer_stats=searx.answerers.STORAGE.stats.get(),
+    )
 
     return Response(metrics_text, mimetype='text/plain')
 
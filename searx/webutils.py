@@ -11,11 +11,13 @@ import re
 import itertools
 import json
 from datetime import datetime, timedelta
-from typing import Iterable, List, Tuple, TYPE_CHECKING
+from typing import Any, Callable, Iterable, List, Tuple, TYPE_CHECKING
 
 from io import StringIO
+from queue import SimpleQueue
 from codecs import getincrementalencoder
 
+import msgspec
 from flask_babel import gettext, format_date  # type: ignore
 
 from searx import logger, get_setting
@@ -156,20 +158,153 @@ class JSONEncoder(json.JSONEncoder):  # pylint: disable=missing-class-docstring
         return super().default(o)
 
 
-def get_json_response(sq: "SearchQuery", rc: "ResultContainer") -> str:
-    """Returns the JSON string of the results to a query (``application/json``)"""
-    data = {
+def _build_json_data(sq: "SearchQuery", rc: "ResultContainer", convert: Callable[[Any], Any]) -> dict:
+    # the results, answers and infoboxes are converted by ``convert``
+    return {
         'query': sq.query,
         'number_of_results': rc.number_of_results,
-        'results': [_.as_dict() for _ in rc.get_ordered_results()],
-        'answers': [_.as_dict() for _ in rc.answers],
+        'results': [convert(_) for _ in rc.get_ordered_results()],
+        'answers': [convert(_) for _ in rc.answers],
         'corrections': list(rc.corrections),
-        'infoboxes': rc.infoboxes,
+        'infoboxes': [convert(_) for _ in rc.infoboxes],
         'suggestions': list(rc.suggestions),
         'unresponsive_engines': get_translated_errors(rc.unresponsive_engines),
     }
-    response = json.dumps(data, cls=JSONEncoder)
-    return response
+
+
+def get_json_data(sq: "SearchQuery", rc: "ResultContainer") -> dict:
+    """Returns the JSON data of the results to a query"""
+    return _build_json_data(sq, rc, lambda result: result.as_dict())
+
+
+def _json_enc_hook(o):
+    # msgspec encodes datetime, set, named tuples and msgspec.Struct natively
+    if isinstance(o, tuple):
+        # e.g. time.struct_time
+        return list(o)
+    raise TypeError(f'Object of type {o.__class__.__name__} is not JSON serializable')
+
+
+_json_encoder = msgspec.json.Encoder(enc_hook=_json_enc_hook)
+
+
+def _legacy_json_value(result: dict) -> dict:
+    # msgspec encodes a timedelta as ISO 8601 duration, the JSON format has
+    # always been the number of seconds (see JSONEncoder)
+    for value in result.values():
+        if isinstance(value, timedelta):
+            return {k: v.total_seconds() if isinstance(v, timedelta) else v for k, v in result.items()}
+    return result
+
+
+def _json_value(result):
+    if isinstance(result, dict):
+        return _legacy_json_value(result)
+    # msgspec.Struct: encoded without an intermediate dict (as_dict)
+    return result
+
+
+def get_json_response(sq: "SearchQuery", rc: "ResultContainer") -> bytes:
+    """Returns the JSON of the results to a query (``application/json``).
+
+    Same data as :py:obj:`get_json_data`, but the results (``msgspec.Struct``)
+    are encoded directly by a :py:obj:`msgspec.json.Encoder`.  Differences to
+    ``json.dumps(.., cls=JSONEncoder)`` are in the notation only: non-ASCII
+    characters are not escaped and an aware UTC datetime ends with ``Z``
+    instead of ``+00:00``.
+    """
+    return _json_encoder.encode(_build_json_data(sq, rc, _json_value))
+
+
+class SearchStream:
+    """Incremental output of a search (``format=stream``).
+
+    :py:obj:`SearchStream.on_extend` is the :py:obj:`ResultContainer.on_extend
+    <searx.results.ResultContainer.on_extend>` listener, it is called from the
+    engine threads and queues an event with the results each engine has added
+    (or updated by a merge).  Iterating the stream yields the events as they
+    come in:
+
+    ``results``
+      ``{"engine": .., "results": [..], "answers": [..], "infoboxes": [..],
+      "suggestions": [..], "corrections": [..]}``, only the non-empty lists.
+      A result which has been merged with a result of a later engine is sent
+      again (same ``url``).
+
+    ``done``
+      The final response: the same data as the ``json`` format (results in
+      their final order) plus the ``timings`` of the engines.
+
+    ``error``
+      ``{"error": ..}``, the search has failed.
+
+    The events are written as `NDJSON`_ (``application/x-ndjson``, one JSON
+    object per line, the event name in ``type``) or, if ``sse`` is true, as
+    `Server-Sent Events`_ (``text/event-stream``).
+
+    .. _NDJSON: https://github.com/ndjson/ndjson-spec
+    .. _Server-Sent Events: https://html.spec.whatwg.org/multipage/server-sent-events.html
+    """
+
+    _END = None
+
+    def __init__(self, sse: bool = False):
+        self.sse = sse
+        self.mimetype = 'text/event-stream' if sse else 'application/x-ndjson'
+        self.queue: "SimpleQueue[str | None]" = SimpleQueue()
+        self.ended = False
+
+    def put(self, event: str, data: dict):
+        if self.sse:
+            self.queue.put(f'event: {event}\ndata: {json.dumps(data, cls=JSONEncoder)}\n\n')
+        else:
+            self.queue.put(json.dumps({'type': event, **data}, cls=JSONEncoder) + '\n')
+
+    def on_extend(self, engine_name: str | None, delta: dict[str, list]):
+        # called with the lock of the result container held, the event is
+        # serialized before the results can be merged again
+        data: dict = {'engine': engine_name}
+        for key, items in delta.items():
+            if key in ('results', 'answers'):
+                items = [item.as_dict() for item in items]
+            data[key] = items
+        self.put('results', data)
+
+    def done(self, sq: "SearchQuery", rc: "ResultContainer", error_message: str = 'search error'):
+        """Queue the final ``done`` event and end the stream.  If the final
+        data can't be built, an ``error`` event (``error_message``) is queued
+        instead and the exception is raised, the stream is ended anyway."""
+        try:
+            if rc.redirect_url:
+                data = {'query': sq.query, 'redirect_url': rc.redirect_url}
+            else:
+                data = get_json_data(sq, rc)
+                data['timings'] = [timing._asdict() for timing in rc.get_timings()]
+            self.put('done', data)
+        except Exception:
+            self.put('error', {'error': error_message})
+            raise
+        finally:
+            self._end()
+
+    def error(self, error_message: str):
+        """Queue an ``error`` event and end the stream (if the stream has not
+        yet ended)."""
+        if self.ended:
+            return
+        self.put('error', {'error': error_message})
+        self._end()
+
+    def _end(self):
+        self.ended = True
+        self.queue.put(self._END)
+
+    def __iter__(self):
+        while True:
+            chunk = self.queue.get()
+            if chunk is self._END:
+                return
+            yield chunk
 
 
 def get_themes(templates_path):
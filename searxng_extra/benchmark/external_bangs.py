@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Micro-benchmark of the external bangs: the :py:obj:`BangIndex
+<searx.external_bang.BangIndex>` (``external_bangs.bin``) against the former
+lookup in the trie of the ``external_bangs.json``.
+
+.. code:: bash
+
+    $ python -m searxng_extra.benchmark.external_bangs
+
+The load time is the time to the first lookup, the autocomplete prefixes are
+what the ``/autocompleter`` gets while a bang is typed.
+"""
+
+import json
+import timeit
+
+from searx.data import data_dir
+from searx.external_bang import INDEX_FILE, BangIndex, get_bang_definition_and_ac, resolve_bang_definition
+
+PREFIXES = ["g", "go", "goo", "d", "dd", "ddg", "w", "wi", "wik", "a", "am", "yt", "duckduckgo", "zzz"]
+
+
+def autocomplete_legacy(db, bang):
+    bang_definition, bang_ac_list = get_bang_definition_and_ac(db, bang)
+    new_autocomplete = []
+    current = [*bang_ac_list]
+    done = set()
+    while current:
+        bang_ac = current.pop(0)
+        done.add(bang_ac)
+        current_bang_definition, current_bang_ac_list = get_bang_definition_and_ac(db, bang_ac)
+        if current_bang_definition:
+            new_autocomplete.append((bang_ac, resolve_bang_definition(current_bang_definition, '')[1]))
+        for new_bang in current_bang_ac_list:
+            if new_bang not in done and new_bang not in current:
+                current.append(new_bang)
+    new_autocomplete.sort(key=lambda t: (-t[1], t[0]))
+    return bang_definition, [name for name, _ in new_autocomplete]
+
+
+def load_json():
+    with open(data_dir / "external_bangs.json", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main():
+    db = load_json()
+    index = BangIndex.load(INDEX_FILE)
+    for prefix in PREFIXES:
+        assert autocomplete_legacy(db, prefix) == (index.get(prefix), index.autocomplete(prefix)), prefix
+
+    number = 10
+    tests = {
+        'load json': load_json,
+        'load index': lambda: BangIndex.load(INDEX_FILE).get("g"),
+        'autocomplete legacy': lambda: [autocomplete_legacy(db, prefix) for prefix in PREFIXES],
+        'autocomplete index': lambda: [(index.get(prefix), index.autocomplete(prefix)) for prefix in PREFIXES],
+        'lookup legacy': lambda: [get_bang_definition_and_ac(db, prefix) for prefix in PREFIXES],
+        'lookup index': lambda: [index.get(prefix) for prefix in PREFIXES],
+    }
+    print(f"{len(index)} bangs, {len(PREFIXES)} prefixes")
+    for name, func in tests.items():
+        seconds = timeit.timeit(func, number=number)
+        print(f"{name:>20}: {seconds / number * 1000:8.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Micro-benchmark of :py:obj:`searx.intent.IntentMatcher.match`: the scan
+for the required literals of the trigger patterns against the plain loop which
+searches every pattern in the query.
+
+.. code:: bash
+
+    $ python -m searxng_extra.benchmark.intent
+
+The trigger set has a number of keyword patterns (a required literal) and a
+few patterns without a literal (like the trigger of the calculator), the
+queries are short search terms.
+"""
+
+import random
+import re
+import timeit
+
+from searx.intent import IntentMatcher
+
+KEYWORDS = 60
+WORDS = ["rain", "paris", "python", "weather", "recipe", "news", "map", "time", "price", "how", "to", "in"]
+
+
+def get_triggers() -> dict[str, re.Pattern]:
+    triggers = {f"keyword{i}": re.compile(rf"(?:^| )kw{i}(?:tool|help)?(?: |$)") for i in range(KEYWORDS)}
+    triggers["digits"] = re.compile(r"\d|(?<![a-z])(?:pi|e)(?![a-z])")
+    triggers["hash"] = re.compile(r"^(?:md5|sha1|sha256) ")
+    triggers["color"] = re.compile(r"#[0-9a-f]{6}\b", re.I)
+    return triggers
+
+
+def get_queries(n: int) -> list[str]:
+    rnd = random.Random(0)
+    words = WORDS + [f"kw{i}" for i in range(0, KEYWORDS, 7)] + ["1", "sha256", "#ff00aa"]
+    return [" ".join(rnd.choice(words) for _ in range(rnd.randint(1, 5))) for _ in range(n)]
+
+
+def match_loop(triggers: dict[str, re.Pattern], query: str) -> frozenset[str]:
+    return frozenset(name for name, pattern in triggers.items() if pattern.search(query))
+
+
+def main():
+    triggers = get_triggers()
+    queries = get_queries(5000)
+    matcher = IntentMatcher(triggers)
+    assert [matcher.match(q).triggers for q in queries] == [match_loop(triggers, q) for q in queries]
+
+    number = 5
+    tests = {
+        'loop': lambda: [match_loop(triggers, q) for q in queries],
+        'matcher': lambda: [matcher.match(q) for q in queries],
+    }
+    for name, func in tests.items():
+        seconds = timeit.timeit(func, number=number)
+        print(f"{len(triggers)} triggers, {len(queries)} queries {name:>8}: {seconds / number * 1000:8.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Micro-benchmark of the ``format=json`` output:
+:py:obj:`searx.webutils.get_json_response` (msgspec) against
+``json.dumps(get_json_data(..), cls=JSONEncoder)``.
+
+.. code:: bash
+
+    $ python -m searxng_extra.benchmark.json_response
+
+"""
+
+import json
+import timeit
+from datetime import datetime, timedelta
+from unittest import mock
+
+from searx import webutils
+from searx.result_types import LegacyResult, MainResult
+
+RESULTS = 500
+
+
+def get_results(n: int) -> list:
+    results = []
+    for i in range(n):
+        if i % 2:
+            result = MainResult(
+                url=f"https://example.org/{i}",
+                title=f"title {i}",
+                content="Lorem ipsum dolor sit amet, consectetur adipiscing elit " * 3,
+                publishedDate=datetime(2024, 1, 2, 3, 4, 5),
+            )
+        else:
+            result = LegacyResult(
+                url=f"https://example.org/video/{i}",
+                title=f"video {i}",
+                template="videos.html",
+                content="Lorem ipsum dolor sit amet, consectetur adipiscing elit " * 3,
+                length=timedelta(minutes=3, seconds=i % 60),
+            )
+        result.normalize_result_fields()
+        result.engines = {"engine1", "engine2"}
+        result.positions = [1, 2]
+        result.score = 1.0 / (i + 1)
+        results.append(result)
+    return results
+
+
+def main():
+    results = get_results(RESULTS)
+    rc = mock.Mock(
+        get_ordered_results=lambda: results,
+        answers=[],
+        corrections=set(),
+        infoboxes=[],
+        suggestions={"suggestion"},
+        unresponsive_engines=set(),
+        number_of_results=RESULTS,
+    )
+    sq = mock.Mock(query="test")
+    number = 100
+    tests = {
+        'json.dumps': lambda: json.dumps(webutils.get_json_data(sq, rc), cls=webutils.JSONEncoder),
+        'msgspec': lambda: webutils.get_json_response(sq, rc),
+    }
+    for name, func in tests.items():
+        seconds = timeit.timeit(func, number=number)
+        print(f"{RESULTS} results {name:>10}: {seconds / number * 1000:8.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
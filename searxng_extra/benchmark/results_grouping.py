@@ -0,0 +1,33 @@
+#!/usr/bin/env python
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Micro-benchmark of the result grouping of
+:py:obj:`searx.results.ResultContainer.get_ordered_results`
+(:py:obj:`searx.results.group_results`).
+
+.. code:: bash
+
+    $ python -m searxng_extra.benchmark.results_grouping
+
+The time per result should stay (nearly) constant when the number of results
+grows.
+"""
+
+import random
+import timeit
+
+from searx.results import group_results
+
+CATEGORIES = ["general:default.html:", "images:images.html:img_src", "videos:videos.html:img_src", "news:default.html:"]
+
+
+def main():
+    rnd = random.Random(0)
+    for n in (100, 1_000, 10_000, 100_000):
+        results = [(i, rnd.choice(CATEGORIES)) for i in range(n)]
+        number = max(1, 100_000 // n)
+        seconds = timeit.timeit(lambda: group_results(results, key=lambda res: res[1]), number=number)
+        print(f"{n:>7} results: {seconds / number * 1000:9.3f} ms  ({seconds / number / n * 1e6:.3f} µs/result)")
+
+
+if __name__ == '__main__':
+    main()
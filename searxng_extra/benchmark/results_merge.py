@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Micro-benchmark of :py:obj:`searx.results.ResultContainer.extend` with and
+without staging (:ref:`settings search` ``result_staging``).
+
+.. code:: bash
+
+    $ python -m searxng_extra.benchmark.results_merge
+
+A number of engine threads extend one container at the same time, the
+container is closed when all threads are done.
+"""
+
+import threading
+import timeit
+
+from searx import metrics
+from searx.results import ResultContainer
+
+ENGINES = 32
+RESULTS = 20
+
+
+def engine_results(engine: int) -> list[dict]:
+    # every second result is a duplicate of a result of the other engines
+    return [
+        {
+            "url": f"https://example.org/{i}" if i % 2 else f"https://example.org/{engine}/{i}",
+            "title": f"title {i}",
+            "content": f"content {engine} {i}",
+        }
+        for i in range(RESULTS)
+    ]
+
+
+def run(staging: bool, results: list[list[dict]]):
+    container = ResultContainer(staging=staging)
+    barrier = threading.Barrier(len(results))
+
+    def engine(i):
+        barrier.wait()
+        # the container modifies the dicts, extend with new objects
+        container.extend(f"engine{i}", [dict(r) for r in results[i]])
+
+    threads = [threading.Thread(target=engine, args=(i,)) for i in range(len(results))]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+    container.close()
+    return container.get_ordered_results()
+
+
+def main():
+    metrics.initialize([f"engine{i}" for i in range(ENGINES)])
+    results = [engine_results(i) for i in range(ENGINES)]
+    number = 50
+    for staging in (False, True):
+        seconds = timeit.timeit(lambda: run(staging, results), number=number)  # pylint: disable=cell-var-from-loop
+        print(
+            f"staging={staging!s:5}: {seconds / number * 1000:8.3f} ms / search"
+            f" ({ENGINES} engines x {RESULTS} results)"
+        )
+
+
+if __name__ == '__main__':
+    main()
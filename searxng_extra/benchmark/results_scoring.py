@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Micro-benchmark of the scoring of results: :py:obj:`searx.results.calculate_scores`
+and :py:obj:`searx.results.calculate_score` against the former
+``calculate_score``, which looked up the engine attributes per result.
+
+.. code:: bash
+
+    $ python -m searxng_extra.benchmark.results_scoring
+
+"""
+
+import random
+import timeit
+
+import searx.engines
+from searx.result_types import LegacyResult
+from searx.results import calculate_score, calculate_scores
+
+ENGINES = [f"engine{i}" for i in range(20)]
+
+
+def calculate_score_legacy(result, priority) -> float:
+    weight = 1.0
+
+    for result_engine in result['engines']:
+        if hasattr(searx.engines.engines.get(result_engine), 'weight'):
+            weight *= float(searx.engines.engines[result_engine].weight)
+
+    weight *= len(result['positions'])
+    score = 0
+
+    for position in result['positions']:
+        if priority == 'low':
+            continue
+        if priority == 'high':
+            score += weight
+        else:
+            score += weight / position
+
+    return score
+
+
+def get_results(n: int) -> list[LegacyResult]:
+    rnd = random.Random(0)
+    results = []
+    for i in range(n):
+        result = LegacyResult(url=f"https://example.org/{i}", title="title")
+        result.engines = set(rnd.sample(ENGINES, rnd.randint(1, 4)))
+        result.positions = [rnd.randint(1, 20) for _ in range(len(result.engines))]
+        results.append(result)
+    return results
+
+
+def main():
+    searx.engines.load_engines(
+        [
+            {'engine': 'dummy', 'name': name, 'shortcut': name, 'weight': 1 + (i % 3) / 2}
+            for i, name in enumerate(ENGINES)
+        ]
+    )
+    for n in (100, 1_000, 10_000):
+        results = get_results(n)
+        number = max(1, 100_000 // n)
+        tests = {
+            'legacy': lambda: [calculate_score_legacy(r, r.priority) for r in results],  # pylint: disable=cell-var-from-loop
+            'calculate_score': lambda: [calculate_score(r, r.priority) for r in results],  # pylint: disable=cell-var-from-loop
+            'calculate_scores': lambda: calculate_scores(results),  # pylint: disable=cell-var-from-loop
+        }
+        for name, func in tests.items():
+            seconds = timeit.timeit(func, number=number)
+            print(f"{n:>6} results {name:>16}: {seconds / number * 1000:8.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
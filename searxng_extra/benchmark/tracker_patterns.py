@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Micro-benchmark of :py:obj:`TrackerPatternsDB.clean_url
+<searx.data.tracker_patterns.TrackerPatternsDB.clean_url>`: the compiled
+:py:obj:`TrackerPatternsMatcher
+<searx.data.tracker_patterns.TrackerPatternsMatcher>` against the former loop
+over the (uncompiled) rules.
+
+.. code:: bash
+
+    $ python -m searxng_extra.benchmark.tracker_patterns
+
+The rule set has the size and the shape of the ClearURLs list (~200
+providers, a global rule ``.*``), the URLs are the links and thumbnails of the
+results of a search.  The former implementation also read the rules from the
+database for each URL, this is not included in the numbers.
+"""
+
+import random
+import re
+import timeit
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
+
+from searx.data.tracker_patterns import TrackerPatternsMatcher
+
+SITES = [f"site{i}" for i in range(190)] + ["amazon", "google", "youtube", "facebook", "twitter", "ebay", "reddit"]
+TRACKER_ARGS = ["utm_source=news", "utm_medium=rss", "fbclid=IwAR3", "gclid=Cj0", "ref=nav", "ved=2ahUK", "si=abc"]
+ARGS = ["q=rain", "id=42", "page=2", "lang=en", "v=dQw4w9WgXcQ", "s=1"]
+
+
+def get_rules():
+    rules = [
+        (
+            rf"^https?:\/\/(?:[a-z0-9-]+\.)*?{site}(?:\.[a-z]{{2,}}){{1,}}",
+            [rf"^https?:\/\/(?:[a-z0-9-]+\.)*?{site}(?:\.[a-z]{{2,}}){{1,}}\/(?:login|api)\/.*"],
+            ["ref_?", "ved", "si", f"{site}_[a-z]+", "(?:%3F)?pf_rd_[a-zA-Z]"],
+        )
+        for site in SITES
+    ]
+    rules.insert(
+        100,
+        (
+            ".*",
+            [r"^https?:\/\/(?:[a-z0-9-]+\.)*?matrix\.org\/_matrix\/", r"^https?:\/\/(?:[a-z0-9-]+\.)*?prismic\.io\/.*"],
+            ["(?:%3F)?utm(?:_[a-z_]*)?", "(?:%3F)?ga_[a-z_]+", "(?:%3F)?fbclid", "(?:%3F)?gclid", "(?:%3F)?mc_[a-z]+"],
+        ),
+    )
+    return rules
+
+
+def get_urls(n: int) -> list[str]:
+    rnd = random.Random(0)
+    hosts = [f"www.{site}.com" for site in SITES[-7:]] + [f"news{i}.example.org" for i in range(50)]
+    urls = []
+    for i in range(n):
+        args = rnd.sample(ARGS, rnd.randint(0, 2)) + rnd.sample(TRACKER_ARGS, rnd.randint(0, 2))
+        url = f"https://{rnd.choice(hosts)}/article/{i}"
+        urls.append(url + ("?" + "&".join(args) if args else ""))
+    return urls
+
+
+def clean_url_legacy(rules, url):
+    new_url = url
+    parsed_new_url = urlparse(url=new_url)
+    for rule in rules:
+        if not re.match(rule[0], new_url):
+            continue
+        if any(re.match(pattern, new_url) for pattern in rule[1]):
+            continue
+        query_args = list(parse_qsl(parsed_new_url.query))
+        for name, val in query_args.copy():
+            for pattern in rule[2]:
+                if re.match(pattern, name):
+                    query_args.remove((name, val))
+        parsed_new_url = parsed_new_url._replace(query=urlencode(query_args))
+        new_url = urlunparse(parsed_new_url)
+    return new_url
+
+
+def main():
+    rules = get_rules()
+    urls = get_urls(2800)  # links & thumbnails of a search with 70 engines
+    matcher = TrackerPatternsMatcher(rules)
+    assert [matcher.clean_url(url) for url in urls] == [clean_url_legacy(rules, url) for url in urls]
+
+    number = 3
+    tests = {
+        'legacy': lambda: [clean_url_legacy(rules, url) for url in urls],
+        'matcher': lambda: [matcher.clean_url(url) for url in urls],
+    }
+    for name, func in tests.items():
+        seconds = timeit.timeit(func, number=number)
+        print(f"{len(rules)} rules, {len(urls)} URLs {name:>8}: {seconds / number * 1000:8.2f} ms")
+    seconds = timeit.timeit(lambda: TrackerPatternsMatcher(rules), number=number)
+    print(f"compile: {seconds / number * 1000:8.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Profile of the URL parsing in a search of 70 engines (:py:obj:`searx.urls`).
+
+.. code:: bash
+
+    $ python -m searxng_extra.benchmark.url_parsing
+
+The results of the engines are added to a
+:py:obj:`searx.results.ResultContainer`, each result passes the URL filter of
+the :ref:`hostnames plugin`.  The search is run twice: the caches are cold in
+the first run, in the second run the engines return the same URLs (e.g. the
+same search by another user).
+"""
+
+import cProfile
+import pstats
+import random
+import timeit
+import urllib.parse
+
+from searx import metrics, urls
+from searx.plugins import hostnames
+from searx.results import ResultContainer
+
+ENGINES = 70
+RESULTS = 20
+# number of distinct URLs, the engines return overlapping results
+URLS = 600
+
+
+def get_engine_results() -> list[list[dict]]:
+    rnd = random.Random(0)
+    pool = [f"https://www{i % 40}.example.org/article/{i}?utm_source=x&id={i}" for i in range(URLS)]
+    return [
+        [
+            {
+                "url": url,
+                "title": f"title {url}",
+                "content": "Lorem ipsum dolor sit amet",
+                "thumbnail": url + "&thumb=1",
+            }
+            for url in rnd.sample(pool, RESULTS)
+        ]
+        for _ in range(ENGINES)
+    ]
+
+
+def search(engine_results: list[list[dict]]):
+    container = ResultContainer()
+
+    def on_result(result):
+        result.filter_urls(hostnames.filter_url_field)
+        return True
+
+    container.on_result = on_result
+    for i, results in enumerate(engine_results):
+        container.extend(f"engine{i}", [dict(r) for r in results])
+    container.close()
+    return container.get_ordered_results()
+
+
+def urlparse_calls(profile: cProfile.Profile) -> int:
+    stats = pstats.Stats(profile)
+    for (filename, _, name), (_, ncalls, *_) in stats.stats.items():  # type: ignore
+        if name == "urlparse" and filename == urllib.parse.__file__:
+            return ncalls
+    return 0
+
+
+def main():
+    metrics.initialize([f"engine{i}" for i in range(ENGINES)])
+    engine_results = get_engine_results()
+
+    urls.cache_clear()
+    for run in ("cold", "warm"):
+        profile = cProfile.Profile()
+        profile.runcall(search, engine_results)
+        print(f"{run}: urllib.parse.urlparse calls: {urlparse_calls(profile)}")
+    print(urls.cache_info())
+
+    number = 20
+    seconds = timeit.timeit(lambda: search(engine_results), number=number)
+    print(f"search ({ENGINES} engines x {RESULTS} results): {seconds / number * 1000:7.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,8 @@
 #!/usr/bin/env python
 # SPDX-License-Identifier: AGPL-3.0-or-later
 """Update :origin:`searx/data/external_bangs.json` using the duckduckgo bangs
-from :py:obj:`BANGS_URL`.
+from :py:obj:`BANGS_URL` and build the index
+:origin:`searx/data/external_bangs.bin` (:py:obj:`searx.external_bang.BangIndex`).
 
 - :origin:`CI Update data ... <.github/workflows/data-update.yml>`
 
@@ -9,7 +10,7 @@ from :py:obj:`BANGS_URL`.
 
 import json
 
-from searx.external_bang import LEAF_KEY
+from searx.external_bang import LEAF_KEY, INDEX_FILE, BangIndex, flatten_trie
 from searx.data import data_dir
 from searx.network import get as http_get
 
@@ -34,6 +35,12 @@ def main():
     }
     with DATA_FILE.open('w', encoding="utf8") as f:
         json.dump(output, f, indent=4, sort_keys=True, ensure_ascii=False)
+    write_index(trie)
+
+
+def write_index(trie):
+    print(f'write {INDEX_FILE}')
+    INDEX_FILE.write_bytes(BangIndex.build(flatten_trie(trie)))
 
 
 def merge_when_no_leaf(node):
@@ -59,6 +59,7 @@ setup(
             '*.msg',
             'search/checker/scheduler.lua',
             'data/*.json',
+            'data/*.bin',
             'data/*.txt',
             'data/*.ftz',
             'favicons/*.toml',
@@ -1,6 +1,8 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 # pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name
 
+import asyncio
+
 import httpx
 from mock import patch
 
@@ -196,6 +198,84 @@ class TestNetworkRequestRetries(SearxTestCase):
             await network.aclose()
 
 
+class FakeHedge:
+
+    def __init__(self, delay, allow=True):
+        self.delay = delay
+        self.allow = allow
+        self.acquired = 0
+        self.wins = 0
+
+    def acquire(self):
+        self.acquired += 1
+        return self.allow
+
+    def won(self):
+        self.wins += 1
+
+
+class TestNetworkHedgedRequest(SearxTestCase):
+
+    def setUp(self):
+        self.init_test_settings()
+
+    @staticmethod
+    def get_response(delays):
+        """The n-th request is answered after delays[n] seconds, the response
+        text is the number of the request."""
+        calls = []
+
+        async def request(*args, **kwargs):  # pylint: disable=unused-argument
+            n = len(calls)
+            calls.append(n)
+            await asyncio.sleep(delays[n])
+            return httpx.Response(status_code=200, text=str(n))
+
+        return request, calls
+
+    async def test_no_hedge(self):
+        request, calls = self.get_response([0])
+        hedge = FakeHedge(0.5)
+        with patch.object(httpx.AsyncClient, 'request', new=request):
+            network = Network(enable_http=True)
+            response = await network.request('GET', 'https://example.com/', hedge=hedge)
+            self.assertEqual(response.text, '0')
+            self.assertEqual((len(calls), hedge.acquired, hedge.wins), (1, 0, 0))
+            await network.aclose()
+
+    async def test_hedge_wins(self):
+        request, calls = self.get_response([1, 0])
+        hedge = FakeHedge(0.05)
+        with patch.object(httpx.AsyncClient, 'request', new=request):
+            network = Network(enable_http=True, local_addresses=['127.0.0.1', '127.0.0.2'])
+            response = await network.request('GET', 'https://example.com/', hedge=hedge)
+            self.assertEqual(response.text, '1')
+            self.assertEqual((len(calls), hedge.acquired, hedge.wins), (2, 1, 1))
+            # each request has used its own client (next local address of the cycle)
+            self.assertEqual(len(network._clients), 2)  # pylint: disable=protected-access
+            await network.aclose()
+
+    async def test_hedge_loses(self):
+        request, calls = self.get_response([0.1, 1])
+        hedge = FakeHedge(0.05)
+        with patch.object(httpx.AsyncClient, 'request', new=request):
+            network = Network(enable_http=True)
+            response = await network.request('GET', 'https://example.com/', hedge=hedge)
+            self.assertEqual(response.text, '0')
+            self.assertEqual((len(calls), hedge.acquired, hedge.wins), (2, 1, 0))
+            await network.aclose()
+
+    async def test_hedge_budget(self):
+        request, calls = self.get_response([0.1])
+        hedge = FakeHedge(0.05, allow=False)
+        with patch.object(httpx.AsyncClient, 'request', new=request):
+            network = Network(enable_http=True)
+            response = await network.request('GET', 'https://example.com/', hedge=hedge)
+            self.assertEqual(response.text, '0')
+            self.assertEqual((len(calls), hedge.acquired), (1, 1))
+            await network.aclose()
+
+
 class TestNetworkStreamRetries(SearxTestCase):
 
     TEXT = 'Lorem Ipsum'
@@ -0,0 +1,67 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name
+
+from datetime import datetime, timedelta
+
+import flask
+import sqlalchemy as sa
+
+from center_deep.models import SearchLog, User, db, rollups
+
+from tests import SearxTestCase
+
+
+class SearchRollupsTestCase(SearxTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.cd_app = flask.Flask(__name__)
+        self.cd_app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+        db.init_app(self.cd_app)
+        ctx = self.cd_app.app_context()
+        ctx.push()
+        self.addCleanup(ctx.pop)
+        db.create_all()
+        rollups.init()
+        self.addCleanup(db.drop_all)
+        self.addCleanup(db.session.remove)
+
+    def log(self, rows):
+        db.session.execute(SearchLog.__table__.insert(), rows)
+        rollups.update(db.session, rows)
+        db.session.commit()
+
+    def snapshot(self):
+        return {table.name: sorted(db.session.execute(sa.select(table)).all()) for table in rollups.tables}
+
+    def test_update_equals_rebuild(self):
+        start = datetime(2024, 1, 1, 22, 30)
+        for batch in range(4):
+            self.log(
+                [
+                    {
+                        'user_id': (i % 3) or None,
+                        'query': f'query {i % 5}',
+                        'timestamp': start + timedelta(minutes=47 * (batch * 10 + i)),
+                    }
+                    for i in range(10)
+                ]
+            )
+        updated = self.snapshot()
+        self.assertEqual(rollups.total_searches(), 40)
+        rollups.rebuild()
+        self.assertEqual(self.snapshot(), updated)
+
+    def test_delete_user(self):
+        user = User(username='test', email='test@example.org')
+        db.session.add(user)
+        db.session.commit()
+        self.log([{'user_id': user.id, 'query': 'test', 'timestamp': datetime(2024, 1, 1)}])
+        self.assertEqual(rollups.user_searches(user.id), 1)
+
+        db.session.delete(user)
+        rollups.delete_user(db.session, user.id)
+        db.session.commit()
+        self.assertEqual(rollups.user_searches(user.id), 0)
+        # the searches of the user are still counted
+        self.assertEqual(rollups.total_searches(), 1)
@@ -0,0 +1,104 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name
+
+import asyncio
+from unittest.mock import Mock, patch
+
+from center_deep.cache import ResultCache, normalize_key
+
+from tests import SearxTestCase
+
+RESPONSE = {'results': [{'url': 'https://example.org/'}]}
+
+
+class ResultCacheTestCase(SearxTestCase):
+
+    def test_normalize_key(self):
+        self.assertEqual(
+            normalize_key('  foo   bar ', pageno='2', categories='news, general'),
+            ('foo bar', 2, 'general,news', '', '0', ''),
+        )
+
+    def test_lru(self):
+        cache = ResultCache(maxsize=2)
+        cache.set(normalize_key('a'), RESPONSE)
+        cache.set(normalize_key('b'), RESPONSE)
+        self.assertIsNotNone(cache.get(normalize_key('a')))
+        cache.set(normalize_key('c'), RESPONSE)
+        # "b" is the least recently used
+        self.assertIsNone(cache.get(normalize_key('b')))
+        self.assertIsNotNone(cache.get(normalize_key('a')))
+        self.assertIsNotNone(cache.get(normalize_key('c')))
+        self.assertEqual(cache.counters['evictions'], 1)
+
+    def test_ttl(self):
+        cache = ResultCache(ttl=60)
+        key = normalize_key('a')
+        with patch('center_deep.cache.time.monotonic', return_value=1000):
+            cache.set(key, RESPONSE)
+        with patch('center_deep.cache.time.monotonic', return_value=1059):
+            self.assertEqual(cache.get(key), RESPONSE)
+        with patch('center_deep.cache.time.monotonic', return_value=1061):
+            self.assertIsNone(cache.get(key))
+        self.assertEqual(cache.counters['expired'], 1)
+
+    def test_category_ttl(self):
+        cache = ResultCache(ttl=300, category_ttl={'news': 60, 'images': 0})
+        self.assertEqual(cache.ttl_for(normalize_key('a', categories='general')), 300)
+        self.assertEqual(cache.ttl_for(normalize_key('a', categories='general,news')), 60)
+        # a TTL of 0 disables the cache of the category
+        key = normalize_key('a', categories='images')
+        cache.set(key, RESPONSE)
+        self.assertIsNone(cache.get(key))
+
+    def test_from_env(self):
+        cache = ResultCache.from_env(
+            {
+                'CENTER_DEEP_CACHE_TTL': '120',
+                'CENTER_DEEP_CACHE_TTL_SOCIAL_MEDIA': '30',
+                'CENTER_DEEP_CACHE_MAXSIZE': '8',
+            }
+        )
+        self.assertEqual((cache.ttl, cache.maxsize), (120, 8))
+        self.assertEqual(cache.category_ttl, {'social media': 30})
+        self.assertIsNone(ResultCache.from_env({'CENTER_DEEP_CACHE': '0'}))
+
+    def test_empty_response(self):
+        cache = ResultCache()
+        cache.set(normalize_key('a'), {'results': []})
+        self.assertIsNone(cache.get(normalize_key('a')))
+
+    def test_shared(self):
+        shared = Mock()
+        shared.get.return_value = RESPONSE
+        cache = ResultCache(shared=shared)
+        key = normalize_key('a')
+        self.assertEqual(cache.get(key), RESPONSE)
+        # the response of the shared tier is kept in the in-process tier
+        self.assertEqual(cache.get(key), RESPONSE)
+        self.assertEqual(shared.get.call_count, 1)
+        self.assertEqual((cache.counters['shared_hits'], cache.counters['hits']), (1, 1))
+
+    def test_shared_error(self):
+        shared = Mock()
+        shared.get.side_effect = ConnectionError
+        shared.set.side_effect = ConnectionError
+        cache = ResultCache(shared=shared)
+        key = normalize_key('a')
+        self.assertIsNone(cache.get(key))
+        cache.set(key, RESPONSE)
+        self.assertEqual(cache.counters['shared_errors'], 2)
+        self.assertEqual(cache.get(key), RESPONSE)
+
+    def test_async(self):
+        shared = Mock()
+        shared.get.return_value = None
+        cache = ResultCache(shared=shared)
+        key = normalize_key('a')
+        self.assertIsNone(asyncio.run(cache.aget(key)))
+        asyncio.run(cache.aset(key, RESPONSE))
+        shared.set.assert_called_once_with(key, RESPONSE, cache.ttl)
+        # served by the in-process tier
+        self.assertEqual(asyncio.run(cache.aget(key)), RESPONSE)
+        self.assertEqual(shared.get.call_count, 1)
+        self.assertEqual(cache.counters['misses'], 1)
@@ -0,0 +1,140 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name
+
+import threading
+import time
+from unittest.mock import Mock
+
+import flask
+import sqlalchemy as sa
+
+from center_deep.models import SearchLog, db
+from center_deep.searchlog import SearchLogWriter
+
+from tests import SearxTestCase
+
+
+class SearchLogWriterTestCase(SearxTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.cd_app = flask.Flask(__name__)
+        self.cd_app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+        db.init_app(self.cd_app)
+        ctx = self.cd_app.app_context()
+        ctx.push()
+        self.addCleanup(ctx.pop)
+        db.create_all()
+        self.addCleanup(db.drop_all)
+        self.addCleanup(db.session.remove)
+
+    def writer(self, **kwargs):
+        writer = SearchLogWriter(self.cd_app, db, SearchLog, **kwargs)
+        self.addCleanup(writer.close)
+        return writer
+
+    def block(self, writer):
+        """Blocks the thread of ``writer`` in ``write()`` until ``release`` is
+        set, ``started`` is set when the thread has taken its first batch"""
+        started, release = threading.Event(), threading.Event()
+        write = writer.write
+
+        def blocked_write(rows):
+            started.set()
+            release.wait(5)
+            write(rows)
+
+        writer.write = blocked_write
+        self.addCleanup(release.set)
+        return started, release
+
+    def fill(self, policy, **kwargs):
+        """Returns a writer with a full queue (``b``, ``c``) and ``a`` taken by
+        the blocked writer thread"""
+        writer = self.writer(queue_size=2, batch_size=1, policy=policy, **kwargs)
+        started, release = self.block(writer)
+        self.assertTrue(writer.log(query='a'))
+        self.assertTrue(started.wait(5))
+        self.assertTrue(writer.log(query='b'))
+        self.assertTrue(writer.log(query='c'))
+        return writer, release
+
+    def wait_for(self, predicate):
+        deadline = time.monotonic() + 5
+        while not predicate():
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+
+    def queries(self):
+        db.session.remove()
+        return [row.query for row in db.session.execute(sa.select(SearchLog).order_by(SearchLog.id)).scalars()]
+
+    def test_policy(self):
+        with self.assertRaises(ValueError):
+            self.writer(policy='drop_all')
+
+    def test_drop_newest(self):
+        writer, release = self.fill('drop_newest')
+        self.assertFalse(writer.log(query='d'))
+        self.assertEqual(writer.metrics()['dropped'], 1)
+        release.set()
+        writer.close()
+        self.assertEqual(self.queries(), ['a', 'b', 'c'])
+        self.assertEqual(writer.metrics()['written'], 3)
+
+    def test_drop_oldest(self):
+        writer, release = self.fill('drop_oldest')
+        self.assertTrue(writer.log(query='d'))
+        self.assertEqual(writer.metrics()['dropped'], 1)
+        release.set()
+        writer.close()
+        self.assertEqual(self.queries(), ['a', 'c', 'd'])
+        self.assertEqual(writer.metrics()['enqueued'], 4)
+
+    def test_block(self):
+        writer, release = self.fill('block', block_timeout=0.01)
+        self.assertFalse(writer.log(query='d'))
+        self.assertEqual(writer.metrics()['dropped'], 1)
+
+        # a slot is freed while the row waits for it
+        writer.block_timeout = 5
+        timer = threading.Timer(0.05, release.set)
+        timer.start()
+        self.addCleanup(timer.cancel)
+        self.assertTrue(writer.log(query='e'))
+        writer.close()
+        self.assertEqual(self.queries(), ['a', 'b', 'c', 'e'])
+        self.assertEqual(writer.metrics()['dropped'], 1)
+
+    def test_close(self):
+        writer = self.writer(batch_size=100, flush_interval=60)
+        for query in ('a', 'b', 'c'):
+            writer.log(query=query)
+        start = time.monotonic()
+        writer.close()
+        # the queued rows are written without waiting for the flush interval
+        self.assertLess(time.monotonic() - start, 5)
+        self.assertEqual(self.queries(), ['a', 'b', 'c'])
+        self.assertEqual((writer.metrics()['written'], writer.metrics()['queued']), (3, 0))
+        # rows logged after close() are dropped
+        self.assertFalse(writer.log(query='d'))
+        self.assertEqual(writer.metrics()['dropped'], 1)
+
+    def test_write_error(self):
+        rollups = Mock()
+        rollups.update.side_effect = RuntimeError('rollups')
+        writer = self.writer(batch_size=2, flush_interval=0.01, rollups=rollups)
+        writer.log(query='a')
+        writer.log(query='b')
+        self.wait_for(lambda: writer.metrics()['errors'] == 1)
+        # the INSERT of the rows has been rolled back with the rollups
+        self.assertEqual(self.queries(), [])
+
+        # the writer is still running
+        rollups.update.side_effect = None
+        writer.log(query='c')
+        self.wait_for(lambda: writer.metrics()['written'] == 1)
+        writer.close()
+        self.assertEqual(self.queries(), ['c'])
+        metrics = writer.metrics()
+        self.assertEqual((metrics['errors'], metrics['batches'], metrics['written']), (1, 1, 1))
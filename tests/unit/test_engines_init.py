@@ -18,6 +18,20 @@ class TestEnginesInit(SearxTestCase):
         self.assertIn('engine1', engines.engines)
         self.assertIn('engine2', engines.engines)
 
+    def test_engine_ranking(self):
+        engine_list = [
+            {'engine': 'dummy', 'name': 'engine1', 'shortcut': 'e1', 'categories': ['images', 'general']},
+            {'engine': 'dummy', 'name': 'engine2', 'shortcut': 'e2', 'weight': 2},
+        ]
+
+        engines.load_engines(engine_list)
+        self.assertEqual(engines.engine_ranking['engine1'], engines.EngineRanking(weight=1.0, category='images'))
+        self.assertEqual(engines.engine_ranking['engine2'], engines.EngineRanking(weight=2.0, category='general'))
+
+        # the table is rebuilt when the engines are loaded again
+        engines.load_engines(engine_list[1:])
+        self.assertEqual(list(engines.engine_ranking), ['engine2'])
+
     def test_initialize_engines_exclude_onions(self):
         settings['outgoing']['using_tor_proxy'] = False
         engine_list = [
@@ -1,11 +1,20 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 # pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name
 
+import random
+from unittest.mock import patch
+
+from searx.data import EXTERNAL_BANGS
 from searx.external_bang import (
     get_node,
+    get_bang_definition_and_ac,
     resolve_bang_definition,
     get_bang_url,
     get_bang_definition_and_autocomplete,
+    get_index,
+    flatten_trie,
+    BangIndex,
+    INDEX_FILE,
     LEAF_KEY,
 )
 from searx.search.models import EngineRef, SearchQuery
@@ -34,6 +43,32 @@ TEST_DB = {
 }
 
 
+def legacy_definition_and_autocomplete(bang, external_bangs_db):
+    """Lookup in the trie of the ``external_bangs.json`` (implementation before
+    the :py:obj:`BangIndex`)."""
+    bang_definition, bang_ac_list = get_bang_definition_and_ac(external_bangs_db, bang)
+
+    new_autocomplete = []
+    current = [*bang_ac_list]
+    done = set()
+    while len(current) > 0:
+        bang_ac = current.pop(0)
+        done.add(bang_ac)
+
+        current_bang_definition, current_bang_ac_list = get_bang_definition_and_ac(external_bangs_db, bang_ac)
+        if current_bang_definition:
+            _, order = resolve_bang_definition(current_bang_definition, '')
+            new_autocomplete.append((bang_ac, order))
+        for new_bang in current_bang_ac_list:
+            if new_bang not in done and new_bang not in current:
+                current.append(new_bang)
+
+    new_autocomplete.sort(key=lambda t: (-t[1], t[0]))
+    if not isinstance(bang_definition, str):
+        bang_definition = None
+    return bang_definition, [name for name, _ in new_autocomplete]
+
+
 class TestGetNode(SearxTestCase):
 
     DB = {  # pylint:disable=invalid-name
@@ -124,3 +159,63 @@ class TestExternalBangJson(SearxTestCase):
     def test_actual_data(self):
         google_url = get_bang_url(SearchQuery('test', engineref_list=[], external_bang='g'))
         self.assertEqual(google_url, 'https://www.google.com/search?q=test')
+
+
+class TestBangIndex(SearxTestCase):
+
+    def test_db_index_memoized(self):
+        with patch.object(BangIndex, 'from_trie', wraps=BangIndex.from_trie) as from_trie:
+            db = {'trie': dict(TEST_DB['trie'])}
+            for _ in range(3):
+                get_bang_definition_and_autocomplete('exam', external_bangs_db=db)
+            self.assertEqual(from_trie.call_count, 1)
+            # another db with the same content
+            get_bang_definition_and_autocomplete('exam', external_bangs_db={'trie': dict(TEST_DB['trie'])})
+            self.assertEqual(from_trie.call_count, 2)
+            # a BangIndex is used as it is
+            index = BangIndex.from_trie(TEST_DB['trie'])
+            url = get_bang_url(SearchQuery('test', engineref_list=[], external_bang='example'), external_bangs_db=index)
+            self.assertEqual(url, 'https://example.com/test')
+            self.assertEqual(from_trie.call_count, 3)
+
+    def test_index(self):
+        index = BangIndex.from_trie(TEST_DB['trie'])
+        self.assertEqual(len(index), 7)
+        self.assertEqual(index.get('search'), 'search' + chr(2) + chr(1) + '0')
+        self.assertIsNone(index.get('searc'))
+        self.assertIsNone(index.get('error'))
+        self.assertEqual(index.prefixed('seas'), ['seascapes', 'season'])
+        self.assertEqual(index.prefixed('x'), [])
+
+    def test_rank(self):
+        index = BangIndex(
+            BangIndex.build(
+                {'ab': 'ab' + chr(2) + chr(1) + '1', 'abc': 'abc' + chr(2) + chr(1) + '5', 'abd': 'x' + chr(1)}
+            )
+        )
+        self.assertEqual(index.autocomplete('a'), ['abc', 'ab', 'abd'])
+        self.assertEqual(index.autocomplete('ab'), ['abc', 'abd'])
+
+    def test_unicode(self):
+        bangs = {name: name + chr(2) + chr(1) for name in ['été', 'étè', 'z', 'ä']}
+        index = BangIndex(BangIndex.build(bangs))
+        self.assertEqual(index.get('été'), bangs['été'])
+        self.assertEqual(index.prefixed('ét'), ['étè', 'été'])
+        self.assertEqual(index.prefixed(''), sorted(bangs))
+
+    def test_index_file(self):
+        # searx/data/external_bangs.bin has to be rebuilt with the JSON file
+        self.assertEqual(INDEX_FILE.read_bytes(), BangIndex.build(flatten_trie(EXTERNAL_BANGS['trie'])))
+
+    def test_equivalence(self):
+        index = get_index()
+        rnd = random.Random(42)
+        bangs = index.prefixed('')
+        samples = ['', 'g', 'dd', 'zzzzz', 'duckduckgo', 'wikipedia', 'x'] + rnd.sample(bangs, 200)
+        samples += [bang[: rnd.randint(1, len(bang))] for bang in rnd.sample(bangs, 200)]
+        samples += [bang + 'q' for bang in rnd.sample(bangs, 50)]
+        for bang in samples:
+            if not bang:
+                continue
+            expected = legacy_definition_and_autocomplete(bang, EXTERNAL_BANGS)
+            self.assertEqual((index.get(bang), index.autocomplete(bang)), expected, bang)
@@ -0,0 +1,158 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name,protected-access
+
+import hashlib
+import tempfile
+from unittest.mock import Mock, patch
+
+from searx.favicons import cache
+
+from tests import SearxTestCase
+
+
+class FaviconCacheSQLiteTestCase(SearxTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.tmp = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(self.tmp.cleanup)
+        self.cfg = cache.FaviconCacheConfig(db_url=self.tmp.name + "/faviconcache.db", WRITE_FLUSH_INTERVAL=0.05)
+        self.cache = cache.FaviconCacheSQLite(self.cfg)
+        self.addCleanup(self.cache.close)
+
+    def test_set(self):
+        self.assertIsNone(self.cache("duckduckgo", "example.org"))
+        self.assertTrue(self.cache.set("duckduckgo", "example.org", "image/png", b"PNG"))
+        # served from the queue until it is written
+        self.assertEqual(self.cache("duckduckgo", "example.org"), (b"PNG", "image/png"))
+        self.cache.flush()
+        self.assertEqual(self.cache._pending, {})
+        self.assertEqual(self.cache("duckduckgo", "example.org"), (b"PNG", "image/png"))
+        self.assertEqual(self.cache.state().favicons, 1)
+
+    def test_fallback_icon(self):
+        self.assertTrue(self.cache.set("duckduckgo", "example.org", None, None))
+        self.assertEqual(self.cache("duckduckgo", "example.org"), (None, None))
+        self.cache.flush()
+        self.assertEqual(self.cache("duckduckgo", "example.org"), (None, None))
+        self.assertEqual(self.cache.state().favicons, 0)
+
+    def test_batch(self):
+        with patch.object(self.cache, '_write', wraps=self.cache._write) as write:
+            for i in range(10):
+                self.cache.set("duckduckgo", f"{i}.example.org", "image/png", b"PNG %d" % i)
+            self.cache.flush()
+        self.assertLess(write.call_count, 10)
+        self.assertEqual(self.cache.state().domains, 10)
+
+    def test_reject(self):
+        self.assertFalse(self.cache.set("duckduckgo", "example.org", None, b"PNG"))
+        self.assertFalse(self.cache.set("duckduckgo", "example.org", "image/png", b"x" * (self.cfg.BLOB_MAX_BYTES + 1)))
+        self.assertEqual(self.cache._pending, {})
+
+    def test_queue_size(self):
+        self.cfg.WRITE_QUEUE_SIZE = 0
+        self.assertFalse(self.cache.set("duckduckgo", "example.org", "image/png", b"PNG"))
+        self.assertIsNone(self.cache("duckduckgo", "example.org"))
+
+    def test_maintenance(self):
+        with patch.object(self.cache, 'maintenance') as maintenance:
+            self.cache.set("duckduckgo", "example.org", "image/png", b"PNG")
+            self.cache.flush()
+        maintenance.assert_called_once_with()
+
+    def test_maintenance_off(self):
+        self.cfg.MAINTENANCE_MODE = "off"
+        with patch.object(self.cache, 'maintenance') as maintenance:
+            self.cache.set("duckduckgo", "example.org", "image/png", b"PNG")
+            self.cache.flush()
+        maintenance.assert_not_called()
+
+    def test_close(self):
+        self.cache.set("duckduckgo", "example.org", "image/png", b"PNG")
+        thread = self.cache._writer_thread
+        self.cache.close()
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(self.cache._writer_pid, 0)
+        # a new writer is started on demand
+        self.cache.set("duckduckgo", "example.com", "image/png", b"PNG")
+        self.cache.flush()
+        self.assertEqual(self.cache.state().domains, 2)
+
+    def test_connect_error(self):
+        self.setattr4test(self.cache, 'WRITER_MIN_BACKOFF', 0.01)
+        connect = self.cache.connect
+        with patch.object(self.cache, 'connect', side_effect=[OSError("disk I/O error"), connect()]) as mock:
+            self.cache.set("duckduckgo", "example.org", "image/png", b"PNG")
+            # the favicon is dropped, flush() does not block
+            self.cache.flush()
+            self.cache.set("duckduckgo", "example.com", "image/png", b"PNG")
+            self.cache.flush()
+        self.assertEqual(mock.call_count, 2)
+        self.assertTrue(self.cache._writer_thread.is_alive())
+        self.assertEqual(self.cache._pending, {})
+        self.assertEqual(self.cache("duckduckgo", "example.com"), (b"PNG", "image/png"))
+
+    def test_hot_cache(self):
+        self.cache.set("duckduckgo", "example.org", "image/png", b"PNG")
+        self.cache.flush()
+        self.cache.hot = cache.FaviconHotCache(self.cfg.MEM_LIMIT_BYTES, self.cfg.NEGATIVE_TTL)
+        db = Mock(wraps=self.cache.DB)
+        with patch.object(cache.FaviconCacheSQLite, 'DB', new=property(lambda _: db)):
+            self.assertEqual(self.cache("duckduckgo", "example.org"), (b"PNG", "image/png"))
+            self.assertEqual(self.cache("duckduckgo", "example.org"), (b"PNG", "image/png"))
+            self.assertEqual(db.execute.call_count, 1)
+
+    def test_sha256(self):
+        sha256 = hashlib.sha256(b"PNG").hexdigest()
+        self.cache.set("duckduckgo", "example.org", "image/png", b"PNG")
+        self.assertEqual(self.cache.get("duckduckgo", "example.org"), (b"PNG", "image/png", sha256))
+        self.cache.flush()
+        self.cache.hot = cache.FaviconHotCache(self.cfg.MEM_LIMIT_BYTES, self.cfg.NEGATIVE_TTL)
+        # from the DB
+        self.assertEqual(self.cache.get("duckduckgo", "example.org"), (b"PNG", "image/png", sha256))
+        self.cache.set("duckduckgo", "example.com", None, None)
+        self.assertEqual(self.cache.get("duckduckgo", "example.com"), (None, None, None))
+
+
+class FaviconHotCacheTestCase(SearxTestCase):
+
+    def test_lru(self):
+        size = 100 + cache.FaviconHotCache.ENTRY_OVERHEAD + len("image/png")
+        hot = cache.FaviconHotCache(limit_bytes=2 * size, negative_ttl=60)
+        hot.set("r", "a", "image/png", b"a" * 100, "sha")
+        hot.set("r", "b", "image/png", b"b" * 100, "sha")
+        self.assertIsNotNone(hot.get("r", "a"))
+        hot.set("r", "c", "image/png", b"c" * 100, "sha")
+        # "b" is the least recently used
+        self.assertIsNone(hot.get("r", "b"))
+        self.assertEqual(hot.get("r", "a"), (b"a" * 100, "image/png", "sha"))
+        self.assertEqual(hot.get("r", "c"), (b"c" * 100, "image/png", "sha"))
+        self.assertEqual(hot.bytes_c, 2 * size)
+
+    def test_replace(self):
+        hot = cache.FaviconHotCache(limit_bytes=1024, negative_ttl=60)
+        hot.set("r", "a", "image/png", b"a" * 100, "sha")
+        hot.set("r", "a", "image/png", b"a" * 10, "sha")
+        self.assertEqual(len(hot), 1)
+        self.assertEqual(hot.bytes_c, 10 + len("image/png") + hot.ENTRY_OVERHEAD)
+
+    def test_too_big(self):
+        hot = cache.FaviconHotCache(limit_bytes=100, negative_ttl=60)
+        hot.set("r", "a", "image/png", b"a" * 100, "sha")
+        self.assertIsNone(hot.get("r", "a"))
+        self.assertEqual(hot.bytes_c, 0)
+
+    def test_negative_ttl(self):
+        hot = cache.FaviconHotCache(limit_bytes=1024, negative_ttl=60)
+        hot.set("r", "a", None, None, None)
+        self.assertEqual(hot.get("r", "a"), (None, None, None))
+        hot.negative_ttl = -1
+        hot.set("r", "a", None, None, None)
+        self.assertIsNone(hot.get("r", "a"))
+        self.assertEqual(hot.bytes_c, 0)
+
+    def test_disabled(self):
+        hot = cache.FaviconHotCache(limit_bytes=0, negative_ttl=60)
+        hot.set("r", "a", "image/png", b"a", "sha")
+        self.assertIsNone(hot.get("r", "a"))
@@ -0,0 +1,87 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name,protected-access
+
+import random
+import re
+
+from parameterized import parameterized
+
+from searx.intent import DispatchStats, IntentMatcher, QueryIntent, first_keyword
+
+from tests import SearxTestCase
+
+TRIGGERS = {
+    "number": r"\d",
+    "start": r"^foo",
+    "end": r"bar$",
+    "word": r"(?<![a-z])(?:in|to)(?![a-z])",
+    "case": re.compile(r"hello", re.I),
+    "group": r"(?P<x>ab)+c",
+}
+
+
+class IntentMatcherTestCase(SearxTestCase):
+
+    @parameterized.expand(
+        [
+            ("", None),
+            ("   ", None),
+            ("ip", "ip"),
+            ("  sha256  foo", "sha256"),
+        ]
+    )
+    def test_first_keyword(self, query, keyword):
+        self.assertEqual(first_keyword(query), keyword)
+
+    def test_match(self):
+        matcher = IntentMatcher(TRIGGERS)
+        self.assertEqual(set(matcher._by_literal), {"foo", "bar", "ab"})
+        self.assertEqual(
+            matcher.match("foo 12 in HeLLo"),
+            QueryIntent("foo", frozenset(["number", "start", "word", "case"])),
+        )
+        self.assertEqual(matcher.match(""), QueryIntent(None, frozenset()))
+        self.assertEqual(matcher.match("x ababc bar").triggers, frozenset(["group", "end"]))
+
+    def test_no_triggers(self):
+        self.assertEqual(IntentMatcher().match("a b"), QueryIntent("a", frozenset()))
+
+    def test_literals(self):
+        # overlapping literals and literals which are prefixes of each other
+        matcher = IntentMatcher({"ab": r"ab", "bc": r"bc\b", "a": r"a", "abc": r"abc", "other": r"xy"})
+        self.assertEqual(matcher._always, [])
+        self.assertEqual(matcher.match("abc").triggers, frozenset(["ab", "bc", "a", "abc"]))
+        self.assertEqual(matcher.match("bcd").triggers, frozenset())
+
+    def test_no_literal(self):
+        matcher = IntentMatcher({"ref": r"(a)\1", "verbose": re.compile(r"a b", re.X), "number": r"\d"})
+        self.assertEqual([name for name, _ in matcher._always], ["verbose", "number"])
+        self.assertEqual(matcher.match("aa 1 ab").triggers, frozenset(["ref", "verbose", "number"]))
+        self.assertEqual(matcher.match("a b").triggers, frozenset())
+
+    def test_equivalence(self):
+        rnd = random.Random(42)
+        matcher = IntentMatcher(TRIGGERS)
+        words = ["foo", "bar", "in", "to", "into", "hello", "HELLO", "abc", "ababc", "1", "x", "\n"]
+        for _ in range(2000):
+            query = " ".join(rnd.choice(words) for _ in range(rnd.randint(0, 5)))
+            expected = frozenset(name for name, p in matcher.patterns.items() if p.search(query))
+            self.assertEqual(matcher.match(query).triggers, expected, query)
+
+
+class DispatchStatsTestCase(SearxTestCase):
+
+    def test_stats(self):
+        stats = DispatchStats()
+        with stats.observe("a"):
+            pass
+        with self.assertRaises(ValueError):
+            with stats.observe("a"):
+                raise ValueError()
+        stats.skip("a")
+        stats.skip("b")
+        result = stats.get()
+        self.assertEqual(result["a"]["count"], 2)
+        self.assertEqual(result["a"]["skipped"], 1)
+        self.assertGreaterEqual(result["a"]["time"], 0)
+        self.assertEqual(result["b"], {"count": 0, "skipped": 1, "time": 0.0})
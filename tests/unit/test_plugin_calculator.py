@@ -1,12 +1,15 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
-# pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name
+# pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name,protected-access
 
+import ast
 import warnings
+from unittest import mock
 
 from parameterized.parameterized import parameterized
 
 import searx.plugins
 import searx.preferences
+from searx.plugins import calculator
 
 from searx.extended_types import sxng_request
 from searx.result_types import Answer
@@ -97,3 +100,74 @@ class PluginCalculator(SearxTestCase):
             sxng_request.preferences = self.pref
             search = do_post_search(query, self.storage)
             self.assertEqual(list(search.result_container.answers), [])
+
+    @parameterized.expand(
+        [
+            ("1+1", True),
+            ("pi", True),
+            ("2xe", True),
+            ("pi:2", True),
+            ("lorem ipsum", False),
+            ("epic", False),
+            ("hello world", False),
+        ]
+    )
+    def test_trigger(self, query, expected):
+        (plugin,) = self.storage.plugin_list
+        self.assertEqual(bool(plugin.trigger.search(query)), expected)
+
+
+class EvaluatorTestCase(SearxTestCase):
+
+    def setUp(self):
+        super().setUp()
+        calculator.CACHE.clear()
+        self.addCleanup(calculator.CACHE.clear)
+
+    @parameterized.expand(["1+1", "2*pi", "-e", "1<2", "7 % 3 * 2", "1e3 / 4"])
+    def test_trivial_no_ipc(self, expr):
+        self.assertTrue(calculator.is_trivial(ast.parse(expr, mode="eval")))
+        with mock.patch.object(calculator, "get_pool") as get_pool:
+            self.assertEqual(calculator.evaluate(expr), calculator._eval_expr(expr))
+        get_pool.assert_not_called()
+
+    @parameterized.expand(["2**10", "1<<3", "foo", "'a'", "f(1)"])
+    def test_not_trivial(self, expr):
+        self.assertFalse(calculator.is_trivial(ast.parse(expr, mode="eval")))
+
+    def test_syntax_error(self):
+        self.assertEqual(calculator.evaluate("1+"), ("", False))
+
+    def test_cache(self):
+        with mock.patch.object(calculator, "_safe_eval_expr", return_value=(2, False)) as func:
+            self.assertEqual(calculator.evaluate("1+1"), (2, False))
+            self.assertEqual(calculator.evaluate("1+1"), (2, False))
+        func.assert_called_once()
+
+    def test_pool(self):
+        pool = calculator.EvaluatorPool(size=1, max_tasks=2)
+        self.addCleanup(pool.close)
+        self.assertEqual(pool.evaluate("2**10", timeout=5), (1024, False))
+
+        (worker,) = list(pool._idle.queue)  # pylint: disable=protected-access
+        pool.evaluate("2**3", timeout=5)
+        # max_tasks is reached: the worker is replaced
+        self.assertIsNot(list(pool._idle.queue)[0], worker)  # pylint: disable=protected-access
+
+    def test_pool_timeout(self):
+        pool = calculator.EvaluatorPool(size=1)
+        self.addCleanup(pool.close)
+        (worker,) = list(pool._idle.queue)  # pylint: disable=protected-access
+        self.assertIsNone(pool.evaluate("9**9**9**9", timeout=0.05))
+
+        # the stuck worker is killed and replaced
+        (new_worker,) = list(pool._idle.queue)  # pylint: disable=protected-access
+        self.assertIsNot(new_worker, worker)
+        self.assertEqual(pool.evaluate("2**4", timeout=5), (16, False))
+
+    def test_pool_busy(self):
+        pool = calculator.EvaluatorPool(size=0)
+        with mock.patch.object(calculator, "get_pool", return_value=pool):
+            self.assertIsNone(calculator.evaluate("2**4"))
+        # a busy pool is not cached
+        self.assertIs(calculator.CACHE.get("2**4"), calculator._UNKNOWN)
@@ -0,0 +1,99 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name
+
+import random
+import re
+from unittest import mock
+
+import searx.plugins
+from searx import settings
+from searx.plugins import hostnames
+from searx.result_types import LegacyResult
+
+from tests import SearxTestCase
+
+RULES = [
+    r"(.*\.)?youtube\.com$",
+    r"^(.*\.)?youtu\.be$",
+    r"^example\.org$",
+    r"(.*\.)?facebook.com$",
+    r"(.*\.)?google(\..*)?$",
+    r"^mirror[0-9]+\.",
+    r"(a)\1",
+    r"(?i)^UPPER\.example\.com$",
+    r"example\.com$",
+    r"wiki",
+]
+
+HOSTNAMES = [
+    "www.youtube.com", "youtube.com", "notyoutube.com", "youtube.com.evil", "youtu.be", "m.youtu.be", "xyoutu.be",
+    "example.org", "www.example.org", "facebook.com", "facebookxcom", "www.google.de", "google", "mirror1.example.net",
+    "mirror.example.net", "aa.example.net", "upper.example.com", "UPPER.example.com", "www.example.com",
+    "en.wikipedia.org", "example.com:8080", "youtube.com\n",
+]  # fmt: skip
+
+
+class HostnameRulesTest(SearxTestCase):
+
+    def test_match(self):
+        rules = hostnames.HostnameRules({r"(.*\.)?youtube\.com$": "yt.example.com", r"youtube": "other.example.com"})
+        rule = rules.match("www.youtube.com")
+        self.assertEqual(rule.pattern.pattern, r"(.*\.)?youtube\.com$")
+        self.assertEqual(rule.replacement, "yt.example.com")
+        self.assertEqual(rules.match("youtube.example.org").replacement, "other.example.com")
+        self.assertIsNone(rules.match("example.org"))
+        self.assertIsNone(hostnames.HostnameRules().match("example.org"))
+
+    def test_equivalence(self):
+        rnd = random.Random(42)
+        for _ in range(200):
+            rule_list = rnd.sample(RULES, rnd.randint(1, len(RULES)))
+            rules = hostnames.HostnameRules(rule_list)
+            for hostname in HOSTNAMES:
+                expected = next((p for p in rule_list if re.search(p, hostname)), None)
+                rule = rules.match(hostname)
+                self.assertEqual(rule and rule.pattern.pattern, expected, (rule_list, hostname))
+
+
+class PluginHostnamesTest(SearxTestCase):
+
+    def init_plugin(self, cfg):
+        with mock.patch.dict(settings, {"hostnames": cfg}):
+            storage = searx.plugins.PluginStorage()
+            storage.load_settings({"searx.plugins.hostnames.SXNGPlugin": {"active": True}})
+            storage.init(self.app)
+        return storage
+
+    def test_on_result(self):
+        storage = self.init_plugin(
+            {
+                "replace": {r"(.*\.)?youtube\.com$": "invidious.example.com"},
+                "remove": [r"(.*\.)?facebook\.com$"],
+                "low_priority": [r"(.*\.)?google(\..*)?$"],
+                "high_priority": [r"(.*\.)?wikipedia\.org$"],
+            }
+        )
+        (plugin,) = storage.plugin_list
+
+        def on_result(url):
+            result = LegacyResult(url=url, title="title")
+            result.normalize_result_fields()
+            return plugin.on_result(None, None, result), result  # type: ignore
+
+        self.assertFalse(on_result("https://www.facebook.com/x")[0])
+
+        keep, result = on_result("https://www.youtube.com/watch?v=1")
+        self.assertTrue(keep)
+        self.assertEqual(result.url, "https://invidious.example.com/watch?v=1")
+
+        self.assertEqual(on_result("https://www.google.com/")[1].priority, "low")
+        self.assertEqual(on_result("https://en.wikipedia.org/")[1].priority, "high")
+
+    def test_rebuild(self):
+        self.init_plugin({"remove": [r"(.*\.)?facebook\.com$"]})
+        remove = hostnames.REMOVE
+        self.init_plugin({"remove": [r"(.*\.)?facebook\.com$"]})
+        self.assertIs(hostnames.REMOVE, remove)
+        self.init_plugin({"remove": [r"(.*\.)?twitter\.com$"]})
+        self.assertIsNot(hostnames.REMOVE, remove)
+        self.assertTrue(hostnames.REMOVE.match("twitter.com"))
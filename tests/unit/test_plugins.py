@@ -105,3 +105,32 @@ class PluginStorage(SearxTestCase):
                 Result(),
             )
             self.assertFalse(ret)
+
+    def test_dispatch(self):
+        keyword_plg = PluginMock("plg003", "keyword plugin", True)
+        keyword_plg.keywords = ["kw"]
+        trigger_plg = PluginMock("plg004", "trigger plugin", True)
+        trigger_plg.trigger = r"\d"
+        self.storage.register(keyword_plg)
+        self.storage.register(trigger_plg)
+        all_ids = [p.id for p in self.storage]
+
+        def dispatch(query, plugin_ids=all_ids):
+            return sorted(p.id for p in self.storage.dispatch(query, plugin_ids))
+
+        self.assertEqual(dispatch("lorem"), ["plg001", "plg002"])
+        self.assertEqual(dispatch("kw lorem"), ["plg001", "plg002", "plg003"])
+        self.assertEqual(dispatch("kw 42"), ["plg001", "plg002", "plg003", "plg004"])
+        self.assertEqual(dispatch("lorem 42", ["plg001", "plg004"]), ["plg001", "plg004"])
+
+        stats = self.storage.stats.get()
+        self.assertEqual(stats["plg003"]["skipped"], 1)
+        self.assertEqual(stats["plg004"]["skipped"], 2)
+
+    def test_post_search_stats(self):
+        with self.app.test_request_context():
+            sxng_request.preferences = self.pref
+            do_post_search("lorem", self.storage, user_plugins=["plg001"])
+        stats = self.storage.stats.get()
+        self.assertEqual(stats["plg001"]["count"], 1)
+        self.assertNotIn("plg002", stats)
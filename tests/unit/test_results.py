@@ -1,12 +1,37 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 # pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name
+import random
+from unittest import mock
 
+import searx.engines
 
 from searx.result_types import LegacyResult
-from searx.results import ResultContainer
+from searx.results import ResultContainer, calculate_score, calculate_scores, group_results
 from tests import SearxTestCase
 
 
+def group_results_legacy(results, key, max_count=8, max_distance=20):
+    """The quadratic grouping of ResultContainer.get_ordered_results (reference
+    implementation)."""
+    gresults = []
+    categoryPositions = {}
+    for res in results:
+        category = key(res)
+        grp = categoryPositions.get(category)
+        if (grp is not None) and (grp["count"] > 0) and (len(gresults) - grp["index"] < max_distance):
+            index = grp["index"]
+            gresults.insert(index, res)
+            for item in categoryPositions.values():
+                v = item["index"]
+                if v >= index:
+                    item["index"] = v + 1
+            grp["count"] -= 1
+        else:
+            gresults.append(res)
+            categoryPositions[category] = {"index": len(gresults), "count": max_count}
+    return gresults
+
+
 class ResultContainerTestCase(SearxTestCase):
     # pylint: disable=use-dict-literal
 
@@ -58,3 +83,119 @@ class ResultContainerTestCase(SearxTestCase):
         self.assertIn(result, result_list)
         self.assertEqual(result_list[0].title, result.title)
         self.assertEqual(result_list[0].content, result.content)
+
+    def test_on_extend(self):
+        deltas = []
+        container = ResultContainer()
+        container.on_extend = lambda engine_name, delta: deltas.append((engine_name, dict(delta)))
+
+        container.extend(
+            "google", [dict(url="https://example.org", title="title", content="Lorem .."), dict(suggestion="lorem")]
+        )
+        container.extend("duckduckgo", [dict(url="http://example.org", title="title ..", content="Lorem ipsum ..")])
+        container.extend("duckduckgo", [])
+
+        self.assertEqual([engine_name for engine_name, _ in deltas], ["google", "duckduckgo"])
+        self.assertEqual(deltas[0][1]["suggestions"], ["lorem"])
+        # the result of duckduckgo is merged into the result of google
+        merged = deltas[1][1]["results"][0]
+        self.assertIs(merged, deltas[0][1]["results"][0])
+        self.assertEqual(merged.engines, {"google", "duckduckgo"})
+
+    def test_on_extend_lock(self):
+        # the listener serializes the delta while no other thread can merge
+        container = ResultContainer()
+        owned = []
+        container.on_extend = lambda engine_name, delta: owned.append(
+            container._lock._is_owned()  # pylint: disable=protected-access
+        )
+        container.extend("google", [dict(url="https://example.org", title="title", content="Lorem ..")])
+        self.assertEqual(owned, [True])
+
+    def test_staging(self):
+        def extend(container):
+            container.extend("google", [dict(url="https://example.org", title="title", content="Lorem ..")])
+            container.extend("google", [dict(infobox="Example", id="https://example.org", content="Lorem")])
+            container.extend("duckduckgo", [dict(url="http://example.org", title="title ..", content="Lorem ipsum")])
+            container.extend("duckduckgo", [dict(infobox="Example", id="https://example.org", content="Lorem ipsum")])
+
+        container = ResultContainer(staging=True)
+        extend(container)
+        # nothing is merged before close
+        self.assertEqual(container.main_results_map, {})
+        self.assertEqual(container.infoboxes, [])
+        container.close()
+
+        expected = ResultContainer()
+        extend(expected)
+        expected.close()
+
+        self.assertEqual(container.get_ordered_results(), expected.get_ordered_results())
+        result = container.get_ordered_results()[0]
+        self.assertEqual(result.engines, {"google", "duckduckgo"})
+        self.assertEqual(result.positions, [1, 1])
+        self.assertEqual(result.score, expected.get_ordered_results()[0].score)
+        self.assertEqual(len(container.infoboxes), 1)
+        self.assertEqual(container.infoboxes[0]["content"], "Lorem ipsum")
+
+        # results are ignored when the container is closed
+        container.extend("google", [dict(url="https://example.com", title="title", content="Lorem ..")])
+        container.close()
+        self.assertEqual(len(container.get_ordered_results()), 1)
+
+    def test_staging_on_extend(self):
+        deltas = []
+        container = ResultContainer(staging=True)
+        container.on_extend = lambda engine_name, delta: deltas.append(delta)
+        container.extend("google", [dict(url="https://example.org", title="title", content="Lorem ..")])
+        # with a listener, the results are merged when they arrive
+        self.assertEqual(len(container.main_results_map), 1)
+        self.assertEqual(len(deltas[0]["results"]), 1)
+
+
+class CalculateScoresTestCase(SearxTestCase):
+
+    def test_equivalence(self):
+        rnd = random.Random(42)
+        ranking = {
+            name: searx.engines.EngineRanking(weight=rnd.choice([0.5, 1.0, 1.3, 3.0]), category="general")
+            for name in ("engine1", "engine2", "engine3", "engine4")
+        }
+        results = []
+        for i in range(1000):
+            result = LegacyResult(url=f"https://example.org/{i}", title="title")
+            # engine5 is not in the ranking table
+            result.engines = set(rnd.sample(["engine1", "engine2", "engine3", "engine4", "engine5"], rnd.randint(1, 5)))
+            result.positions = [rnd.randint(1, 20) for _ in range(rnd.randint(1, 5))]
+            result.priority = rnd.choice(["", "", "high", "low"])
+            results.append(result)
+
+        with mock.patch.dict(searx.engines.engine_ranking, ranking, clear=True):
+            self.assertEqual(calculate_scores(results), [calculate_score(r, r.priority) for r in results])
+
+
+class GroupResultsTestCase(SearxTestCase):
+
+    def test_group(self):
+        results = [("general", 0), ("images", 1), ("general", 2), ("images", 3), ("videos", 4)]
+        self.assertEqual(
+            group_results(results, key=lambda res: res[0]),
+            [("general", 0), ("general", 2), ("images", 1), ("images", 3), ("videos", 4)],
+        )
+
+    def test_equivalence(self):
+        rnd = random.Random(42)
+        for _ in range(500):
+            categories = [f"cat{i}" for i in range(rnd.randint(1, 8))]
+            weights = [rnd.random() for _ in categories]
+            results = [(i, rnd.choices(categories, weights)[0]) for i in range(rnd.randint(0, 200))]
+            max_count = rnd.randint(1, 10)
+            max_distance = rnd.randint(1, 30)
+
+            def key(res):
+                return res[1]
+
+            self.assertEqual(
+                group_results(results, key, max_count, max_distance),
+                group_results_legacy(results, key, max_count, max_distance),
+            )
@@ -1,9 +1,16 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 # pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name
 
+import threading
+import time
 from copy import copy
+from unittest.mock import patch
 
 import searx.search
+from searx.search import singleflight
+from searx.search.singleflight import flight_key
+from searx.search import timeouts
+from searx.search.timeouts import get_engine_timeout
 from searx.search.models import SearchQuery, EngineRef
 from searx import settings
 from tests import SearxTestCase
@@ -118,3 +125,200 @@ class SearchTestCase(SearxTestCase):
             results = search.search()
         # This should not redirect
         self.assertIsNone(results.redirect_url)
+
+    def test_fanout_asyncio(self):
+        settings['outgoing']['max_request_timeout'] = None
+        settings['search']['fanout'] = 'asyncio'
+        search_query = SearchQuery(
+            'test', [EngineRef(PUBLIC_ENGINE_NAME, 'general')], 'en-US', SAFESEARCH, PAGENO, None, None
+        )
+        search = searx.search.Search(search_query)
+        with self.app.test_request_context('/search'):
+            results = search.search()
+        self.assertEqual(search.actual_timeout, 3.0)
+        self.assertEqual(results.unresponsive_engines, set())
+        self.assertEqual([timing.engine for timing in results.timings], [PUBLIC_ENGINE_NAME])
+
+    def test_fanout_asyncio_timeout(self):
+        settings['outgoing']['max_request_timeout'] = None
+        settings['search']['fanout'] = 'asyncio'
+        processor = searx.search.PROCESSORS[PUBLIC_ENGINE_NAME]
+        search_offline = processor.search
+
+        def slow_search(*args):
+            time.sleep(0.5)
+            search_offline(*args)
+
+        search_query = SearchQuery(
+            'test', [EngineRef(PUBLIC_ENGINE_NAME, 'general')], 'en-US', SAFESEARCH, PAGENO, None, 0.1
+        )
+        search = searx.search.Search(search_query)
+        with self.app.test_request_context('/search'), patch.object(processor, 'search', slow_search):
+            results = search.search()
+        self.assertEqual(search.actual_timeout, 0.1)
+        self.assertEqual([engine.error_type for engine in results.unresponsive_engines], ['timeout'])
+        # the late answer of the engine is not added to the results
+        time.sleep(0.6)
+        self.assertEqual(results.timings, [])
+
+    def test_timeout_adaptive(self):
+        settings['outgoing']['max_request_timeout'] = None
+        settings['outgoing']['adaptive_timeout'].update({'enabled': True, 'min_timeout': 0.5})
+        search_query = SearchQuery(
+            'test', [EngineRef(PUBLIC_ENGINE_NAME, 'general')], 'en-US', SAFESEARCH, PAGENO, None, None
+        )
+        # not enough observations: static timeout of the engine
+        self.assertEqual(get_engine_timeout(PUBLIC_ENGINE_NAME), 3.0)
+
+        for _ in range(20):
+            timeouts.observe(PUBLIC_ENGINE_NAME, 0.4)
+        # p95 0.4 * 1.5
+        self.assertEqual(get_engine_timeout(PUBLIC_ENGINE_NAME), 0.6)
+        search = searx.search.Search(search_query)
+        with self.app.test_request_context('/search'):
+            search.search()
+        self.assertEqual(search.actual_timeout, 0.6)
+
+        # clamped to the static timeout of the engine
+        for _ in range(100):
+            timeouts.observe(PUBLIC_ENGINE_NAME, 2.95)
+        self.assertEqual(get_engine_timeout(PUBLIC_ENGINE_NAME), 3.0)
+
+    def test_timeout_adaptive_recovers(self):
+        settings['outgoing']['max_request_timeout'] = None
+        settings['outgoing']['adaptive_timeout'].update(
+            {'enabled': True, 'min_timeout': 0.1, 'min_observations': 10, 'window': 10}
+        )
+        processor = searx.search.PROCESSORS[PUBLIC_ENGINE_NAME]
+        search_offline = processor.search
+
+        def slow_search(*args):
+            time.sleep(0.6)
+            search_offline(*args)
+
+        search_query = SearchQuery(
+            'test', [EngineRef(PUBLIC_ENGINE_NAME, 'general')], 'en-US', SAFESEARCH, PAGENO, None, None
+        )
+        # the engine is fast
+        for _ in range(10):
+            timeouts.observe(PUBLIC_ENGINE_NAME, 0.2)
+        self.assertEqual(get_engine_timeout(PUBLIC_ENGINE_NAME), 0.3)
+
+        # the engine becomes slow: the search times out and the timeout is
+        # observed at the deadline
+        search = searx.search.Search(search_query)
+        with self.app.test_request_context('/search'), patch.object(processor, 'search', slow_search):
+            results = search.search()
+        self.assertEqual(search.actual_timeout, 0.3)
+        self.assertEqual([engine.error_type for engine in results.unresponsive_engines], ['timeout'])
+        # p95 of the window is the deadline: 0.3 * 1.5
+        self.assertEqual(get_engine_timeout(PUBLIC_ENGINE_NAME), 0.45)
+
+        # each timeout raises the timeout by the factor up to the static timeout
+        timeout = get_engine_timeout(PUBLIC_ENGINE_NAME)
+        for _ in range(10):
+            timeouts.observe(PUBLIC_ENGINE_NAME, timeout)
+            self.assertGreater(get_engine_timeout(PUBLIC_ENGINE_NAME), timeout)
+            timeout = get_engine_timeout(PUBLIC_ENGINE_NAME)
+            if timeout == 3.0:
+                break
+        self.assertEqual(timeout, 3.0)
+
+        # the timeouts leave the window when the engine is fast again
+        for _ in range(10):
+            timeouts.observe(PUBLIC_ENGINE_NAME, 0.2)
+        self.assertEqual(get_engine_timeout(PUBLIC_ENGINE_NAME), 0.3)
+
+
+class SingleFlightTestCase(SearxTestCase):
+
+    def setUp(self):
+        super().setUp()
+        settings['search']['single_flight'] = True
+        self.processor = searx.search.PROCESSORS[PUBLIC_ENGINE_NAME]
+        self.calls = []
+        search_offline = self.processor.search
+
+        def slow_search(query, *args):
+            self.calls.append(query)
+            time.sleep(0.3)
+            search_offline(query, *args)
+
+        patcher = patch.object(self.processor, 'search', slow_search)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def run_searches(self, queries, timeout_limit=None):
+        searches = [
+            searx.search.Search(
+                SearchQuery(
+                    query, [EngineRef(PUBLIC_ENGINE_NAME, 'general')], 'en-US', SAFESEARCH, PAGENO, None, timeout_limit
+                )
+            )
+            for query in queries
+        ]
+
+        def run(search):
+            with self.app.test_request_context('/search'):
+                search.search()
+
+        threads = [threading.Thread(target=run, args=(search,)) for search in searches]
+        for thread in threads:
+            thread.start()
+            time.sleep(0.02)
+        for thread in threads:
+            thread.join(5)
+        return searches
+
+    def test_coalesce(self):
+        searches = self.run_searches(['test', 'test', 'test'])
+        self.assertEqual(self.calls, ['test'])
+
+        results = [search.result_container.get_ordered_results() for search in searches]
+        self.assertTrue(results[0])
+        for search, result in zip(searches[1:], results[1:]):
+            self.assertEqual([r.url for r in result], [r.url for r in results[0]])
+            # each search has its own copy of the results
+            self.assertIsNot(result[0], results[0][0])
+            self.assertEqual(search.actual_timeout, 3.0)
+            self.assertEqual([timing.engine for timing in search.result_container.timings], [PUBLIC_ENGINE_NAME])
+
+    def test_follower_timeout(self):
+        # the follower waits for the timeout of the search (timeout_limit,
+        # max_request_timeout), not for the timeout of the engines
+        settings['outgoing']['max_request_timeout'] = None
+        waits = []
+
+        def wait(flight, timeout):
+            waits.append(timeout)
+            return flight._done.wait(timeout)  # pylint: disable=protected-access
+
+        with patch.object(singleflight.Flight, 'wait', autospec=True, side_effect=wait):
+            self.run_searches(['test', 'test'], timeout_limit=0.5)
+        self.assertEqual(waits, [0.5 + singleflight.WAIT_GRACE])
+        self.assertEqual(self.calls, ['test'])
+
+        waits.clear()
+        settings['outgoing']['max_request_timeout'] = 0.4
+        with patch.object(singleflight.Flight, 'wait', autospec=True, side_effect=wait):
+            self.run_searches(['test', 'test'])
+        self.assertEqual(waits, [0.4 + singleflight.WAIT_GRACE])
+
+    def test_different_queries(self):
+        self.run_searches(['test', 'other'])
+        self.assertEqual(sorted(self.calls), ['other', 'test'])
+
+    def test_disabled(self):
+        settings['search']['single_flight'] = False
+        self.run_searches(['test', 'test'])
+        self.assertEqual(self.calls, ['test', 'test'])
+
+    def test_flight_key(self):
+        sq = SearchQuery('test', [EngineRef(PUBLIC_ENGINE_NAME, 'general')], 'en-US', 0, 1, None, None)
+        other = copy(sq)
+        self.assertEqual(flight_key(sq), flight_key(other))
+        other.engine_data = {PUBLIC_ENGINE_NAME: {'token': 'x'}}
+        self.assertNotEqual(flight_key(sq), flight_key(other))
+        other = copy(sq)
+        other.pageno = 2
+        self.assertNotEqual(flight_key(sq), flight_key(other))
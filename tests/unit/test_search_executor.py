@@ -0,0 +1,126 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name
+
+import threading
+import time
+from concurrent.futures import wait
+from timeit import default_timer
+from unittest.mock import patch
+
+import searx.search
+from searx import engines, settings
+from searx.metrics import counter, histogram
+from searx.search import executor
+from searx.search.executor import EngineExecutor
+from searx.search.models import EngineRef, SearchQuery
+from searx.search.processors import PROCESSORS
+
+from tests import SearxTestCase
+
+TEST_ENGINE_NAME = "dummy engine"  # from the ./settings/test_settings.yml
+
+
+class EngineExecutorTestCase(SearxTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.executor = EngineExecutor(4)
+        self.addCleanup(self.executor._pool.shutdown)  # pylint: disable=protected-access
+
+    def submit(self, func, *args, deadline=None, timed_out=None):
+        deadline = default_timer() + 10 if deadline is None else deadline
+        return self.executor.submit(TEST_ENGINE_NAME, deadline, timed_out or threading.Event(), func, *args)
+
+    def test_result(self):
+        future = self.submit(lambda a, b: a + b, 1, 2)
+        self.assertEqual(future.result(1), 3)
+        self.assertEqual(histogram('engine', TEST_ENGINE_NAME, 'time', 'queue').count, 1)
+
+    def test_exception(self):
+        def fail():
+            raise ValueError('fail')
+
+        with self.assertRaises(ValueError):
+            self.submit(fail).result(1)
+
+    def test_max_concurrency(self):
+        self.setattr4test(engines.engines[TEST_ENGINE_NAME], 'max_concurrency', 2)
+        lock = threading.Lock()
+        release = threading.Event()
+        running = []
+        max_running = []
+
+        def job():
+            with lock:
+                running.append(1)
+                max_running.append(len(running))
+            release.wait(2)
+            with lock:
+                running.pop()
+
+        futures = [self.submit(job) for _ in range(5)]
+        self.assertEqual(self.executor.stats()['waiting'], {TEST_ENGINE_NAME: 3})
+        release.set()
+        wait(futures, 2)
+        self.assertEqual(max(max_running), 2)
+        self.assertEqual(self.executor.stats()['running'], {})
+
+    def test_deadline(self):
+        self.setattr4test(engines.engines[TEST_ENGINE_NAME], 'max_concurrency', 1)
+        release = threading.Event()
+        calls = []
+
+        first = self.submit(release.wait, 2)
+        queued = self.submit(calls.append, 'late', deadline=default_timer() + 0.05)
+        threading.Timer(0.1, release.set).start()
+        first.result(2)
+        wait([queued], 1)
+        self.assertTrue(queued.cancelled())
+        self.assertEqual(calls, [])
+        self.assertEqual(counter('engine', TEST_ENGINE_NAME, 'search', 'count', 'expired'), 1)
+
+    def test_timed_out_event(self):
+        timed_out = threading.Event()
+        timed_out.set()
+        future = self.submit(
+            lambda: threading.current_thread()._timeout_event.is_set(),  # pylint: disable=protected-access
+            timed_out=timed_out,
+        )
+        self.assertTrue(future.result(1))
+
+
+class ExecutorPoolSizeTestCase(SearxTestCase):
+
+    def test_default_pool_size(self):
+        self.setattr4test(executor, 'MIN_POOL_SIZE', 1)
+        self.setattr4test(executor, '_EXECUTOR', None)
+        self.assertEqual(executor.get_executor().max_workers, executor.POOL_SIZE_PER_ENGINE * len(engines.engines))
+
+    def test_pool_size(self):
+        settings['search']['fanout_pool_size'] = 3
+        self.setattr4test(executor, '_EXECUTOR', None)
+        self.assertEqual(executor.get_executor().max_workers, 3)
+
+    def test_more_engines_than_threads(self):
+        pool = EngineExecutor(2)
+        self.addCleanup(pool._pool.shutdown)  # pylint: disable=protected-access
+        self.setattr4test(executor, '_EXECUTOR', pool)
+        settings['search']['single_flight'] = False
+        settings['search']['prefetch']['enabled'] = False
+        calls = []
+
+        def search(*args):  # pylint: disable=unused-argument
+            time.sleep(0.1)
+            calls.append(1)
+
+        engineref_list = [EngineRef(TEST_ENGINE_NAME, 'general')] * 6
+        search_query = SearchQuery('test', engineref_list, 'en-US', 0, 1, None, 1.0)
+        with patch.object(PROCESSORS[TEST_ENGINE_NAME], 'search', side_effect=search):
+            with self.app.test_request_context('/search'):
+                start = default_timer()
+                result_container = searx.search.Search(search_query).search()
+                elapsed = default_timer() - start
+        # the jobs queue up in the two threads and finish before the deadline
+        self.assertEqual(len(calls), 6)
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(result_container.unresponsive_engines, set())
@@ -0,0 +1,41 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name
+
+from searx.metrics import counter, histogram_observe
+from searx.search.hedge import HedgePolicy, MIN_OBSERVATIONS
+
+from tests import SearxTestCase
+
+TEST_ENGINE_NAME = "dummy engine"  # from the ./settings/test_settings.yml
+
+
+class HedgePolicyTestCase(SearxTestCase):
+
+    def observe(self, count, value):
+        for _ in range(count):
+            histogram_observe(value, 'engine', TEST_ENGINE_NAME, 'time', 'http')
+
+    def test_min_observations(self):
+        policy = HedgePolicy(TEST_ENGINE_NAME)
+        self.observe(MIN_OBSERVATIONS - 1, 0.5)
+        self.assertIsNone(policy.hedge())
+        self.observe(1, 0.5)
+        self.assertAlmostEqual(policy.hedge().delay, 0.5)
+
+    def test_percentile(self):
+        policy = HedgePolicy(TEST_ENGINE_NAME, percentile=90)
+        self.observe(90, 0.35)
+        self.observe(10, 2.0)
+        self.assertAlmostEqual(policy.hedge().delay, 0.3)
+
+    def test_budget(self):
+        policy = HedgePolicy(TEST_ENGINE_NAME, max_ratio=0.1)
+        self.observe(MIN_OBSERVATIONS, 0.5)
+        acquired = 0
+        for _ in range(100):
+            hedge = policy.hedge()
+            acquired += hedge.acquire()
+        # the initial token + one token per 10 requests
+        self.assertEqual(acquired, 11)
+        self.assertEqual(counter('engine', TEST_ENGINE_NAME, 'hedge', 'count', 'sent'), 11)
+        self.assertEqual(counter('engine', TEST_ENGINE_NAME, 'hedge', 'count', 'skipped'), 89)
@@ -0,0 +1,181 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name,protected-access
+
+from unittest.mock import Mock, patch
+
+from searx import settings
+from searx.engines import engines
+from searx.exceptions import SearxEngineCaptchaException
+from searx.metrics import counter
+from searx.results import ResultContainer
+from searx.search import prefetch
+from searx.search.models import EngineRef, SearchQuery
+from searx.search.processors import PROCESSORS, online
+
+from tests import SearxTestCase
+
+TEST_ENGINE_NAME = "dummy engine"  # from the ./settings/test_settings.yml
+
+
+class PrefetchCacheTestCase(SearxTestCase):
+
+    def test_reserve(self):
+        cache = prefetch.PrefetchCache()
+        self.assertTrue(cache.reserve('a'))
+        self.assertFalse(cache.reserve('a'))
+        cache.release('a', [1], 60)
+        self.assertFalse(cache.reserve('a'))
+        self.assertEqual(cache.pop('a'), [1])
+        self.assertIsNone(cache.pop('a'))
+        self.assertTrue(cache.reserve('a'))
+
+    def test_ttl(self):
+        cache = prefetch.PrefetchCache()
+        cache.reserve('a')
+        cache.release('a', [1], -1)
+        self.assertTrue(cache.reserve('a'))
+        cache.release('a', [1], -1)
+        self.assertIsNone(cache.pop('a'))
+
+    def test_empty_results(self):
+        cache = prefetch.PrefetchCache()
+        cache.reserve('a')
+        cache.release('a', [], 60)
+        self.assertIsNone(cache.pop('a'))
+
+    def test_max_entries(self):
+        cache = prefetch.PrefetchCache(max_entries=2)
+        for key in 'abc':
+            cache.reserve(key)
+            cache.release(key, [key], 60)
+        self.assertIsNone(cache.pop('a'))
+        self.assertEqual(cache.pop('c'), ['c'])
+
+
+class PrefetcherTestCase(SearxTestCase):
+
+    def setUp(self):
+        super().setUp()
+        settings['search']['prefetch']['enabled'] = True
+        self.prefetcher = prefetch.Prefetcher(max_jobs=1, max_load=0.5, ttl=60)
+        self.setattr4test(prefetch, '_PREFETCHER', self.prefetcher)
+
+        self.engine = engines[TEST_ENGINE_NAME]
+        self.setattr4test(self.engine, 'paging', True)
+        self.results = [{'url': 'https://example.org/', 'title': 'example', 'content': 'example'}]
+        # the dummy engine is an offline engine, add request & response
+        for name, func in (('request', Mock(side_effect=self._request)), ('response', Mock(return_value=self.results))):
+            setattr(self.engine, name, func)
+            self.addCleanup(delattr, self.engine, name)
+
+        self.processor = online.OnlineProcessor(self.engine, TEST_ENGINE_NAME)
+        self.processor._send_http_request = Mock()
+        self.addCleanup(PROCESSORS.__setitem__, TEST_ENGINE_NAME, PROCESSORS[TEST_ENGINE_NAME])
+        PROCESSORS[TEST_ENGINE_NAME] = self.processor
+
+    @staticmethod
+    def _request(query, params):  # pylint: disable=unused-argument
+        params['url'] = 'https://example.org/search?p=%s' % params['pageno']
+
+    def search_query(self, pageno=1):
+        return SearchQuery('test', [EngineRef(TEST_ENGINE_NAME, 'general')], 'all', 0, pageno, None, None, None)
+
+    def search(self, pageno):
+        params = self.processor.get_params(self.search_query(pageno), 'general')
+        result_container = Mock()
+        self.processor.search('test', params, result_container, 0, 3.0)
+        return result_container.extend.call_args.args[1]
+
+    def wait(self):
+        self.prefetcher._pool.submit(lambda: None).result()
+
+    def test_prefetch(self):
+        prefetch.schedule(self.search_query(), ResultContainer())
+        self.wait()
+        self.assertEqual(counter('engine', TEST_ENGINE_NAME, 'prefetch', 'count', 'sent'), 1)
+        self.assertEqual(self.processor._send_http_request.call_args.args[0]['pageno'], 2)
+
+        self.assertEqual(self.search(2), self.results)
+        self.assertEqual(self.processor._send_http_request.call_count, 1)
+        self.assertEqual(counter('engine', TEST_ENGINE_NAME, 'prefetch', 'count', 'hit'), 1)
+
+        # a prefetched page is used once
+        self.search(2)
+        self.assertEqual(self.processor._send_http_request.call_count, 2)
+
+    def test_only_first_page(self):
+        prefetch.schedule(self.search_query(pageno=2), ResultContainer())
+        self.wait()
+        self.processor._send_http_request.assert_not_called()
+
+    def test_no_paging(self):
+        self.engine.paging = False
+        self.assertEqual(self.prefetcher.schedule(self.search_query(), ResultContainer()), 0)
+
+    def test_unresponsive_engine(self):
+        result_container = ResultContainer()
+        result_container.add_unresponsive_engine(TEST_ENGINE_NAME, 'timeout')
+        self.assertEqual(self.prefetcher.schedule(self.search_query(), result_container), 0)
+
+    def test_engine_data(self):
+        result_container = ResultContainer()
+        result_container.engine_data[TEST_ENGINE_NAME]['next_page'] = 'token'
+        self.prefetcher.schedule(self.search_query(), result_container)
+        self.wait()
+        params = self.processor._send_http_request.call_args.args[0]
+        self.assertEqual(params['engine_data'], {'next_page': 'token'})
+
+    def test_admission(self):
+        busy = {'max_workers': 4, 'running': {'other engine': 3}, 'waiting': {}}
+        with patch('searx.search.executor.EngineExecutor.stats', return_value=busy):
+            self.assertEqual(self.prefetcher.schedule(self.search_query(), ResultContainer()), 0)
+        waiting = {'max_workers': 4, 'running': {'other engine': 1}, 'waiting': {'other engine': 1}}
+        with patch('searx.search.executor.EngineExecutor.stats', return_value=waiting):
+            self.assertEqual(self.prefetcher.schedule(self.search_query(), ResultContainer()), 0)
+        idle = {'max_workers': 4, 'running': {'other engine': 1}, 'waiting': {}}
+        with patch('searx.search.executor.EngineExecutor.stats', return_value=idle):
+            self.assertEqual(self.prefetcher.schedule(self.search_query(), ResultContainer()), 1)
+
+    def test_engine_max_concurrency(self):
+        # an engine at its max_concurrency does not stop the prefetch of the
+        # other engines
+        search_query = SearchQuery(
+            'test',
+            [EngineRef(TEST_ENGINE_NAME, 'general'), EngineRef(TEST_ENGINE_NAME, 'news')],
+            'all',
+            0,
+            1,
+            None,
+            None,
+            None,
+        )
+        with patch.object(self.prefetcher, 'admit', side_effect=[False, True]):
+            self.assertEqual(self.prefetcher.schedule(search_query, ResultContainer()), 1)
+        self.wait()
+        self.assertEqual(self.processor._send_http_request.call_args.args[0]['category'], 'news')
+
+    def test_suspend(self):
+        self.processor._send_http_request.side_effect = SearxEngineCaptchaException()
+        self.addCleanup(self.processor.suspended_status.resume)
+        prefetch.schedule(self.search_query(), ResultContainer())
+        self.wait()
+        self.assertTrue(self.processor.suspended_status.is_suspended)
+        self.assertEqual(counter('engine', TEST_ENGINE_NAME, 'prefetch', 'count', 'sent'), 0)
+
+    def test_error(self):
+        self.processor._send_http_request.side_effect = ValueError()
+        prefetch.schedule(self.search_query(), ResultContainer())
+        self.wait()
+        self.assertFalse(self.processor.suspended_status.is_suspended)
+
+    def test_max_jobs(self):
+        self.prefetcher._slots.acquire()  # pylint: disable=consider-using-with
+        self.addCleanup(self.prefetcher._slots.release)
+        self.assertEqual(self.prefetcher.schedule(self.search_query(), ResultContainer()), 0)
+        # the page is not reserved
+        self.assertEqual(self.prefetcher.cache._pending, set())
+
+    def test_disabled(self):
+        settings['search']['prefetch']['enabled'] = False
+        prefetch.schedule(self.search_query(), ResultContainer())
+        self.processor._send_http_request.assert_not_called()
@@ -0,0 +1,112 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name
+
+import tempfile
+from unittest.mock import Mock
+
+from searx import settings
+from searx.engines import engines
+from searx.metrics import counter, counter_inc, get_engines_stats
+from searx.search import response_cache
+from searx.search.models import EngineRef, SearchQuery
+from searx.search.processors import online
+
+from tests import SearxTestCase
+
+TEST_ENGINE_NAME = "dummy engine"  # from the ./settings/test_settings.yml
+
+
+class ResponseCacheTestCase(SearxTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.tmp = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(self.tmp.cleanup)
+        settings['search']['response_cache']['enabled'] = True
+        cache = response_cache.ResponseCacheSQLite(300, 100 * 1024, db_url=self.tmp.name + "/response_cache.db")
+        self.setattr4test(response_cache, '_CACHE', cache)
+
+        self.engine = engines[TEST_ENGINE_NAME]
+        self.results = [{'url': 'https://example.org/', 'title': 'example', 'content': 'example'}]
+        # the dummy engine is an offline engine, add request & response
+        for name, func in (('request', Mock(side_effect=self._request)), ('response', Mock(return_value=self.results))):
+            setattr(self.engine, name, func)
+            self.addCleanup(delattr, self.engine, name)
+        self.processor = online.OnlineProcessor(self.engine, TEST_ENGINE_NAME)
+        self.processor._send_http_request = Mock()  # pylint: disable=protected-access
+
+    @staticmethod
+    def _request(query, params):  # pylint: disable=unused-argument
+        params['url'] = 'https://example.org/search'
+
+    def search(self, query='test', safesearch=0):
+        search_query = SearchQuery(
+            query, [EngineRef(TEST_ENGINE_NAME, 'general')], 'all', safesearch, 1, None, None, None
+        )
+        params = self.processor.get_params(search_query, 'general')
+        result_container = Mock()
+        self.processor.search(query, params, result_container, 0, 3.0)
+        result_container.extend.assert_called_once()
+        return result_container.extend.call_args.args[1]
+
+    def test_hit(self):
+        self.assertEqual(self.search(), self.results)
+        self.assertEqual(self.search(), self.results)
+        self.assertEqual(self.processor._send_http_request.call_count, 1)  # pylint: disable=protected-access
+        self.assertEqual(self.engine.response.call_count, 1)
+        self.assertEqual(counter('engine', TEST_ENGINE_NAME, 'cache', 'count', 'hit'), 1)
+        self.assertEqual(counter('engine', TEST_ENGINE_NAME, 'cache', 'count', 'miss'), 1)
+
+    def test_key(self):
+        self.search()
+        self.search(query='other query')
+        self.search(safesearch=2)
+        self.assertEqual(self.engine.response.call_count, 3)
+        self.assertEqual(counter('engine', TEST_ENGINE_NAME, 'cache', 'count', 'hit'), 0)
+
+    def test_empty_results(self):
+        self.engine.response.return_value = []
+        self.search()
+        self.search()
+        self.assertEqual(self.engine.response.call_count, 2)
+
+    def test_max_value_size(self):
+        self.setattr4test(response_cache, '_CACHE', response_cache.ResponseCacheSQLite(300, 10, db_url=":memory:"))
+        self.search()
+        self.search()
+        self.assertEqual(self.engine.response.call_count, 2)
+
+    def test_engine_opt_out(self):
+        self.setattr4test(self.engine, 'response_cache', False)
+        self.processor = online.OnlineProcessor(self.engine, TEST_ENGINE_NAME)
+        self.processor._send_http_request = Mock()  # pylint: disable=protected-access
+        self.search()
+        self.search()
+        self.assertEqual(self.engine.response.call_count, 2)
+        self.assertEqual(counter('engine', TEST_ENGINE_NAME, 'cache', 'count', 'miss'), 0)
+
+    def test_disabled(self):
+        settings['search']['response_cache']['enabled'] = False
+        self.assertIsNone(response_cache.get_cache())
+        self.search()
+        self.search()
+        self.assertEqual(self.engine.response.call_count, 2)
+
+    def test_stats(self):
+        for _ in range(3):
+            counter_inc('engine', TEST_ENGINE_NAME, 'search', 'count', 'sent')
+            self.search()
+        stats = {s['name']: s for s in get_engines_stats([TEST_ENGINE_NAME])['time']}
+        self.assertEqual(stats[TEST_ENGINE_NAME]['cache_hit_count'], 2)
+        self.assertEqual(stats[TEST_ENGINE_NAME]['cache_hit_rate'], 67)
+
+    def test_valkey(self):
+        client = Mock()
+        store = {}
+        client.set.side_effect = lambda key, value, ex: store.__setitem__(key, value)
+        client.get.side_effect = store.get
+        self.setattr4test(response_cache, '_CACHE', response_cache.ResponseCacheValkey(300, 100 * 1024, client))
+        self.assertEqual(self.search(), self.results)
+        self.assertEqual(self.search(), self.results)
+        self.assertEqual(self.engine.response.call_count, 1)
+        self.assertEqual(client.set.call_args.kwargs['ex'], 300)
@@ -0,0 +1,117 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name
+
+import random
+import re
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
+
+from searx.data.tracker_patterns import TrackerPatternsMatcher
+from searx.regexutils import required_literal
+from tests import SearxTestCase
+
+RULES = [
+    (
+        r"^https?:\/\/(?:[a-z0-9-]+\.)*?amazon(?:\.[a-z]{2,}){1,}",
+        [r"^https?:\/\/(?:[a-z0-9-]+\.)*?amazon(?:\.[a-z]{2,}){1,}\/gp\/.*"],
+        ["pf_rd_[a-zA-Z]", "qid", "sr", "ref_?"],
+    ),
+    (
+        r"^https?:\/\/(?:[a-z0-9-]+\.)*?google(?:\.[a-z]{2,}){1,}",
+        [r"^https?:\/\/mail\.google\.com\/mail\/u\/", r"^https?:\/\/(?:docs|accounts)\.google(?:\.[a-z]{2,}){1,}"],
+        ["ved", "bi[a-z]*", "gfe_[a-z]*", "ei", "source", "gs_[a-z]*", "site", "oq", "esrc", "uact", "cd", "sxsrf"],
+    ),
+    (r"^https?:\/\/(?:[a-z0-9-]+\.)*?youtube\.com", [], ["feature", "gclid", "kw", "si", "pp"]),
+    (
+        r"^https?:\/\/(?:[a-z0-9-]+\.)*?facebook\.com",
+        [r"^https?:\/\/(?:[a-z0-9-]+\.)*?facebook\.com\/(?:login_alerts|ajax)"],
+        [r"hc_[a-z_%\[\]0-9]*", "[a-z]*ref[a-z]*", "__tn__", "eid", r"__(?:xts|cft)__(?:\[[0-9]\])?"],
+    ),
+    (r"^https?:\/\/(?:[a-z0-9-]+\.)*?twitter.com", [], ["(?:ref_?)?src", "s", "cn", "ref_url", "t"]),
+    (
+        r".*",
+        [r"^https?:\/\/(?:[a-z0-9-]+\.)*?matrix\.org\/_matrix\/", r"^https?:\/\/(?:[a-z0-9-]+\.)*?prismic\.io\/.*"],
+        ["(?:%3F)?utm(?:_[a-z_]*)?", "(?:%3F)?ga_[a-z_]+", "(?:%3F)?yclid", "(?:%3F)?fbclid", "(?:%3F)?mc_[a-z]+"],
+    ),
+    (r"^https?:\/\/(?:[a-z0-9-]+\.)*?(?:ebay|shop)\.[a-z]+", [], ["_trkparms", "_trksid", "_from", "hash"]),
+    (r"^https?:\/\/.*", [], ["(?:%3F)?__twitter_impression"]),
+    # global flags and backreferences can't be combined into one alternation
+    (r"(?i)^https?://(?:www\.)?EXAMPLE\.org", [r"(a)\1"], ["(?i)ID", "id"]),
+]
+
+# fmt: off
+HOSTS = [
+    "www.amazon.com", "smile.amazon.de", "www.google.com", "mail.google.com", "docs.google.fr", "www.youtube.com",
+    "m.facebook.com", "twitter.com", "www.ebay.com", "example.org", "www.example.org", "matrix.org", "foo.prismic.io",
+    "shop.example", "notamazon.example.com",
+]
+PATHS = ["/", "/gp/product/1", "/url", "/search", "/mail/u/0", "/watch", "/ajax/x", "/_matrix/client", "/a b"]
+ARGS = [
+    "utm_source=x", "utm_medium=y", "ved=1", "q=rain", "ref=abc", "ref_=abc", "qid=2", "sr=8-1", "feature=share",
+    "si=1", "fbclid=3", "gclid=4", "id=5", "ID=6", "s=20", "t=1", "_trksid=9", "hc_ref=1", "x=a%20b", "x=a+b",
+    "ga_source=1", "%3Futm_campaign=1", "mc_cid=1", "__twitter_impression=true", "v=dQw4w9WgXcQ", "utm_source=x",
+]
+# fmt: on
+
+
+def clean_url_legacy(rules, url):
+    """TrackerPatternsDB.clean_url before the rules have been compiled
+    (reference implementation)."""
+    new_url = url
+    parsed_new_url = urlparse(url=new_url)
+
+    for rule in rules:
+        if not re.match(rule[0], new_url):
+            continue
+        do_ignore = False
+        for pattern in rule[1]:
+            if re.match(pattern, new_url):
+                do_ignore = True
+                break
+        if do_ignore:
+            continue
+
+        query_args = list(parse_qsl(parsed_new_url.query))
+        for name, val in query_args.copy():
+            for pattern in rule[2]:
+                if re.match(pattern, name):
+                    query_args.remove((name, val))
+
+        parsed_new_url = parsed_new_url._replace(query=urlencode(query_args))
+        new_url = urlunparse(parsed_new_url)
+
+    return new_url
+
+
+class TestTrackerPatterns(SearxTestCase):
+
+    def test_required_literal(self):
+        self.assertEqual(required_literal(r"^https?:\/\/(?:[a-z0-9-]+\.)*?amazon(?:\.[a-z]{2,}){1,}"), "amazon")
+        self.assertEqual(required_literal(r"^https?://(www\.)?google\.com/url\?"), "google.com/url?")
+        self.assertEqual(required_literal(r"(?:ebay|shop)\.com"), ".com")
+        self.assertEqual(required_literal(r".*"), "")
+        self.assertEqual(required_literal(r"(?i)^https?://example"), "")
+        self.assertEqual(required_literal(r"(invalid"), "")
+
+    def test_clean_url(self):
+        matcher = TrackerPatternsMatcher(RULES)
+        url = "https://www.amazon.com/dp/1?qid=2&sr=8-1&keywords=rain&utm_source=x"
+        self.assertEqual(matcher.clean_url(url), "https://www.amazon.com/dp/1?keywords=rain")
+        # exception of the amazon rule, but not of the global rule
+        url = "https://www.amazon.com/gp/product/1?qid=2&utm_source=x"
+        self.assertEqual(matcher.clean_url(url), "https://www.amazon.com/gp/product/1?qid=2")
+
+    def test_equivalence(self):
+        matcher = TrackerPatternsMatcher(RULES)
+        rnd = random.Random(42)
+        for _ in range(3000):
+            query = "&".join(rnd.sample(ARGS, rnd.randint(0, 6)))
+            url = f"{rnd.choice(['http', 'https'])}://{rnd.choice(HOSTS)}{rnd.choice(PATHS)}"
+            if query:
+                url += "?" + query
+            try:
+                expected = clean_url_legacy(RULES, url)
+            except ValueError as exc:
+                with self.assertRaises(type(exc)):
+                    matcher.clean_url(url)
+                continue
+            self.assertEqual(matcher.clean_url(url), expected, url)
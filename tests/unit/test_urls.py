@@ -0,0 +1,35 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name
+
+from urllib.parse import urlparse
+
+from searx import urls
+from searx.result_types import MainResult
+from tests import SearxTestCase
+
+
+class TestURLs(SearxTestCase):
+
+    def test_parse_url(self):
+        url = "https://example.org/path;params?q=1#fragment"
+        self.assertEqual(urls.parse_url(url), urlparse(url))
+        # the same (immutable) ParseResult is shared
+        self.assertIs(urls.parse_url(url), urls.parse_url(url))
+
+    def test_parse_url_long(self):
+        url = "data:image/png;base64," + "A" * urls.MAX_CACHED_URL_LENGTH
+        self.assertEqual(urls.parse_url(url), urlparse(url))
+        self.assertIsNot(urls.parse_url(url), urls.parse_url(url))
+
+    def test_normalize_url(self):
+        parsed_url, url = urls.normalize_url("//example.org/path?q=1")
+        self.assertEqual(parsed_url.scheme, "http")
+        self.assertEqual(url, "http://example.org/path?q=1")
+        self.assertEqual(urls.normalize_parsed_url(urlparse("//example.org/path?q=1")), (parsed_url, url))
+
+    def test_result(self):
+        results = [MainResult(url="https://example.org/a"), MainResult(url="https://example.org/a")]
+        for result in results:
+            result.normalize_result_fields()
+        self.assertIs(results[0].parsed_url, results[1].parsed_url)
+        self.assertEqual(hash(results[0]), hash(results[1]))
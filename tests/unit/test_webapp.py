@@ -5,13 +5,16 @@ import json
 import babel
 from mock import Mock
 
+import searx.favicons.proxy
 import searx.webapp
+from searx import webutils
 import searx.search
 import searx.search.processors
 from searx.result_types._base import MainResult
 
 from searx.results import Timing
 from searx.preferences import Preferences
+from searx.webutils import new_hmac
 from tests import SearxTestCase
 
 
@@ -139,6 +142,36 @@ class ViewsTestCase(SearxTestCase):  # pylint: disable=too-many-public-methods
         self.assertEqual(result_dict['results'][0]['content'], 'first test content')
         self.assertEqual(result_dict['results'][0]['url'], 'http://first.test.xyz')
 
+    def test_search_stream(self):
+        result = self.client.post('/search', data={'q': 'test', 'format': 'stream'})
+        self.assertEqual(result.mimetype, 'application/x-ndjson')
+        events = [json.loads(line) for line in result.data.decode().splitlines()]
+
+        self.assertEqual(events[-1]['type'], 'done')
+        self.assertEqual(events[-1]['query'], 'test')
+        self.assertEqual([r['url'] for r in events[-1]['results']], ['http://first.test.xyz', 'http://second.test.xyz'])
+        self.assertEqual([t['engine'] for t in events[-1]['timings']], ['startpage', 'youtube'])
+
+    def test_search_stream_sse(self):
+        result = self.client.post(
+            '/search', data={'q': 'test', 'format': 'stream'}, headers={'Accept': 'text/event-stream'}
+        )
+        self.assertEqual(result.mimetype, 'text/event-stream')
+        self.assertTrue(result.data.decode().startswith('event: done\ndata: {'))
+
+    def test_search_stream_done_error(self):
+        # the stream ends when the final data can't be built
+        self.setattr4test(webutils, 'get_json_data', Mock(side_effect=ValueError('broken')))
+        result = self.client.post('/search', data={'q': 'test', 'format': 'stream'})
+        events = [json.loads(line) for line in result.data.decode().splitlines()]
+        self.assertEqual(events[-1], {'type': 'error', 'error': 'search error'})
+        self.assertEqual([event['type'] for event in events].count('error'), 1)
+
+    def test_search_empty_stream(self):
+        result = self.client.post('/search', data={'q': '', 'format': 'stream'})
+        self.assertEqual(result.status_code, 400)
+        self.assertEqual(json.loads(result.data), {'type': 'error', 'error': 'No query'})
+
     def test_index_csv(self):
         result = self.client.post('/', data={'q': 'test', 'format': 'csv'})
         self.assertEqual(result.status_code, 308)
@@ -240,6 +273,35 @@ class ViewsTestCase(SearxTestCase):  # pylint: disable=too-many-public-methods
         result.close()
         self.assertEqual(result.status_code, 200)
 
+    def test_favicon_proxy_etag(self):
+        cfg = searx.favicons.proxy.CFG
+        self.setattr4test(cfg, 'resolver_map', {'duckduckgo': 'searx.favicons.resolvers.duckduckgo'})
+        self.setattr4test(searx.favicons.proxy, 'resolve_favicon', Mock(return_value=(b'PNG', 'image/png', 'abc')))
+
+        original_get_value = Preferences.get_value
+
+        def preferences_get_value(preferences_self, user_setting_name: str):
+            if user_setting_name == 'favicon_resolver':
+                return 'duckduckgo'
+            return original_get_value(preferences_self, user_setting_name)
+
+        self.setattr4test(Preferences, 'get_value', preferences_get_value)
+
+        h = new_hmac(cfg.secret_key, b'example.org')
+        result = self.client.get(f'/favicon_proxy?authority=example.org&h={h}')
+        self.assertEqual(result.status_code, 200)
+        self.assertEqual(result.data, b'PNG')
+        # strong ETag, the SHA256 of the cache
+        etag = result.headers['ETag']
+        self.assertEqual(etag, '"abc"')
+
+        result = self.client.get(f'/favicon_proxy?authority=example.org&h={h}', headers={'If-None-Match': etag})
+        self.assertEqual(result.status_code, 304)
+        self.assertEqual(result.data, b'')
+
+        result = self.client.get(f'/favicon_proxy?authority=example.org&h={h}', headers={'If-None-Match': '"other"'})
+        self.assertEqual(result.status_code, 200)
+
     def test_config(self):
         result = self.client.get('/config')
         self.assertEqual(result.status_code, 200)
@@ -1,9 +1,14 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 # pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name
 
+import json
+import time
+from datetime import datetime, timedelta
+
 import mock
 from parameterized.parameterized import parameterized
 from searx import webutils
+from searx.result_types import Answer, LegacyResult, MainResult
 from tests import SearxTestCase
 
 
@@ -112,3 +117,39 @@ class TestNewHmac(SearxTestCase):
         data = b'http://example.com'
         res = webutils.new_hmac('secret', data)
         self.assertEqual(res, '23e2baa2404012a5cc8e4a18b4aabf0dde4cb9b56f679ddc0fd6d7c24339d819')
+
+
+class TestJSONResponse(SearxTestCase):
+
+    def test_get_json_response(self):
+        results = [
+            MainResult(
+                url="https://example.org/ű", title="title", content="content", publishedDate=datetime(2024, 1, 2)
+            ),
+            LegacyResult(
+                url="https://example.org/video",
+                title="video",
+                template="videos.html",
+                length=timedelta(minutes=3, seconds=2),
+                publishedDate=datetime(2024, 1, 2, 3, 4, 5, 6),
+            ),
+            LegacyResult(url="https://example.org/file", title="file", length=time.gmtime(0)),
+        ]
+        for result in results:
+            result.normalize_result_fields()
+            result.engines = {"engine"}
+            result.positions = [1]
+        rc = mock.Mock(
+            get_ordered_results=lambda: results,
+            answers=[Answer(answer="42")],
+            corrections={"correction"},
+            infoboxes=[LegacyResult(infobox="infobox", content="content", length=timedelta(seconds=1))],
+            suggestions={"suggestion"},
+            unresponsive_engines=set(),
+            number_of_results=3,
+        )
+        sq = mock.Mock(query="test")
+
+        expected = json.loads(json.dumps(webutils.get_json_data(sq, rc), cls=webutils.JSONEncoder))
+        self.assertEqual(json.loads(webutils.get_json_response(sq, rc)), expected)
+        self.assertEqual(expected['results'][1]['length'], 182.0)